@@ -0,0 +1,84 @@
+import argparse
+import json
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+
+from .runner import RunResult, run_scenario
+from .scenarios import SCENARIOS
+
+# Показатели, которые выводятся в таблице и сравниваются с базовыми результатами
+_COLUMNS = (
+    ("wall_time", "Wall, s"),
+    ("peak_memory_mb", "Peak RSS, MB"),
+    ("github_requests", "GitHub req"),
+    ("tracker_requests", "Tracker req"),
+    ("rate_limited", "Limited"),
+    ("not_modified", "Not modified"),
+)
+
+
+def format_results(
+    results: List[RunResult], baseline: Optional[Dict[Tuple[str, int], dict]] = None
+) -> str:
+    """
+    Формирует таблицу результатов, при наличии базовых - с изменением в процентах.
+
+    :param results: Результаты запусков.
+    :param baseline: Базовые результаты по сценарию и номеру запуска.
+    :return: Таблица в формате Markdown.
+    """
+    lines = [
+        "| Scenario | Run | " + " | ".join(title for _, title in _COLUMNS) + " |",
+        "|----------|-----|" + "|".join("-" * (len(t) + 2) for _, t in _COLUMNS) + "|",
+    ]
+    for result in results:
+        base = (baseline or {}).get((result.scenario, result.run))
+        cells = []
+        for name, _ in _COLUMNS:
+            value = getattr(result, name)
+            cell = str(value)
+            if base and base.get(name):
+                cell += f" ({(value - base[name]) / base[name]:+.0%})"
+            cells.append(cell)
+        lines.append(
+            f"| {result.scenario} | {result.run} | " + " | ".join(cells) + " |"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Runs the action against local fake GitHub and Tracker servers.",
+    )
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        help=f"scenarios to run, all by default: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--output", help="write results to a JSON file")
+    parser.add_argument(
+        "--baseline", help="compare with results saved earlier by --output"
+    )
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - SCENARIOS.keys()
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf8") as f:
+            baseline = {(item["scenario"], item["run"]): item for item in json.load(f)}
+
+    results: List[RunResult] = []
+    for name in args.scenarios or SCENARIOS:
+        results.extend(run_scenario(SCENARIOS[name]))
+    print(format_results(results, baseline))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import hashlib
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Время слияния всех влитых pull request'ов синтетического репозитория
+_MERGED_AT = "2024-01-01T00:00:00Z"
+
+
+@dataclass(frozen=True)
+class RepositorySpec:  # pylint: disable=too-many-instance-attributes
+    """
+    Параметры синтетического репозитория.
+    """
+
+    # Pull request'ы фич, влитые в develop напрямую
+    features: int = 0
+    # Эпики и количество pull request'ов фич, влитых в ветку каждого эпика
+    epics: int = 0
+    epic_features: int = 5
+    commits_per_pull: int = 5
+    # Коммиты hotfix-ветки; если указаны, основной pull request - хотфикс
+    hotfix_commits: int = 0
+    # Доля pull request'ов без ключа задачи и доля задач, которых нет в Трекере
+    untracked_ratio: float = 0.1
+    missing_issue_ratio: float = 0.05
+    queues: int = 3
+    # Опубликованные релизы репозитория
+    releases: int = 20
+    seed: int = 1
+
+
+@dataclass
+class SyntheticCommit:
+    sha: str
+    message: str
+    author: str
+    parents: List[str]
+    # Номера pull request'ов, в которые входит коммит
+    pulls: List[int]
+
+
+@dataclass
+class SyntheticPull:  # pylint: disable=too-many-instance-attributes
+    number: int
+    title: str
+    head: str
+    base: str
+    author: str
+    merged_at: Optional[str]
+    head_sha: str
+    base_sha: str
+    body: Optional[str] = None
+    commits: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SyntheticRelease:
+    id: int
+    tag_name: str
+    name: str
+    body: Optional[str]
+    draft: bool
+    prerelease: bool
+
+
+@dataclass
+class SyntheticRepository:  # pylint: disable=too-many-instance-attributes
+    """
+    Репозиторий, pull request'ы и задачи Трекера, которые отдают фейковые серверы.
+    """
+
+    owner: str
+    name: str
+    main_pull: int
+    pulls: Dict[int, SyntheticPull] = field(default_factory=dict)
+    commits: Dict[str, SyntheticCommit] = field(default_factory=dict)
+    # Релизы от новых к старым, как их отдаёт GitHub
+    releases: List[SyntheticRelease] = field(default_factory=list)
+    # Заголовки задач Трекера по ключу и ключи очередей
+    issues: Dict[str, str] = field(default_factory=dict)
+    queues: List[str] = field(default_factory=list)
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.owner}/{self.name}"
+
+
+class _RepositoryBuilder:  # pylint: disable=too-many-instance-attributes
+    """
+    Строит синтетический репозиторий по параметрам.
+
+    Структура повторяет Gitflow: фичи и эпики вливаются в develop, релизный
+    или hotfix pull request из develop в master содержит все их коммиты.
+    """
+
+    def __init__(self, spec: RepositorySpec):
+        self.spec = spec
+        self.random = random.Random(spec.seed)
+        self.queues = [f"Q{index}" for index in range(spec.queues)]
+        self.authors = [f"developer{index}" for index in range(20)]
+        self.task_keys: List[str] = []
+        self.repository = SyntheticRepository(owner="owner", name="repo", main_pull=1)
+        self.main_commits: List[str] = []
+        self.last_number = self.repository.main_pull
+
+    def build(self) -> SyntheticRepository:
+        repository = self.repository
+        repository.queues = list(self.queues)
+        for _ in range(self.spec.features):
+            self.add_feature(
+                "develop", [repository.main_pull], self.main_commits, self.author()
+            )
+        for _ in range(self.spec.epics):
+            self.add_epic()
+        for index in range(self.spec.hotfix_commits):
+            task_key = self.task_key()
+            message = f"[{task_key}] Hotfix {index}" if task_key else f"Fix {index}"
+            self.main_commits.append(
+                self.add_commit(message, self.author(), [repository.main_pull])
+            )
+
+        if self.spec.hotfix_commits:
+            head = f"hotfix/1.{self.spec.releases}.1"
+        else:
+            head = f"release/1.{self.spec.releases + 1}"
+        repository.pulls[repository.main_pull] = SyntheticPull(
+            number=repository.main_pull,
+            title=head,
+            head=head,
+            base="master",
+            author=self.author(),
+            merged_at=None,
+            head_sha=self.main_commits[-1] if self.main_commits else self.sha(),
+            base_sha=self.sha(),
+            commits=self.main_commits,
+        )
+        repository.releases = [
+            SyntheticRelease(
+                id=index,
+                tag_name=f"v1.{index}.0",
+                name=f"Release 1.{index}.0",
+                body="",
+                draft=False,
+                prerelease=False,
+            )
+            for index in range(self.spec.releases, 0, -1)
+        ]
+        repository.issues = {
+            task_key: f"Summary of {task_key}"
+            for task_key in self.task_keys
+            if self.random.random() >= self.spec.missing_issue_ratio
+        }
+        return repository
+
+    def add_feature(
+        self, base: str, parent_pulls: List[int], commits: List[str], author: str
+    ) -> int:
+        """
+        Добавляет pull request фичи с коммитами и merge-коммитом в base.
+
+        :param base: Ветка, в которую влит pull request.
+        :param parent_pulls: Pull request'ы, в которые коммиты попали после слияния.
+        :param commits: Коммиты ветки base, в конец которых добавляются коммиты фичи.
+        :param author: Автор pull request'а.
+        :return: Номер pull request'а.
+        """
+        number = self.next_number()
+        task_key = self.task_key()
+        head = f"feature/{task_key or number}"
+        pull_commits = [
+            self.add_commit(
+                f"[{task_key}] Change {index}" if task_key else f"Change {index}",
+                author,
+                [number, *parent_pulls],
+            )
+            for index in range(self.spec.commits_per_pull)
+        ]
+        self.repository.pulls[number] = SyntheticPull(
+            number=number,
+            title=f"[{task_key}] Feature {number}" if task_key else f"Feature {number}",
+            head=head,
+            base=base,
+            author=author,
+            merged_at=_MERGED_AT,
+            head_sha=pull_commits[-1] if pull_commits else self.sha(),
+            base_sha=self.sha(),
+            commits=pull_commits,
+        )
+        commits.extend(pull_commits)
+        commits.append(
+            self.add_commit(
+                f"Merge pull request #{number} from {self.repository.owner}/{head}",
+                author,
+                parent_pulls,
+            )
+        )
+        return number
+
+    def add_epic(self) -> None:
+        number = self.next_number()
+        task_key = self.new_task_key()
+        head = f"epic/{task_key}"
+        author = self.author()
+        main_pull = self.repository.main_pull
+        epic_commits: List[str] = []
+        for _ in range(self.spec.epic_features):
+            self.add_feature(head, [number, main_pull], epic_commits, self.author())
+        self.repository.pulls[number] = SyntheticPull(
+            number=number,
+            title=f"[{task_key}] Epic {number}",
+            head=head,
+            base="develop",
+            author=author,
+            merged_at=_MERGED_AT,
+            head_sha=epic_commits[-1] if epic_commits else self.sha(),
+            base_sha=self.sha(),
+            commits=epic_commits,
+        )
+        self.main_commits.extend(epic_commits)
+        self.main_commits.append(
+            self.add_commit(
+                f"Merge pull request #{number} from {self.repository.owner}/{head}",
+                author,
+                [main_pull],
+            )
+        )
+
+    def add_commit(self, message: str, author: str, pulls: List[int]) -> str:
+        sha = self.sha()
+        parents = [self.main_commits[-1]] if self.main_commits else []
+        self.repository.commits[sha] = SyntheticCommit(
+            sha=sha, message=message, author=author, parents=parents, pulls=pulls
+        )
+        return sha
+
+    def task_key(self) -> Optional[str]:
+        """
+        Возвращает ключ задачи для pull request'а или коммита.
+
+        Часть pull request'ов не имеет ключа, часть повторно использует
+        ключ уже созданной задачи, как при доработках одной задачи.
+
+        :return: Ключ задачи или None.
+        """
+        value = self.random.random()
+        if value < self.spec.untracked_ratio:
+            return None
+        if self.task_keys and value > 0.9:
+            return self.random.choice(self.task_keys)
+        return self.new_task_key()
+
+    def new_task_key(self) -> str:
+        queue = self.queues[len(self.task_keys) % len(self.queues)]
+        task_key = f"{queue}-{len(self.task_keys) + 1}"
+        self.task_keys.append(task_key)
+        return task_key
+
+    def author(self) -> str:
+        return self.random.choice(self.authors)
+
+    def next_number(self) -> int:
+        self.last_number += 1
+        return self.last_number
+
+    def sha(self) -> str:
+        return hashlib.sha1(
+            f"{self.spec.seed}:{self.random.random()}".encode("utf8"),
+            usedforsecurity=False,
+        ).hexdigest()
+
+
+def generate_repository(spec: RepositorySpec) -> SyntheticRepository:
+    """
+    Генерирует синтетический репозиторий.
+
+    При одинаковых параметрах результат одинаковый.
+
+    :param spec: Параметры репозитория.
+    :return: Объект SyntheticRepository.
+    """
+    return _RepositoryBuilder(spec).build()
@@ -0,0 +1,213 @@
+import json
+import os
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .repository import RepositorySpec, generate_repository
+from .servers import FakeGithubServer, FakeTrackerServer
+
+# Корень репозитория: бенчмарк запускает main.py так же, как Docker-образ экшена
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Строк журнала экшена, которые выводятся при ошибке запуска
+_LOG_TAIL_LINES = 40
+
+
+@dataclass(frozen=True)
+class Scenario:  # pylint: disable=too-many-instance-attributes
+    """
+    Сценарий бенчмарка: синтетический репозиторий и условия работы API.
+    """
+
+    name: str
+    repository: RepositorySpec
+    github_api: str = "rest"
+    github_latency: float = 0.02
+    tracker_latency: float = 0.02
+    # Лимит запросов к GitHub и Трекеру за окно rate_limit_window секунд
+    github_rate_limit: Optional[int] = None
+    tracker_rate_limit: Optional[int] = None
+    rate_limit_window: float = 60.0
+    # Количество запусков подряд; кэш, если он включён, общий для запусков
+    runs: int = 1
+    cache: bool = False
+
+
+@dataclass
+class RunResult:  # pylint: disable=too-many-instance-attributes
+    """
+    Результат одного запуска экшена.
+    """
+
+    scenario: str
+    run: int
+    wall_time: float
+    # Пиковый размер резидентной памяти процесса экшена
+    peak_memory_mb: float
+    github_requests: int
+    tracker_requests: int
+    rate_limited: int
+    # Ответы 304 на запросы с If-None-Match, они не расходуют лимит GitHub
+    not_modified: int
+    endpoints: Dict[str, int] = field(default_factory=dict)
+    # Метрики запуска, которые экшен записал в metrics_file
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+def run_scenario(scenario: Scenario) -> List[RunResult]:
+    """
+    Запускает экшен против фейковых серверов GitHub и Трекера.
+
+    Экшен выполняется отдельным процессом, чтобы время и память каждого
+    запуска включали импорт модулей и не зависели от предыдущих запусков.
+
+    :param scenario: Сценарий бенчмарка.
+    :return: Результаты запусков сценария.
+    """
+    repository = generate_repository(scenario.repository)
+    github = FakeGithubServer(
+        repository,
+        latency=scenario.github_latency,
+        rate_limit=scenario.github_rate_limit,
+        rate_limit_window=scenario.rate_limit_window,
+    )
+    tracker = FakeTrackerServer(
+        repository,
+        latency=scenario.tracker_latency,
+        rate_limit=scenario.tracker_rate_limit,
+        rate_limit_window=scenario.rate_limit_window,
+    )
+    results = []
+    with github, tracker, tempfile.TemporaryDirectory() as work_dir:
+        for run in range(1, scenario.runs + 1):
+            github.reset_counters()
+            tracker.reset_counters()
+            results.append(_run_action(scenario, run, github, tracker, work_dir))
+    if scenario.cache:
+        _check_reuse(scenario, results)
+    return results
+
+
+def _check_reuse(scenario: Scenario, results: List[RunResult]) -> None:
+    """
+    Проверяет, что повторные запуски используют результаты первого.
+
+    Репозиторий между запусками не меняется, поэтому повторный запуск
+    должен восстановить задачи из описания pull request'а или получить
+    ответы 304 по кэшу ETag, а не собирать всё заново.
+
+    :param scenario: Сценарий бенчмарка.
+    :param results: Результаты запусков сценария.
+    """
+    first = results[0]
+    for result in results[1:]:
+        if result.github_requests - result.not_modified > first.github_requests // 2:
+            raise RuntimeError(
+                f"Scenario {scenario.name} run {result.run} did not reuse run 1: "
+                f"{result.github_requests} GitHub requests, "
+                f"{result.not_modified} not modified, "
+                f"{first.github_requests} in run 1"
+            )
+
+
+def _run_action(
+    scenario: Scenario,
+    run: int,
+    github: FakeGithubServer,
+    tracker: FakeTrackerServer,
+    work_dir: str,
+) -> RunResult:
+    log_path = os.path.join(work_dir, "action.log")
+    env = _action_env(scenario, github, tracker, work_dir)
+
+    started_at = time.perf_counter()
+    with open(log_path, "w", encoding="utf8") as log:
+        process = subprocess.Popen(  # pylint: disable=consider-using-with  # nosec B603
+            [sys.executable, os.path.join(ROOT_DIR, "main.py")],
+            cwd=ROOT_DIR,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        # wait4 возвращает потребление ресурсов именно этого процесса
+        _, status, usage = os.wait4(process.pid, 0)
+    wall_time = time.perf_counter() - started_at
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        raise RuntimeError(
+            f"Scenario {scenario.name} run {run} failed "
+            f"with exit code {process.returncode}:\n{_log_tail(log_path)}"
+        )
+
+    with open(env["INPUT_METRICS_FILE"], encoding="utf8") as f:
+        metrics = json.load(f)
+    return RunResult(
+        scenario=scenario.name,
+        run=run,
+        wall_time=round(wall_time, 3),
+        # В Linux ru_maxrss указывается в килобайтах
+        peak_memory_mb=round(usage.ru_maxrss / 1024, 1),
+        github_requests=sum(github.requests.values()),
+        tracker_requests=sum(tracker.requests.values()),
+        rate_limited=github.rate_limited + tracker.rate_limited,
+        not_modified=github.not_modified,
+        endpoints={
+            f"{server.service} {endpoint}": count
+            for server in (github, tracker)
+            for endpoint, count in sorted(server.requests.items())
+        },
+        metrics=metrics,
+    )
+
+
+def _action_env(
+    scenario: Scenario,
+    github: FakeGithubServer,
+    tracker: FakeTrackerServer,
+    work_dir: str,
+) -> Dict[str, str]:
+    """
+    Готовит событие pull request'а и переменные окружения экшена.
+
+    :param scenario: Сценарий бенчмарка.
+    :param github: Фейковый сервер GitHub.
+    :param tracker: Фейковый сервер Трекера.
+    :param work_dir: Рабочий каталог сценария.
+    :return: Переменные окружения процесса экшена.
+    """
+    event_path = os.path.join(work_dir, "event.json")
+    # Событие строится заново: описание pull request'а меняется после запуска
+    with open(event_path, "w", encoding="utf8") as f:
+        json.dump(github.event(), f)
+    # Переменные окружения самого бенчмарка не должны попасть в экшен
+    env = {
+        name: value
+        for name, value in os.environ.items()
+        if not name.startswith(("INPUT_", "GITHUB_"))
+    }
+    env.update(
+        {
+            "INPUT_YANDEX_ORG_ID": "org",
+            "INPUT_YANDEX_OAUTH2_TOKEN": "oauth-token",
+            "INPUT_TOKEN": "github-token",
+            "INPUT_GITHUB_API": scenario.github_api,
+            "INPUT_METRICS_FILE": os.path.join(work_dir, "metrics.json"),
+            "INPUT_CACHE_DIR": (
+                os.path.join(work_dir, "cache") if scenario.cache else ""
+            ),
+            "GITHUB_EVENT_PATH": event_path,
+            "GITHUB_REPOSITORY": github.repository.full_name,
+            "GITHUB_API_URL": github.api_url,
+            "YANDEX_TRACKER_API_URL": tracker.api_url,
+            "YANDEX_IAM_TOKEN_URL": tracker.iam_token_url,
+        }
+    )
+    return env
+
+
+def _log_tail(log_path: str) -> str:
+    with open(log_path, encoding="utf8") as f:
+        return "".join(f.readlines()[-_LOG_TAIL_LINES:])
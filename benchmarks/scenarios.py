@@ -0,0 +1,39 @@
+from typing import Dict
+
+from .repository import RepositorySpec
+from .runner import Scenario
+
+# Релиз среднего проекта: сотни фич, десятки эпиков, тысячи коммитов.
+# Release notes вместе с состоянием запуска занимают около 50 тысяч символов
+# и помещаются в описание pull request'а (не больше 65536 символов)
+_RELEASE = RepositorySpec(features=150, epics=15, epic_features=5, commits_per_pull=5)
+# Хотфикс из сотен коммитов, release notes тоже помещаются в описание
+_HOTFIX = RepositorySpec(hotfix_commits=400)
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        # Небольшой репозиторий для быстрой проверки, что бенчмарк работает
+        Scenario(
+            "smoke",
+            RepositorySpec(features=10, epics=2, epic_features=2, commits_per_pull=2),
+            github_latency=0.0,
+            tracker_latency=0.0,
+        ),
+        Scenario("release-rest", _RELEASE),
+        Scenario("release-graphql", _RELEASE, github_api="graphql"),
+        # Повторный запуск восстанавливает задачи из описания pull request'а
+        Scenario("release-rerun", _RELEASE, runs=2, cache=True),
+        # Лимит GitHub исчерпывается за время запуска
+        Scenario(
+            "release-rate-limited",
+            RepositorySpec(features=100, epics=10, epic_features=5, commits_per_pull=3),
+            github_rate_limit=300,
+            rate_limit_window=5.0,
+        ),
+        Scenario("hotfix", _HOTFIX),
+        # Хотфикс собирается заново, коммиты повторного запуска берутся
+        # из кэша ETag
+        Scenario("hotfix-rerun", _HOTFIX, runs=2, cache=True),
+    ]
+}
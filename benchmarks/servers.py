@@ -0,0 +1,608 @@
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from helpers.run_metrics import endpoint_name
+
+from .repository import SyntheticPull, SyntheticRelease, SyntheticRepository
+
+# Ответ фейкового сервера: статус, заголовки и тело в формате JSON
+Response = Tuple[int, Dict[str, str], Any]
+
+_HOST = "127.0.0.1"
+# Путь REST API GitHub Enterprise, для него PyGithub строит адрес GraphQL API
+_GITHUB_API_PREFIX = "/api/v3"
+_GITHUB_GRAPHQL_PATH = "/api/graphql"
+_TRACKER_API_PREFIX = "/v2"
+_IAM_TOKEN_PATH = "/iam/v1/tokens"
+_DEFAULT_PER_PAGE = 30
+# Ограничения GitHub на длину описания pull request'а и релиза
+_MAX_PULL_BODY_LENGTH = 65536
+_MAX_RELEASE_BODY_LENGTH = 125000
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    Передаёт запросы фейковому серверу и отправляет его ответы в JSON.
+    """
+
+    # Keep-alive соединения, как у настоящих API. Без TCP_NODELAY заголовки
+    # и тело ответа уходят с задержкой подтверждения
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "_HTTPServer"
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        self._dispatch()
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        self._dispatch()
+
+    def do_PATCH(self) -> None:  # pylint: disable=invalid-name
+        self._dispatch()
+
+    def log_message(self, *_args: Any) -> None:
+        # Журнал запросов не выводится, чтобы не влиять на замеры
+        pass
+
+    def _dispatch(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        body = json.loads(raw_body) if raw_body else None
+        status, headers, payload = self.server.app.dispatch(
+            self.command, self.path, body, dict(self.headers)
+        )
+        # Ответ 304 отправляется без тела
+        content = b"" if status == 304 else json.dumps(payload).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    app: "FakeServer"
+
+
+class FakeServer:  # pylint: disable=too-many-instance-attributes
+    """
+    Локальный HTTP-сервер, заменяющий внешний API в бенчмарках.
+
+    Каждый запрос выполняется с заданной задержкой и расходует лимит
+    запросов, который восстанавливается каждые rate_limit_window секунд.
+    Если etags включён, ответы GET содержат ETag, а запрос с совпадающим
+    If-None-Match получает ответ 304, который не расходует лимит.
+    """
+
+    service = ""
+    etags = False
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_limit_window: float = 60.0,
+    ):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        # Количество запросов по эндпоинту, ответов о превышении лимита
+        # и ответов 304
+        self.requests: Counter = Counter()
+        self.rate_limited = 0
+        self.not_modified = 0
+        self._budgets: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._httpd = _HTTPServer((_HOST, 0), _RequestHandler)
+        self._httpd.app = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{_HOST}:{self._httpd.server_port}"
+
+    def __enter__(self) -> "FakeServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_args: Any) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.rate_limited = 0
+            self.not_modified = 0
+
+    def dispatch(
+        self,
+        method: str,
+        path: str,
+        body: Any,
+        request_headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        """
+        Обрабатывает запрос с учётом задержки и лимита запросов.
+
+        :param method: HTTP-метод.
+        :param path: Путь запроса с параметрами.
+        :param body: Тело запроса, разобранное из JSON.
+        :param request_headers: Заголовки запроса.
+        :return: Ответ сервера.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlsplit(path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        resource = self.resource(url.path)
+        with self._lock:
+            self.requests[endpoint_name(method, url.path)] += 1
+            remaining, reset_at = self._take_budget(resource)
+            if remaining < 0:
+                self.rate_limited += 1
+        if remaining < 0:
+            return self.rate_limited_response(resource, reset_at)
+        status, headers, payload = self.handle(method, url.path, query, body)
+        if self.etags and method == "GET" and status == 200:
+            etag = self.etag(payload)
+            headers = {**headers, "ETag": etag}
+            if (request_headers or {}).get("If-None-Match") == etag:
+                status, payload = 304, None
+                remaining = self._refund_budget(resource)
+        return (
+            status,
+            {**self.rate_limit_headers(resource, remaining, reset_at), **headers},
+            payload,
+        )
+
+    def _take_budget(self, resource: str) -> Tuple[int, float]:
+        """
+        Расходует один запрос из лимита ресурса.
+
+        :param resource: Ресурс лимита.
+        :return: Остаток лимита после запроса, отрицательный при превышении,
+            и время сброса лимита.
+        """
+        if self.rate_limit is None:
+            return 0, 0.0
+        now = time.time()
+        remaining, reset_at = self._budgets.get(resource, (self.rate_limit, 0.0))
+        if reset_at <= now:
+            remaining, reset_at = self.rate_limit, now + self.rate_limit_window
+        remaining -= 1
+        self._budgets[resource] = (max(remaining, 0), reset_at)
+        return remaining, reset_at
+
+    def _refund_budget(self, resource: str) -> int:
+        """
+        Возвращает в лимит запрос, на который получен ответ 304.
+
+        :param resource: Ресурс лимита.
+        :return: Остаток лимита.
+        """
+        with self._lock:
+            self.not_modified += 1
+            if self.rate_limit is None:
+                return 0
+            remaining, reset_at = self._budgets[resource]
+            remaining = min(remaining + 1, self.rate_limit)
+            self._budgets[resource] = (remaining, reset_at)
+            return remaining
+
+    @staticmethod
+    def etag(payload: Any) -> str:
+        """
+        Вычисляет ETag по содержимому ответа.
+
+        :param payload: Тело ответа.
+        :return: Слабый ETag.
+        """
+        content = json.dumps(payload, sort_keys=True).encode("utf8")
+        digest = hashlib.sha1(content, usedforsecurity=False).hexdigest()
+        return f'W/"{digest}"'
+
+    def resource(self, path: str) -> str:  # pylint: disable=unused-argument
+        """
+        Возвращает ресурс лимита, к которому относится запрос.
+
+        :param path: Путь запроса.
+        :return: Название ресурса.
+        """
+        return "core"
+
+    def rate_limit_headers(  # pylint: disable=unused-argument
+        self, resource: str, remaining: int, reset_at: float
+    ) -> Dict[str, str]:
+        """
+        Возвращает заголовки с состоянием лимита, которые добавляются к ответу.
+
+        :param resource: Ресурс лимита.
+        :param remaining: Остаток лимита.
+        :param reset_at: Время сброса лимита.
+        :return: Заголовки ответа.
+        """
+        return {}
+
+    def rate_limited_response(self, resource: str, reset_at: float) -> Response:
+        """
+        Возвращает ответ о превышении лимита запросов.
+
+        :param resource: Ресурс лимита.
+        :param reset_at: Время сброса лимита.
+        :return: Ответ сервера.
+        """
+        raise NotImplementedError
+
+    def handle(
+        self, method: str, path: str, query: Dict[str, str], body: Any
+    ) -> Response:
+        """
+        Формирует ответ API.
+
+        :param method: HTTP-метод.
+        :param path: Путь запроса без параметров.
+        :param query: Параметры запроса.
+        :param body: Тело запроса, разобранное из JSON.
+        :return: Ответ сервера.
+        """
+        raise NotImplementedError
+
+
+class FakeGithubServer(FakeServer):
+    """
+    REST и GraphQL API GitHub для синтетического репозитория.
+
+    Адрес API имеет вид GitHub Enterprise: {url}/api/v3, GraphQL - {url}/api/graphql.
+    Поддерживаются только запросы, которые выполняет экшен.
+    """
+
+    service = "github"
+    etags = True
+
+    def __init__(self, repository: SyntheticRepository, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.repository = repository
+        self._repo_path = f"{_GITHUB_API_PREFIX}/repos/{repository.full_name}"
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}{_GITHUB_API_PREFIX}"
+
+    def event(self) -> Dict[str, Any]:
+        """
+        Возвращает событие pull_request для основного pull request'а.
+
+        :return: Содержимое файла GITHUB_EVENT_PATH.
+        """
+        return {"pull_request": self.pull_json(self.main_pull)}
+
+    @property
+    def main_pull(self) -> SyntheticPull:
+        return self.repository.pulls[self.repository.main_pull]
+
+    def resource(self, path: str) -> str:
+        return "graphql" if path == _GITHUB_GRAPHQL_PATH else "core"
+
+    def rate_limit_headers(
+        self, resource: str, remaining: int, reset_at: float
+    ) -> Dict[str, str]:
+        if self.rate_limit is None:
+            return {}
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(remaining, 0)),
+            "X-RateLimit-Reset": str(int(reset_at) + 1),
+            "X-RateLimit-Resource": resource,
+        }
+
+    def rate_limited_response(self, resource: str, reset_at: float) -> Response:
+        return (
+            403,
+            self.rate_limit_headers(resource, 0, reset_at),
+            {"message": "API rate limit exceeded"},
+        )
+
+    def handle(  # pylint: disable=too-many-return-statements
+        self, method: str, path: str, query: Dict[str, str], body: Any
+    ) -> Response:
+        if path == _GITHUB_GRAPHQL_PATH and method == "POST":
+            return 200, {}, self.graphql(body["variables"])
+        if not path.startswith(self._repo_path):
+            return self.not_found()
+        prefix_length = len(self._repo_path)
+        parts = path[prefix_length:].strip("/").split("/")
+        if parts[0] == "pulls" and len(parts) >= 2 and parts[1].isdecimal():
+            pull = self.repository.pulls.get(int(parts[1]))
+            if pull is None:
+                return self.not_found()
+            if parts[2:] == ["commits"] and method == "GET":
+                return self.paginated(
+                    path, query, [self.commit_json(sha) for sha in pull.commits]
+                )
+            if len(parts) == 2 and method == "PATCH":
+                if len(body.get("body") or "") > _MAX_PULL_BODY_LENGTH:
+                    return self.body_too_long("PullRequest", _MAX_PULL_BODY_LENGTH)
+                pull.body = body.get("body", pull.body)
+            return 200, {}, self.pull_json(pull)
+        if parts[0] == "commits" and parts[2:] == ["pulls"]:
+            commit = self.repository.commits.get(parts[1])
+            if commit is None:
+                return self.not_found()
+            return (
+                200,
+                {},
+                [self.pull_json(self.repository.pulls[n]) for n in commit.pulls],
+            )
+        if parts[0] == "compare":
+            base, _, head = parts[1].partition("...")
+            return 200, {}, self.compare_json(base, head)
+        if parts[0] == "releases":
+            return self.handle_releases(method, path, query, parts, body)
+        return self.not_found()
+
+    def handle_releases(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, str],
+        parts: List[str],
+        body: Any,
+    ) -> Response:
+        releases = self.repository.releases
+        if method in ("POST", "PATCH") and (
+            len(body.get("body") or "") > _MAX_RELEASE_BODY_LENGTH
+        ):
+            return self.body_too_long("Release", _MAX_RELEASE_BODY_LENGTH)
+        if len(parts) == 1 and method == "GET":
+            return self.paginated(path, query, [self.release_json(r) for r in releases])
+        if len(parts) == 1 and method == "POST":
+            release = SyntheticRelease(
+                id=max((r.id for r in releases), default=0) + 1,
+                tag_name=body["tag_name"],
+                name=body["name"],
+                body=body["body"],
+                draft=body["draft"],
+                prerelease=body["prerelease"],
+            )
+            releases.insert(0, release)
+            return 201, {}, self.release_json(release)
+        for release in releases:
+            if len(parts) == 2 and str(release.id) == parts[1] and method == "PATCH":
+                release.name = body.get("name", release.name)
+                release.body = body.get("body", release.body)
+                return 200, {}, self.release_json(release)
+        return self.not_found()
+
+    def paginated(self, path: str, query: Dict[str, str], items: List[Any]) -> Response:
+        """
+        Возвращает страницу списка со ссылками на следующую и последнюю страницы.
+
+        :param path: Путь запроса.
+        :param query: Параметры запроса.
+        :param items: Все элементы списка.
+        :return: Ответ сервера.
+        """
+        per_page = int(query.get("per_page", _DEFAULT_PER_PAGE))
+        page = int(query.get("page", 1))
+        last_page = max((len(items) + per_page - 1) // per_page, 1)
+        headers = {}
+        if page < last_page:
+            headers["Link"] = (
+                f'<{self.url}{path}?per_page={per_page}&page={page + 1}>; rel="next", '
+                f'<{self.url}{path}?per_page={per_page}&page={last_page}>; rel="last"'
+            )
+        start = (page - 1) * per_page
+        stop = start + per_page
+        return 200, headers, items[start:stop]
+
+    def graphql(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Отвечает на запрос коммитов pull request'а из GithubGraphQL.
+
+        :param variables: Переменные запроса.
+        :return: Тело ответа GraphQL API.
+        """
+        pull = self.repository.pulls[variables["number"]]
+        start = int(variables["cursor"] or 0)
+        stop = start + variables["pageSize"]
+        nodes = []
+        for sha in pull.commits[start:stop]:
+            commit = self.repository.commits[sha]
+            nodes.append(
+                {
+                    "commit": {
+                        "oid": sha,
+                        "message": commit.message,
+                        "author": {"user": {"login": commit.author}},
+                        "parents": {"nodes": [{"oid": p} for p in commit.parents]},
+                        "associatedPullRequests": {
+                            "nodes": [
+                                self.graphql_pull_json(self.repository.pulls[n])
+                                for n in commit.pulls[: variables["pullsLimit"]]
+                            ]
+                        },
+                    }
+                }
+            )
+        page_info = {"hasNextPage": stop < len(pull.commits), "endCursor": str(stop)}
+        commits = {"pageInfo": page_info, "nodes": nodes}
+        return {"data": {"repository": {"pullRequest": {"commits": commits}}}}
+
+    def pull_json(self, pull: SyntheticPull) -> Dict[str, Any]:
+        return {
+            "id": pull.number,
+            "number": pull.number,
+            "url": f"{self.url}{self._repo_path}/pulls/{pull.number}",
+            "html_url": f"{self.url}/{self.repository.full_name}/pull/{pull.number}",
+            "title": pull.title,
+            "body": pull.body,
+            "state": "open" if pull.merged_at is None else "closed",
+            "merged_at": pull.merged_at,
+            "head": {"ref": pull.head, "sha": pull.head_sha},
+            "base": {"ref": pull.base, "sha": pull.base_sha},
+            "user": {"login": pull.author},
+        }
+
+    def graphql_pull_json(self, pull: SyntheticPull) -> Dict[str, Any]:
+        return {
+            "number": pull.number,
+            "title": pull.title,
+            "url": f"{self.url}/{self.repository.full_name}/pull/{pull.number}",
+            "state": "OPEN" if pull.merged_at is None else "MERGED",
+            "mergedAt": pull.merged_at,
+            "headRefName": pull.head,
+            "baseRefName": pull.base,
+            "author": {"login": pull.author},
+        }
+
+    def commit_json(self, sha: str) -> Dict[str, Any]:
+        commit = self.repository.commits[sha]
+        return {
+            "sha": sha,
+            "url": f"{self.url}{self._repo_path}/commits/{sha}",
+            "commit": {"message": commit.message},
+            "author": {"login": commit.author},
+            "parents": [{"sha": parent} for parent in commit.parents],
+        }
+
+    def compare_json(self, base: str, head: str) -> Dict[str, Any]:
+        # Сравнение поддерживается для коммитов основного pull request'а
+        commits = self.main_pull.commits
+        if base in commits and head in commits:
+            start = commits.index(base) + 1
+            stop = commits.index(head) + 1
+            ahead = commits[start:stop]
+            if ahead:
+                status = "ahead"
+            else:
+                status = "identical" if base == head else "behind"
+        else:
+            ahead, status = [], "diverged"
+        return {
+            "url": f"{self.url}{self._repo_path}/compare/{base}...{head}",
+            "status": status,
+            "total_commits": len(ahead),
+            "commits": [self.commit_json(sha) for sha in ahead],
+        }
+
+    def release_json(self, release: SyntheticRelease) -> Dict[str, Any]:
+        return {
+            "id": release.id,
+            "url": f"{self.url}{self._repo_path}/releases/{release.id}",
+            "tag_name": release.tag_name,
+            "name": release.name,
+            "body": release.body,
+            "draft": release.draft,
+            "prerelease": release.prerelease,
+        }
+
+    @staticmethod
+    def not_found() -> Response:
+        return 404, {}, {"message": "Not Found"}
+
+    @staticmethod
+    def body_too_long(resource: str, max_length: int) -> Response:
+        return (
+            422,
+            {},
+            {
+                "message": "Validation Failed",
+                "errors": [
+                    {
+                        "resource": resource,
+                        "code": "custom",
+                        "field": "body",
+                        "message": f"body is too long (maximum is {max_length} "
+                        "characters)",
+                    }
+                ],
+            },
+        )
+
+
+class FakeTrackerServer(FakeServer):
+    """
+    API Трекера и обмен OAuth-токена на IAM-токен для синтетического репозитория.
+    """
+
+    service = "tracker"
+
+    def __init__(self, repository: SyntheticRepository, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.repository = repository
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}{_TRACKER_API_PREFIX}"
+
+    @property
+    def iam_token_url(self) -> str:
+        return f"{self.url}{_IAM_TOKEN_PATH}"
+
+    def rate_limited_response(self, resource: str, reset_at: float) -> Response:
+        retry_after = max(int(reset_at - time.time()) + 1, 1)
+        return (
+            429,
+            {"Retry-After": str(retry_after)},
+            {"errorMessages": ["Too many requests"]},
+        )
+
+    def handle(
+        self, method: str, path: str, query: Dict[str, str], body: Any
+    ) -> Response:
+        issues = self.repository.issues
+        if path == _IAM_TOKEN_PATH and method == "POST":
+            expires_at = datetime.now(timezone.utc) + timedelta(hours=12)
+            return (
+                200,
+                {},
+                {"iamToken": "iam-token", "expiresAt": expires_at.isoformat()},
+            )
+        if path == f"{_TRACKER_API_PREFIX}/queues":
+            return self.queues(query)
+        if path == f"{_TRACKER_API_PREFIX}/issues/_search" and method == "POST":
+            return (
+                200,
+                {},
+                [self.issue_json(key) for key in body["keys"] if key in issues],
+            )
+        if path.startswith(f"{_TRACKER_API_PREFIX}/issues/"):
+            key = path.rsplit("/", 1)[1]
+            if key in issues:
+                return 200, {}, self.issue_json(key)
+        return 404, {}, {"errorMessages": ["Not found"]}
+
+    def queues(self, query: Dict[str, str]) -> Response:
+        per_page = int(query.get("perPage", 50))
+        page = int(query.get("page", 1))
+        queues = self.repository.queues
+        total_pages = max((len(queues) + per_page - 1) // per_page, 1)
+        start = (page - 1) * per_page
+        stop = start + per_page
+        return (
+            200,
+            {"X-Total-Pages": str(total_pages)},
+            [{"key": key} for key in queues[start:stop]],
+        )
+
+    def issue_json(self, key: str) -> Dict[str, Any]:
+        return {
+            "key": key,
+            "summary": self.repository.issues[key],
+            "aliases": [],
+            "updatedAt": "2024-01-01T00:00:00.000+0000",
+        }
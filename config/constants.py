@@ -1,7 +1,17 @@
 import re
 
-TASK_KEY_PATTERN = re.compile(r"[^[]*\[([^]]*)\]")
-MERGE_PULL_REQUEST_PATTERN = re.compile(r"Merge pull request #(\d+)")
+# Ключ задачи Трекера: ключ очереди и номер задачи в ней
+ISSUE_KEY_PATTERN = re.compile(r"([A-Za-z][A-Za-z0-9]*)-\d+")
+# Начало сообщения merge-коммита GitHub: "Merge pull request #N from owner/branch"
+MERGE_PULL_REQUEST_PREFIX = "Merge pull request #"
+# Префикс веток эпиков: epic/<название>
+EPIC_BRANCH_PREFIX = "epic"
+# Тег релиза: необязательный префикс "v" и версия major.minor.patch
+RELEASE_TAG_PATTERN = re.compile(r"v?\s*(\d+)\.(\d+)\.(\d+)")
+# Отпечаток описания, который экшен добавляет в конец pull request'а и релиза
+FINGERPRINT_PATTERN = re.compile(r"<!-- release-notes: ([0-9a-f]{64}) -->\s*$")
+# Состояние предыдущего запуска, сохранённое в описании pull request'а
+RUN_STATE_PATTERN = re.compile(r"<!-- release-notes-state: ([A-Za-z0-9+/=]+) -->")
 
 # Description title names
 MAIN_TITLE_NAME = "## What's Changed \n"
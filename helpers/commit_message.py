@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .merge_commit import MergeCommit, parse_merge_commit
+
+
+@dataclass(frozen=True)
+class CommitMessageTokens:
+    """
+    Данные, извлечённые из сообщения коммита.
+    """
+
+    # Ключи задач по алфавиту
+    task_keys: Tuple[str, ...]
+    # Влитый pull request, если коммит является merge-коммитом GitHub
+    merge_commit: Optional[MergeCommit]
+
+
+def extract_task_keys(message: str) -> Set[str]:
+    """
+    Извлекает ключи задач из квадратных скобок сообщения коммита.
+
+    В скобках может быть несколько ключей через запятую. Каждая скобка ищется
+    от конца предыдущей, поэтому время разбора линейно от длины сообщения,
+    в том числе для длинных сообщений с незакрытой скобкой.
+
+    :param message: Сообщение коммита.
+    :return: Множество ключей задач.
+    """
+    task_keys: Set[str] = set()
+    position = 0
+    while True:
+        start = message.find("[", position) + 1
+        if not start:
+            break
+        end = message.find("]", start)
+        if end < 0:
+            # Дальше нет закрывающих скобок, а значит и ключей
+            break
+        task_keys.update(key.strip() for key in message[start:end].split(","))
+        position = end + 1
+    return task_keys
+
+
+def tokenize_commit_message(message: str) -> CommitMessageTokens:
+    """
+    Разбирает сообщение коммита: ключи задач и данные merge-коммита.
+
+    :param message: Сообщение коммита.
+    :return: Данные сообщения коммита.
+    """
+    return CommitMessageTokens(
+        task_keys=tuple(sorted(extract_task_keys(message))),
+        merge_commit=parse_merge_commit(message),
+    )
+
+
+def tokenize_commit_messages(messages: Iterable[str]) -> List[CommitMessageTokens]:
+    """
+    Разбирает все сообщения коммитов запуска.
+
+    Повторяющиеся сообщения разбираются один раз.
+
+    :param messages: Сообщения коммитов.
+    :return: Данные сообщений в исходном порядке.
+    """
+    tokens: Dict[str, CommitMessageTokens] = {}
+    result = []
+    for message in messages:
+        if message not in tokens:
+            tokens[message] = tokenize_commit_message(message)
+        result.append(tokens[message])
+    return result
@@ -0,0 +1,110 @@
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Set
+
+from config.logger_config import logger
+
+
+class FileCache:
+    """
+    Кэш записей в JSON-файле, который переживает перезапуски экшена.
+
+    Каталог с файлами кэша можно сохранять между запусками через actions/cache.
+    Чтобы кэш не рос бесконечно, при сохранении удаляются записи, к которым
+    не обращались в текущем запуске: с evict_unused - все такие записи,
+    с evict_expired - только те, срок жизни которых истёк.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        ttl: float,
+        *,
+        evict_unused: bool = False,
+        evict_expired: bool = False,
+    ):
+        self.path = os.path.join(directory, f"{name}.json")
+        self.ttl = ttl
+        self.evict_unused = evict_unused
+        self.evict_expired = evict_expired
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        self._used: Set[str] = set()
+        self._changed = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Загружает записи кэша из файла.
+
+        :return: Словарь записей, пустой если файла нет или он повреждён.
+        """
+        try:
+            with open(self.path, "r", encoding="utf8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.info("Cache %s is unreadable, ignoring it: %s", self.path, e)
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает запись кэша независимо от её срока жизни.
+
+        :param key: Ключ записи.
+        :return: Значение записи или None.
+        """
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        self._used.add(key)
+        return entry["value"]
+
+    def is_fresh(self, key: str) -> bool:
+        """
+        Проверяет, что запись есть в кэше и её срок жизни не истёк.
+
+        :param key: Ключ записи.
+        :return: True, если запись можно использовать без проверки.
+        """
+        entry = self._entries.get(key)
+        return entry is not None and time.time() - entry["cached_at"] < self.ttl
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Сохраняет запись и обновляет время её создания.
+
+        :param key: Ключ записи.
+        :param value: Значение записи.
+        """
+        self._entries[key] = {"value": value, "cached_at": time.time()}
+        self._used.add(key)
+        self._changed = True
+
+    def save(self) -> None:
+        """
+        Записывает кэш в файл, если он изменился.
+        """
+        now = time.time()
+        evicted = [
+            key
+            for key, entry in self._entries.items()
+            if key not in self._used
+            and (
+                self.evict_unused
+                or (self.evict_expired and now - entry["cached_at"] >= self.ttl)
+            )
+        ]
+        for key in evicted:
+            del self._entries[key]
+        self._changed = self._changed or bool(evicted)
+        if not self._changed:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf8") as f:
+            json.dump(self._entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._changed = False
@@ -0,0 +1,51 @@
+import hashlib
+from typing import Optional
+
+from config.constants import FINGERPRINT_PATTERN
+
+
+def _normalize(body: str) -> str:
+    # GitHub может вернуть текст с переводами строк \r\n
+    return body.replace("\r\n", "\n").strip()
+
+
+def content_fingerprint(body: str) -> str:
+    """
+    Вычисляет отпечаток текста описания.
+
+    :param body: Текст описания без отпечатка.
+    :return: SHA-256 нормализованного текста.
+    """
+    return hashlib.sha256(_normalize(body).encode("utf8")).hexdigest()
+
+
+def add_fingerprint(body: str) -> str:
+    """
+    Добавляет к описанию отпечаток в виде скрытого HTML-комментария.
+
+    :param body: Текст описания.
+    :return: Текст описания с отпечатком.
+    """
+    return f"{_normalize(body)}\n\n<!-- release-notes: {content_fingerprint(body)} -->"
+
+
+def is_up_to_date(current_body: Optional[str], body: str) -> bool:
+    """
+    Проверяет, что текущее описание уже совпадает с новым.
+
+    Отпечаток в комментарии сверяется и с новым текстом, и с текстом перед
+    комментарием, поэтому ручная правка описания тоже считается изменением.
+
+    :param current_body: Текущее описание в GitHub.
+    :param body: Новый текст описания без отпечатка.
+    :return: True, если запись в GitHub не нужна.
+    """
+    if not current_body:
+        return False
+    match = FINGERPRINT_PATTERN.search(current_body)
+    if not match:
+        return False
+    fingerprint = content_fingerprint(body)
+    return match.group(1) == fingerprint and (
+        content_fingerprint(current_body[: match.start()]) == fingerprint
+    )
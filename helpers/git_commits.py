@@ -0,0 +1,126 @@
+import re
+import subprocess
+from typing import Dict, List, Optional
+
+from github.Commit import Commit
+from github.MainClass import Github
+from github.Repository import Repository
+
+from config.logger_config import logger
+
+from .github_records import CommitRecord, GitCommitRecord, GitUserRecord
+
+# Поля коммита разделяются символом 0x1f, коммиты - символом 0x1e
+_LOG_FORMAT = "%H%x1f%P%x1f%ae%x1f%B%x1e"
+# Адрес, который GitHub подставляет вместо скрытой почты пользователя
+_NOREPLY_EMAIL_PATTERN = re.compile(
+    r"(?:\d+\+)?([A-Za-z0-9-]+)@users\.noreply\.github\.com"
+)
+
+
+class LocalGitCommits:
+    """
+    Коммиты из локального клона репозитория.
+
+    Читает диапазон коммитов одним вызовом git log, без постраничных
+    запросов к GitHub API и без ограничения в 250 коммитов.
+    """
+
+    def __init__(self, path: str, gh: Github, repo: Repository):
+        self.path = path
+        self.gh = gh
+        self.repo = repo
+        self._is_shallow: Optional[bool] = None
+        self._logins: Dict[str, Optional[str]] = {}
+
+    def get_commits(self, base: str, head: str) -> Optional[List[CommitRecord]]:
+        """
+        Возвращает коммиты диапазона base..head от старых к новым.
+
+        :param base: SHA базового коммита.
+        :param head: SHA последнего коммита.
+        :return: Список коммитов или None, если их нельзя прочитать локально.
+        """
+        if not self.is_available(base, head):
+            return None
+        output = self._git(
+            "log", "--reverse", f"--format={_LOG_FORMAT}", f"{base}..{head}"
+        )
+        commits = [
+            self._create_commit(*entry.strip("\n").split("\x1f", 3))
+            for entry in output.split("\x1e")
+            if entry.strip()
+        ]
+        logger.info(
+            "Read %s commits of %s..%s from local git", len(commits), base, head
+        )
+        return commits
+
+    def is_available(self, *revisions: str) -> bool:
+        """
+        Проверяет, что клон полный и содержит нужные коммиты.
+
+        :param revisions: SHA коммитов.
+        :return: True, если коммиты можно прочитать локально.
+        """
+        try:
+            if self._is_shallow is None:
+                self._is_shallow = (
+                    self._git("rev-parse", "--is-shallow-repository").strip() == "true"
+                )
+            if self._is_shallow:
+                logger.info("Local git checkout is shallow, using GitHub API")
+                return False
+            output = self._git(
+                "cat-file",
+                "--batch-check",
+                stdin="".join(f"{revision}\n" for revision in revisions),
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.info("Local git is unavailable, using GitHub API: %s", e)
+            return False
+        return "missing" not in output
+
+    def _git(self, *args: str, stdin: Optional[str] = None) -> str:
+        # Каталог рабочей копии принадлежит другому пользователю контейнера
+        return subprocess.run(
+            ["git", "-c", "safe.directory=*", "-C", self.path, *args],
+            input=stdin,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+    def _create_commit(
+        self, sha: str, parents: str, email: str, message: str
+    ) -> CommitRecord:
+        api_commit = self.gh.create_from_raw_data(
+            Commit, {"sha": sha, "url": f"{self.repo.url}/commits/{sha}"}
+        )
+        return CommitRecord(
+            sha=sha,
+            commit=GitCommitRecord(message=message.rstrip("\n")),
+            author=GitUserRecord(lambda: self._get_login(email, sha)),
+            parents=tuple(parents.split()),
+            pulls_loader=lambda: list(api_commit.get_pulls()),
+        )
+
+    def _get_login(self, email: str, sha: str) -> Optional[str]:
+        """
+        Определяет логин GitHub автора коммита по его почте.
+
+        Логин из адреса noreply берётся без запроса, для остальных адресов
+        запрашивается один коммит автора.
+
+        :param email: Почта автора коммита.
+        :param sha: SHA коммита этого автора.
+        :return: Логин или None, если автор не связан с пользователем GitHub.
+        """
+        if email not in self._logins:
+            match = _NOREPLY_EMAIL_PATTERN.fullmatch(email)
+            if match:
+                self._logins[email] = match.group(1)
+            else:
+                author = self.repo.get_commit(sha).author
+                self._logins[email] = author.login if author else None
+        return self._logins[email]
@@ -1,39 +1,127 @@
 import json
-import re
-from typing import Dict, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 # isort: off
-from github import Github  # type: ignore  # pylint: disable=no-name-in-module
-from github import PullRequest
+from github import Consts, Github  # type: ignore  # pylint: disable=no-name-in-module
+from github.GithubException import GithubException
+from github.GithubObject import CompletableGithubObject
+from github.PullRequest import PullRequest
+from github.Requester import Requester
 
 # isort: on
 
-from config.constants import MAIN_TITLE_NAME, TASK_KEY_PATTERN
+from config.constants import MAIN_TITLE_NAME, RUN_STATE_PATTERN
 from config.logger_config import logger
 from mixins.github import EpicTaskMixin, HotfixMixin, ReleaseMixin
 
+from .commit_message import tokenize_commit_messages
+from .file_cache import FileCache
+from .fingerprint import add_fingerprint, is_up_to_date
+from .git_commits import LocalGitCommits
+from .github_graphql import GithubGraphQL
+from .github_rate_limit import SERVER_ERROR_RETRY, RateLimitScheduler
+from .github_records import AnyPullRequest
+from .github_transport import github_connection_classes
+from .merge_commit import is_epic_branch, pull_request_link
+from .run_metrics import run_metrics
+from .run_state import MAX_BODY_LENGTH, decode_run_state, encode_run_state
+from .task_registry import TaskRecord, TaskRegistry
 from .yandex_tracker import YandexTracker
 
+# Количество одновременных запросов к GitHub API. Держим небольшим,
+# чтобы не упираться во вторичные ограничения частоты запросов
+DEFAULT_GITHUB_CONCURRENCY = 8
 
-class GithubService(EpicTaskMixin, HotfixMixin, ReleaseMixin):
 
-    def __init__(
+class GithubService(  # pylint: disable=too-many-instance-attributes,too-many-public-methods
+    EpicTaskMixin, HotfixMixin, ReleaseMixin
+):
+
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         github_data_path: str,
         token: str,
         repo_name: str,
         yt_service: YandexTracker,
+        *,
+        use_graphql: bool = False,
+        github_concurrency: int = DEFAULT_GITHUB_CONCURRENCY,
+        etag_cache: Optional[FileCache] = None,
+        git_path: Optional[str] = None,
+        api_url: str = Consts.DEFAULT_BASE_URL,
     ):
         # Загружаем данные из файла и инициализируем объекты Github и YandexTracker
         with open(github_data_path, "r", encoding="utf8") as f:
             data = json.load(f)
-        gh = Github(token)
-        self.repo = gh.get_repo(repo_name)
+        # Все запросы к GitHub проходят через общий планировщик лимита запросов
+        self.rate_limit = RateLimitScheduler()
+        self.etag_cache = etag_cache
+        # Классы соединений действуют до вызова close()
+        Requester.injectConnectionClasses(
+            *github_connection_classes(self.rate_limit, etag_cache)
+        )
+        # Паузы между запросами задаёт планировщик по заголовкам лимита, а
+        # встроенные паузы PyGithub общие для всех потоков и выстраивают
+        # параллельные запросы в очередь. Это касается и пауз между записями:
+        # запросы GraphQL тоже считаются записями, а на превышение вторичного
+        # лимита GitHub отвечает Retry-After, который соблюдает планировщик
+        gh = Github(
+            token,
+            base_url=api_url,
+            retry=SERVER_ERROR_RETRY,
+            seconds_between_requests=None,
+            seconds_between_writes=None,
+        )
+        # Репозиторий и pull request строятся без запросов: данные pull request'а
+        # уже есть в событии, а репозиторий загрузится, только если понадобится
+        self.repo = gh.get_repo(repo_name, lazy=True)
         pr_number = int(data["pull_request"]["number"])
-        self.main_pull_request = self.repo.get_pull(number=pr_number)
-        self.main_commits = self.main_pull_request.get_commits()
+        self.main_pull_request = gh.create_from_raw_data(
+            PullRequest, data["pull_request"]
+        )
+        # Кэш pull request'ов текущего запуска по номеру
+        self.pull_requests: Dict[int, AnyPullRequest] = {
+            pr_number: self.main_pull_request
+        }
+        # Коммиты читаются из локального клона, если он указан и не является неполным
+        self.local_git = LocalGitCommits(git_path, gh, self.repo) if git_path else None
+        local_commits = (
+            self.local_git.get_commits(
+                data["pull_request"]["base"]["sha"], data["pull_request"]["head"]["sha"]
+            )
+            if self.local_git
+            else None
+        )
+        self.main_commits: Iterable
+        if local_commits is not None:
+            self.main_commits = local_commits
+        elif use_graphql:
+            # Коммиты вместе со связанными pull request'ами загружаются
+            # постранично, без отдельного запроса get_pulls() на каждый коммит
+            self.main_commits = GithubGraphQL(gh.requester, repo_name).get_pull_commits(
+                pr_number
+            )
+        else:
+            self.main_commits = self.main_pull_request.get_commits()
+        self.github_concurrency = github_concurrency
+        # Количество pull request'ов, догруженных отдельным запросом при сборе задач
+        self.lazy_completions = 0
         self.yandex_tracker = yt_service
-        self.tasks: List[Dict] = []
+        self.tasks = TaskRegistry()
+        self.task_summaries: Dict[str, Optional[str]] = {}
+        # Ключи задач, заголовки которых не получены из-за ошибки запроса
+        self.unresolved_task_keys: Set[str] = set()
+        # Состояние запуска, которое сохраняется в описании pull request'а
+        self.run_state: Optional[Dict[str, Any]] = None
+
+    @property
+    def tasks(self) -> TaskRegistry:
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks: Iterable[TaskRecord]) -> None:
+        self._tasks = tasks if isinstance(tasks, TaskRegistry) else TaskRegistry(tasks)
 
     def build_description_parts(self) -> List[str]:
         """
@@ -43,113 +131,310 @@ class GithubService(EpicTaskMixin, HotfixMixin, ReleaseMixin):
         """
         description_parts = [MAIN_TITLE_NAME]
         branch_name_type = self.main_pull_request.head.ref.split("/")[0]
-        if branch_name_type.lower() == "hotfix":
-            tasks = self.collect_hotfix_tasks()
-            unique_epic_tasks: set = set()
-        else:
-            tasks, unique_epic_tasks = self.collect_tasks()
+        with run_metrics.phase("commits"):
+            if branch_name_type.lower() == "hotfix":
+                tasks = self.collect_hotfix_tasks()
+                unique_epic_tasks: set = set()
+            else:
+                tasks, unique_epic_tasks = self.collect_tasks()
 
         # Список задач, которые не являются эпиками и не привязаны к эпическим задачам
         simple_tasks = [
             task
             for task in tasks
-            if not task["is_epic"]
-            and (task["task_key"] is None or task["task_key"] not in unique_epic_tasks)
+            if not task.is_epic
+            and (task.task_key is None or task.task_key not in unique_epic_tasks)
         ]
-        tasks_descriptions = self.build_task_lines(simple_tasks)
+        epic_tasks = [task for task in tasks if task.is_epic]
+        with run_metrics.phase("summaries"):
+            self.resolve_task_summaries(simple_tasks + epic_tasks)
+        with run_metrics.phase("rendering"):
+            tasks_descriptions = self.build_task_lines(simple_tasks)
+            description_parts.extend(f"* {row}" for row in tasks_descriptions)
+            description_parts.extend(
+                self.add_description_for_epic(task) for task in epic_tasks
+            )
+
+        return description_parts
+
+    def resolve_task_summaries(self, tasks: List[TaskRecord]) -> None:
+        """
+        Заранее получает заголовки всех задач, которые попадут в описание.
+
+        :param tasks: Список задач, включая эпики с их вложенными задачами.
+        """
+        task_keys = {
+            sub_task.task_key
+            for task in tasks
+            for sub_task in [task, *(task.tasks or [])]
+            if sub_task.task_key and sub_task.task_key not in self.task_summaries
+        }
+        if task_keys:
+            self.remember_task_summaries(
+                self.yandex_tracker.get_issue_summaries(task_keys)
+            )
+
+    def remember_task_summaries(self, summaries: Dict[str, Optional[str]]) -> None:
+        """
+        Запоминает заголовки задач, полученные из YandexTracker.
+
+        Задачи, которых точно нет в Трекере, сохраняются в состоянии запуска
+        наравне с найденными, а задачи, не полученные из-за ошибки, - нет.
 
-        description_parts.extend(f"* {row}" for row in tasks_descriptions)
-        description_parts.extend(
-            self.add_description_for_epic(task) for task in tasks if task["is_epic"]
+        :param summaries: Словарь "ключ задачи -> заголовок".
+        """
+        self.task_summaries.update(summaries)
+        self.unresolved_task_keys.update(
+            key
+            for key, summary in summaries.items()
+            if summary is None and not self.yandex_tracker.is_missing(key)
         )
 
-        return description_parts
+    def get_task_summary(self, task_key: str) -> Optional[str]:
+        """
+        Возвращает заголовок задачи, запрашивая его из YandexTracker один раз за запуск.
+
+        :param task_key: Ключ задачи.
+        :return: Заголовок задачи или None, если задача не найдена.
+        """
+        if task_key not in self.task_summaries:
+            self.remember_task_summaries(
+                {task_key: self.yandex_tracker.get_issue_summary(task_key)}
+            )
+        return self.task_summaries[task_key]
 
-    def build_task_lines(self, tasks: List[Dict]) -> List[str]:
+    def build_task_lines(
+        self, tasks: List[TaskRecord], with_author: bool = True
+    ) -> List[str]:
         """
         Формирует строки задач для описания Pull Request.
 
         :param tasks: Список задач.
+        :param with_author: Выводить ли автора задачи.
         :return: Список строк в формате Markdown.
         """
         result = []
+        # Все pull request'ы задач относятся к репозиторию основного pull request'а
+        pull_url = self.main_pull_request.html_url
         for task in tasks:
-            task_key = task.get("task_key")
-            author = task.get("author")
-            task_numbers: List[int] = task.get("number", [])
-            links: List[str] = task.get("links", [])
+            task_key = task.task_key
+            author = task.author if with_author else None
             markdown_links = ", ".join(
-                f"[#{task_num}]({link})" for task_num, link in zip(task_numbers, links)
+                f"[#{number}]({pull_request_link(pull_url, number)})"
+                for number in task.numbers
             )
 
             if task_key:
-                # Получаем заголовок задачи из YandexTracker по ключу
-                title = self.yandex_tracker.get_issue_summary(task_key)
+                title = self.get_task_summary(task_key)
                 if not title:
                     logger.info("[%s] (No task found)", task_key)
                     continue
                 task_line = self.formatted_line(task_key, title, author, markdown_links)
             else:
                 task_line = self.formatted_line(
-                    task_key, task.get("message"), author, markdown_links
+                    task_key, task.message, author, markdown_links
                 )
             result.append(task_line)
         return result
 
-    def collect_tasks(self) -> Tuple[List[Dict], Set[str]]:
+    def collect_tasks(self) -> Tuple[List[TaskRecord], Set[str]]:
         """
         Собирает задачи из коммитов, связанных с Pull Request.
 
         :return: Кортеж из списка задач и уникальных ключей эпических задач.
         """
         unique_epic_tasks: Set[str] = set()
-        for commit in self.main_commits:
-            commit_message = commit.commit.message
-            if "Merge pull request" in commit_message:
-                continue
-            pulls = commit.get_pulls()
+        commit_pulls = self.fetch_commit_pulls(
+            self.get_commits_to_process(unique_epic_tasks)
+        )
+        lazy_pulls = [
+            pull
+            for _, pulls in commit_pulls
+            for pull in pulls
+            if isinstance(pull, CompletableGithubObject) and not pull.completed
+        ]
+        # Сообщения всех коммитов разбираются один раз, а не для каждого pull request'а
+        commit_tokens = tokenize_commit_messages(
+            commit.commit.message for commit, _ in commit_pulls
+        )
+        for (_, pulls), tokens in zip(commit_pulls, commit_tokens):
             for pull in pulls:
-                if pull.number == self.main_pull_request.number or pull.mergeable:
+                if not self.is_released_pull(pull):
                     continue
                 is_epic = False
-                epic_tasks = []
-                head_branch = pull.head.ref.split("/")
-                if head_branch[0] == "epic" and len(head_branch) > 1:
-                    exist_pt = any(
-                        task["is_epic"] and pull.number in task["number"]
-                        for task in self.tasks
-                    )
-                    if exist_pt:
+                epic_tasks: List[TaskRecord] = []
+                if is_epic_branch(pull.head.ref):
+                    if self.tasks.has_epic(pull.number):
                         continue
                     logger.info("Epic found %s #%s", pull.title, pull.number)
                     is_epic = True
-                    epic_tasks = self._process_epic_tasks(pull)
+                    with run_metrics.phase("epics"):
+                        epic_tasks = self._process_epic_tasks(pull)
                     task_keys = {
-                        epic_task["task_key"]
+                        epic_task.task_key
                         for epic_task in epic_tasks
-                        if epic_task["task_key"]
+                        if epic_task.task_key
                     }
                     unique_epic_tasks.update(task_keys)
-                self.process_pull(pull, commit_message, is_epic, epic_tasks)
+                self.process_pull(pull, tokens.task_keys, is_epic, epic_tasks)
 
-        sorted_tasks = sorted(
-            self.tasks,
-            key=lambda x: (x["task_key"] is None, x["task_key"], x["is_epic"]),
+        self.count_lazy_completions(lazy_pulls)
+        self.run_state = {
+            "sha": self.main_pull_request.head.sha,
+            "tasks": [task.to_dict() for task in self.tasks],
+            "epic_task_keys": sorted(unique_epic_tasks),
+        }
+        return self.tasks.ordered(), unique_epic_tasks
+
+    def get_commits_to_process(self, unique_epic_tasks: Set[str]) -> List[Any]:
+        """
+        Возвращает коммиты, из которых нужно собрать задачи.
+
+        :param unique_epic_tasks: Множество ключей эпических задач для заполнения.
+        :return: Коммиты pull request'а или только новые коммиты, если
+            задачи предыдущего запуска восстановлены.
+        """
+        new_commits = self.restore_run_state(unique_epic_tasks)
+        return [
+            commit
+            for commit in (self.main_commits if new_commits is None else new_commits)
+            if "Merge pull request" not in commit.commit.message
+        ]
+
+    def restore_run_state(self, unique_epic_tasks: Set[str]) -> Optional[List[Any]]:
+        """
+        Восстанавливает задачи из состояния предыдущего запуска.
+
+        Состояние хранится в описании pull request'а. Если с прошлого запуска
+        в ветку только добавились коммиты, обрабатывать нужно лишь их.
+
+        :param unique_epic_tasks: Множество ключей эпических задач для заполнения.
+        :return: Новые коммиты или None, если задачи нужно собрать заново.
+        """
+        state = decode_run_state(self.main_pull_request.body)
+        if state is None:
+            return None
+        head_sha = self.main_pull_request.head.sha
+        try:
+            comparison = self.repo.compare(state["sha"], head_sha)
+            if comparison.status not in ("ahead", "identical"):
+                logger.info(
+                    "Branch history changed since %s, collecting all tasks",
+                    state["sha"],
+                )
+                return None
+            commits = list(comparison.commits)
+        except GithubException as e:
+            # Коммит состояния мог быть удалён после force push
+            logger.info(
+                "Cannot compare with %s, collecting all tasks: %s", state["sha"], e
+            )
+            return None
+
+        self.tasks = TaskRegistry(TaskRecord.from_dict(task) for task in state["tasks"])
+        unique_epic_tasks.update(state["epic_task_keys"])
+        self.task_summaries.update(state["summaries"])
+        logger.info(
+            "Restored %s tasks at %s, new commits: %s",
+            len(self.tasks),
+            state["sha"],
+            len(commits),
         )
-        return sorted_tasks, unique_epic_tasks
+        return commits
+
+    def is_released_pull(self, pull: AnyPullRequest) -> bool:
+        """
+        Проверяет, что pull request попадает в описание релиза.
+
+        Используются только поля, которые GitHub возвращает в списках pull request'ов,
+        поэтому проверка не требует дополнительных запросов. Открытые и закрытые
+        без слияния pull request'ы не имеют merged_at, а влитые в целевую ветку
+        релиза уже были выпущены.
+
+        :param pull: Объект pull request.
+        :return: True, если pull request нужно включить в описание.
+        """
+        return (
+            pull.number != self.main_pull_request.number
+            and pull.merged_at is not None
+            and pull.base.ref != self.main_pull_request.base.ref
+        )
+
+    def count_lazy_completions(self, pulls: Sequence[CompletableGithubObject]) -> None:
+        """
+        Считает pull request'ы, которые PyGithub догрузил отдельным запросом.
+
+        :param pulls: Pull request'ы, которые были неполными до сбора задач.
+        """
+        completed = sum(1 for pull in pulls if pull.completed)
+        if completed:
+            logger.warning(
+                "Collecting tasks completed %s pull requests with extra requests",
+                completed,
+            )
+        self.lazy_completions += completed
+
+    def get_pull_commits(self, pull: AnyPullRequest) -> Iterable:
+        """
+        Возвращает коммиты pull request'а, по возможности из локального клона.
+
+        :param pull: Объект pull request.
+        :return: Коммиты pull request'а.
+        """
+        if self.local_git and isinstance(pull, PullRequest):
+            commits = self.local_git.get_commits(pull.base.sha, pull.head.sha)
+            if commits is not None:
+                return commits
+        return pull.get_commits()
+
+    def fetch_commit_pulls(
+        self, commits: List[Any]
+    ) -> List[Tuple[Any, List[AnyPullRequest]]]:
+        """
+        Получает pull request'ы, связанные с коммитами, параллельно.
+
+        Запросы выполняются в пуле потоков ограниченного размера,
+        результат возвращается в порядке исходных коммитов.
+
+        :param commits: Список коммитов.
+        :return: Список пар из коммита и связанных с ним pull request'ов.
+        """
+        if not commits:
+            return []
+        workers = min(self.github_concurrency, len(commits))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pulls = executor.map(lambda commit: list(commit.get_pulls()), commits)
+            return [
+                (commit, self.remember_pull_requests(commit_pulls))
+                for commit, commit_pulls in zip(commits, pulls)
+            ]
+
+    def remember_pull_requests(
+        self, pulls: Iterable[AnyPullRequest]
+    ) -> List[AnyPullRequest]:
+        """
+        Сохраняет pull request'ы в кэше запуска.
+
+        Для уже известного номера возвращается сохранённый объект,
+        чтобы его данные не загружались из GitHub повторно.
+
+        :param pulls: Pull request'ы из любого списка GitHub API.
+        :return: Pull request'ы из кэша в исходном порядке.
+        """
+        return [self.pull_requests.setdefault(pull.number, pull) for pull in pulls]
 
     def process_pull(
         self,
-        pull: PullRequest.PullRequest,
-        commit_message: str,
+        pull: AnyPullRequest,
+        task_keys: Sequence[str],
         is_epic: bool = False,
-        epic_tasks: Optional[List[Dict]] = None,
+        epic_tasks: Optional[List[TaskRecord]] = None,
     ):
         """
         Обрабатывает pull request и обновляет список задач.
 
         :param pull: Объект pull request.
-        :param commit_message: Сообщение коммита.
+        :param task_keys: Ключи задач из сообщения коммита.
         :param is_epic: Флаг, является ли pull request эпиком.
         :param epic_tasks: Список задач, связанных с эпиком.
         """
@@ -158,21 +443,20 @@ class GithubService(EpicTaskMixin, HotfixMixin, ReleaseMixin):
             task_key = pull_head[1]
             self.update_or_create_task(pull, task_key, is_epic, epic_tasks)
             return
-        all_matches = self.extract_task_keys(commit_message, TASK_KEY_PATTERN)
-        if all_matches:
-            for task_key in all_matches:
+        if task_keys:
+            for task_key in task_keys:
                 self.update_or_create_task(pull, task_key, is_epic, epic_tasks)
         else:
             self.tasks.append(
-                self.create_task_dict(pull=pull, is_epic=is_epic, epic_tasks=epic_tasks)
+                self.create_task(pull=pull, is_epic=is_epic, epic_tasks=epic_tasks)
             )
 
     def update_or_create_task(
         self,
-        pull: PullRequest.PullRequest,
+        pull: AnyPullRequest,
         task_key: str,
         is_epic: bool = False,
-        epic_tasks: Optional[List[Dict]] = None,
+        epic_tasks: Optional[List[TaskRecord]] = None,
     ):
         """
         Обновляет существующую задачу или создаёт новую.
@@ -182,22 +466,7 @@ class GithubService(EpicTaskMixin, HotfixMixin, ReleaseMixin):
         :param is_epic: Флаг, является ли задача эпической.
         :param epic_tasks: Список задач, связанных с эпиком.
         """
-        task_indexes = [
-            i
-            for i, task in enumerate(self.tasks)
-            if task["task_key"] == task_key and task["author"] == pull.user.login
-        ]
-        if not task_indexes:
-            self.tasks.append(
-                self.create_task_dict(pull, task_key, is_epic, epic_tasks)
-            )
-            return
-        for task_index in task_indexes:
-            if pull.number not in self.tasks[task_index]["number"]:
-                self.tasks[task_index]["number"].append(pull.number)
-                self.tasks[task_index]["links"].append(pull.html_url)
-            if is_epic and epic_tasks is not None:
-                self.collect_epic_tasks(epic_tasks, task_index)
+        self.tasks.upsert(self.create_task(pull, task_key, is_epic, epic_tasks))
 
     @staticmethod
     def formatted_line(
@@ -222,50 +491,85 @@ class GithubService(EpicTaskMixin, HotfixMixin, ReleaseMixin):
         return f"{task_key_str}{title}{user_login_str} in {pr_numbers}"
 
     @staticmethod
-    def extract_task_keys(commit_message: str, pattern: re.Pattern) -> Set[str]:
-        """
-        Извлекает ключи задач из сообщения коммита.
-
-        :param commit_message: Сообщение коммита.
-        :param pattern: Регулярное выражение для поиска ключей задач.
-        :return: Множество ключей задач.
-        """
-        return {
-            key.strip()
-            for keys in pattern.findall(commit_message)
-            for key in keys.split(",")
-        }
-
-    @staticmethod
-    def create_task_dict(
-        pull: PullRequest.PullRequest,
+    def create_task(
+        pull: AnyPullRequest,
         task_key: Optional[str] = None,
         is_epic: bool = False,
-        epic_tasks: Optional[List[Dict]] = None,
-    ) -> Dict:
+        epic_tasks: Optional[List[TaskRecord]] = None,
+    ) -> TaskRecord:
         """
-        Создает словарь задачи.
+        Создает задачу из pull request.
 
         :param pull: Объект pull request.
         :param task_key: Ключ задачи.
         :param is_epic: Флаг, является ли задача эпической.
         :param epic_tasks: Список задач, связанных с эпиком.
-        :return: Словарь задачи.
-        """
-        return {
-            "is_epic": is_epic,
-            "number": [pull.number],
-            "links": [pull.html_url],
-            "message": pull.title if task_key is None else None,
-            "author": pull.user.login,
-            "task_key": task_key,
-            "tasks": epic_tasks,
-        }
+        :return: Задача.
+        """
+        return TaskRecord(
+            task_key=task_key,
+            message=pull.title if task_key is None else None,
+            author=pull.user.login,
+            numbers=[pull.number],
+            is_epic=is_epic,
+            tasks=epic_tasks,
+        )
 
     def change_pull_request_body(self, body: str):
         """
-        Изменяет тело основного pull request.
+        Изменяет тело основного pull request, если оно отличается от текущего.
+
+        Состояние запуска записывается перед текстом и не входит в отпечаток.
+        Если текст не изменился, описание перезаписывается только тогда, когда
+        сохранённое состояние относится к другому коммиту: иначе следующие
+        запуски снова обрабатывали бы одни и те же коммиты.
 
         :param body: Новое тело pull request.
         """
+        current_body = self.main_pull_request.body
+        run_state = None
+        if self.run_state is not None:
+            run_state = encode_run_state(
+                {
+                    **self.run_state,
+                    "summaries": {
+                        key: summary
+                        for key, summary in sorted(self.task_summaries.items())
+                        if key not in self.unresolved_task_keys
+                    },
+                },
+                # Описание вместе с состоянием и отпечатком не должно превышать
+                # ограничение GitHub, иначе изменение описания не пройдёт
+                max_length=MAX_BODY_LENGTH - len(add_fingerprint(body)) - 2,
+            )
+        stored_state = decode_run_state(current_body)
+        if is_up_to_date(RUN_STATE_PATTERN.sub("", current_body or ""), body) and (
+            run_state is None
+            or (
+                stored_state is not None
+                and self.run_state is not None
+                and stored_state.get("sha") == self.run_state["sha"]
+            )
+        ):
+            logger.info("Pull request body is up to date")
+            return
+        body = add_fingerprint(body)
+        if run_state:
+            body = f"{run_state}\n\n{body}"
         self.main_pull_request.edit(body=body)
+
+    def close(self) -> None:
+        """
+        Возвращает PyGithub стандартные классы соединений.
+
+        Классы соединений задаются для всего процесса, поэтому без этого
+        планировщик и кэш сервиса достались бы следующим объектам Github.
+        """
+        Requester.resetConnectionClasses()
+
+    def save_cache(self) -> None:
+        """
+        Сохраняет кэш ответов GitHub, если он используется.
+        """
+        if self.etag_cache:
+            self.etag_cache.save()
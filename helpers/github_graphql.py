@@ -0,0 +1,172 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+from github.Requester import Requester
+
+from config.logger_config import logger
+
+# conflict with black linter
+# isort: off
+from .github_records import (
+    AnyPullRequest,
+    CommitRecord,
+    GitCommitRecord,
+    PullRequestRecord,
+    RefRecord,
+    UserRecord,
+)
+
+# isort: on
+
+# Максимальный размер страницы GraphQL API
+_COMMITS_PAGE_SIZE = 100
+# Количество связанных pull request'ов, запрашиваемых для коммита
+_ASSOCIATED_PULLS_LIMIT = 10
+# Логин, который GitHub показывает для удалённых пользователей
+_GHOST_LOGIN = "ghost"
+
+PULL_COMMITS_QUERY = """
+query ($owner: String!, $name: String!, $number: Int!, $cursor: String, $pageSize: Int!, $pullsLimit: Int!) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      commits(first: $pageSize, after: $cursor) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          commit {
+            oid
+            message
+            author {
+              user {
+                login
+              }
+            }
+            parents(first: 2) {
+              nodes {
+                oid
+              }
+            }
+            associatedPullRequests(first: $pullsLimit) {
+              nodes {
+                number
+                title
+                url
+                state
+                mergedAt
+                headRefName
+                baseRefName
+                author {
+                  login
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLCommitList:  # pylint: disable=too-few-public-methods
+    """
+    Коммиты pull request'а, загружаемые через GraphQL при первом обходе.
+
+    Каждый коммит сразу содержит связанные с ним pull request'ы,
+    поэтому get_pulls() не выполняет дополнительных запросов.
+    """
+
+    def __init__(self, client: "GithubGraphQL", pull_number: int):
+        self.client = client
+        self.pull_number = pull_number
+        self._commits: Optional[List[CommitRecord]] = None
+
+    def __iter__(self) -> Iterator[CommitRecord]:
+        if self._commits is None:
+            self._commits = list(self.client.iter_pull_commits(self.pull_number))
+        return iter(self._commits)
+
+
+class GithubGraphQL:
+    """
+    Клиент GitHub GraphQL API для постраничной загрузки коммитов pull request'а.
+    """
+
+    def __init__(self, requester: Requester, repo_name: str):
+        self.requester = requester
+        self.owner, self.name = repo_name.split("/", 1)
+        self.pages_loaded = 0
+
+    def get_pull_commits(self, pull_number: int) -> GraphQLCommitList:
+        """
+        Возвращает ленивый список коммитов pull request'а.
+
+        :param pull_number: Номер pull request.
+        :return: Объект GraphQLCommitList.
+        """
+        return GraphQLCommitList(self, pull_number)
+
+    def iter_pull_commits(self, pull_number: int) -> Iterator[CommitRecord]:
+        """
+        Загружает коммиты pull request'а вместе со связанными pull request'ами.
+
+        :param pull_number: Номер pull request.
+        :return: Итератор по коммитам.
+        """
+        cursor = None
+        while True:
+            _, data = self.requester.graphql_query(
+                PULL_COMMITS_QUERY,
+                {
+                    "owner": self.owner,
+                    "name": self.name,
+                    "number": pull_number,
+                    "cursor": cursor,
+                    "pageSize": _COMMITS_PAGE_SIZE,
+                    "pullsLimit": _ASSOCIATED_PULLS_LIMIT,
+                },
+            )
+            self.pages_loaded += 1
+            commits = data["data"]["repository"]["pullRequest"]["commits"]
+            for node in commits["nodes"]:
+                yield self._create_commit(node["commit"])
+            page_info = commits["pageInfo"]
+            if not page_info["hasNextPage"]:
+                break
+            cursor = page_info["endCursor"]
+        logger.info(
+            "GraphQL: loaded commits of #%s, pages total: %s",
+            pull_number,
+            self.pages_loaded,
+        )
+
+    def _create_commit(self, commit: Dict[str, Any]) -> CommitRecord:
+        author_user = (commit.get("author") or {}).get("user")
+        pulls: List[AnyPullRequest] = [
+            self._create_pull(pull)
+            for pull in commit["associatedPullRequests"]["nodes"]
+        ]
+        return CommitRecord(
+            sha=commit["oid"],
+            commit=GitCommitRecord(message=commit["message"]),
+            author=UserRecord(login=author_user["login"]) if author_user else None,
+            parents=tuple(parent["oid"] for parent in commit["parents"]["nodes"]),
+            pulls_loader=lambda: pulls,
+        )
+
+    def _create_pull(self, pull: Dict[str, Any]) -> PullRequestRecord:
+        number = pull["number"]
+        author = pull.get("author") or {}
+        return PullRequestRecord(
+            number=number,
+            title=pull["title"],
+            html_url=pull["url"],
+            head=RefRecord(ref=pull["headRefName"]),
+            base=RefRecord(ref=pull["baseRefName"]),
+            user=UserRecord(login=author.get("login", _GHOST_LOGIN)),
+            state=pull["state"],
+            merged_at=pull["mergedAt"],
+            commits_loader=lambda: list(self.get_pull_commits(number)),
+        )
@@ -0,0 +1,156 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from github.Requester import RequestsResponse
+from urllib3.util import Retry
+
+from config.logger_config import logger
+
+# Ниже этого остатка запросы равномерно распределяются до сброса лимита
+DEFAULT_RESERVE = 100
+# Сколько раз запрос повторяется после ответа о превышении лимита
+_MAX_RATE_LIMIT_RETRIES = 5
+# GitHub рекомендует ждать не меньше минуты после вторичного лимита
+_SECONDARY_LIMIT_BACKOFF = 60.0
+_MAX_BACKOFF = 15 * 60.0
+_RATE_LIMIT_STATUSES = (403, 429)
+
+# Повторы ошибок сервера. Ответы о превышении лимита обрабатывает планировщик,
+# поэтому они не входят в список и возвращаются без повторов
+SERVER_ERROR_RETRY = Retry(
+    total=3, backoff_factor=1.0, status_forcelist=(500, 502, 503, 504)
+)
+
+
+class RateLimitScheduler:  # pylint: disable=too-many-instance-attributes
+    """
+    Общий для всех запросов к GitHub учёт лимита запросов.
+
+    Следит за заголовками X-RateLimit-* и Retry-After, замедляет запросы
+    при малом остатке лимита и приостанавливает их после ответа о превышении.
+    """
+
+    def __init__(
+        self,
+        reserve: int = DEFAULT_RESERVE,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.reserve = reserve
+        self.sleep = sleep
+        self.requests = 0
+        self.used = 0
+        self.retries = 0
+        # Остаток лимита и время его сброса по ресурсу: core, graphql и т.д.
+        self.budgets: Dict[str, Tuple[int, float]] = {}
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self, resource: str) -> None:
+        """
+        Приостанавливает запрос, если лимит почти исчерпан или GitHub просил подождать.
+
+        :param resource: Ресурс лимита, к которому относится запрос.
+        """
+        with self._lock:
+            now = time.time()
+            delay = self._paused_until - now
+            if resource in self.budgets:
+                remaining, reset_at = self.budgets[resource]
+                if remaining < self.reserve and reset_at > now:
+                    # Оставшиеся запросы распределяются до сброса лимита,
+                    # при нулевом остатке запрос ждёт сброса
+                    delay = max(delay, (reset_at - now) / max(remaining, 1))
+                # Запрос учитывается сразу, чтобы параллельные потоки не превысили остаток
+                self.budgets[resource] = (max(remaining - 1, 0), reset_at)
+        if delay > 0:
+            logger.info("GitHub rate limit: waiting %.1f s", delay)
+            self.sleep(delay)
+
+    def update(
+        self, resource: str, status: int, headers: Mapping[str, str], body: str
+    ) -> Optional[float]:
+        """
+        Учитывает ответ GitHub.
+
+        :param resource: Ресурс лимита, к которому относился запрос.
+        :param status: HTTP-статус ответа.
+        :param headers: Заголовки ответа в нижнем регистре.
+        :param body: Тело ответа.
+        :return: Задержка перед повтором, если запрос упёрся в лимит, иначе None.
+        """
+        now = time.time()
+        with self._lock:
+            self.requests += 1
+            # Условные запросы с ответом 304 не расходуют лимит
+            if status != 304:
+                self.used += 1
+            if "x-ratelimit-remaining" in headers:
+                self.budgets[headers.get("x-ratelimit-resource", resource)] = (
+                    int(headers["x-ratelimit-remaining"]),
+                    float(headers.get("x-ratelimit-reset", 0)),
+                )
+            if status not in _RATE_LIMIT_STATUSES:
+                return None
+
+            if "retry-after" in headers:
+                delay = float(headers["retry-after"])
+            elif headers.get("x-ratelimit-remaining") == "0":
+                delay = float(headers.get("x-ratelimit-reset", now)) - now
+            elif status == 429 or "rate limit" in body.lower():
+                delay = _SECONDARY_LIMIT_BACKOFF * 2 ** min(self.retries, 4)
+            else:
+                # Обычный отказ в доступе
+                return None
+            delay = min(max(delay, 1.0), _MAX_BACKOFF)
+            self.retries += 1
+            self._paused_until = max(self._paused_until, now + delay)
+        logger.warning("GitHub rate limit exceeded, retrying in %.1f s", delay)
+        return delay
+
+    def summary(self) -> str:
+        """
+        Возвращает сводку использования лимита за запуск.
+
+        :return: Строка для журнала.
+        """
+        budgets = ", ".join(
+            f"{resource} remaining {remaining}"
+            for resource, (remaining, _) in sorted(self.budgets.items())
+        )
+        return (
+            f"GitHub API: {self.requests} requests, {self.used} counted against "
+            f"the rate limit, {self.retries} retries after limit ({budgets or 'no data'})"
+        )
+
+
+class RateLimitConnectionMixin:
+    """
+    Соединение PyGithub, которое согласует каждый запрос с планировщиком.
+    """
+
+    scheduler: RateLimitScheduler
+    url: str
+
+    def request(self, *args: Any, **kwargs: Any) -> None:
+        super().request(*args, **kwargs)  # type: ignore[misc]
+        self.scheduler.wait(self._resource)
+
+    def getresponse(self) -> RequestsResponse:
+        attempt = 0
+        while True:
+            response = super().getresponse()  # type: ignore[misc]
+            headers = {key.lower(): value for key, value in response.getheaders()}
+            body = response.read() if response.status in _RATE_LIMIT_STATUSES else ""
+            delay = self.scheduler.update(
+                self._resource, response.status, headers, body
+            )
+            if delay is None or attempt >= _MAX_RATE_LIMIT_RETRIES:
+                return response
+            attempt += 1
+            # Повторный запрос ждёт окончания паузы, заданной планировщиком
+            self.scheduler.wait(self._resource)
+
+    @property
+    def _resource(self) -> str:
+        return "graphql" if self.url.split("?")[0].endswith("/graphql") else "core"
@@ -0,0 +1,79 @@
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple, Union
+
+from github import PullRequest
+
+
+@dataclass(frozen=True)
+class RefRecord:
+    ref: str
+
+
+@dataclass(frozen=True)
+class UserRecord:
+    login: str
+
+
+class GitUserRecord:  # pylint: disable=too-few-public-methods
+    """
+    Автор коммита из локального git, логин которого определяется при обращении.
+    """
+
+    def __init__(self, login_loader: Callable[[], Optional[str]]):
+        self.login_loader = login_loader
+
+    @property
+    def login(self) -> Optional[str]:
+        return self.login_loader()
+
+
+@dataclass(frozen=True)
+class GitCommitRecord:
+    message: str
+
+
+@dataclass
+class PullRequestRecord:  # pylint: disable=too-many-instance-attributes
+    """
+    Pull request, полученный не через REST-объекты PyGithub.
+
+    Повторяет атрибуты PullRequest, которые используют сборщики задач,
+    поэтому обрабатывается тем же кодом.
+    """
+
+    number: int
+    title: str
+    html_url: str
+    head: RefRecord
+    base: RefRecord
+    user: UserRecord
+    state: str
+    merged_at: Optional[str]
+    commits_loader: Callable[[], List["CommitRecord"]] = field(
+        repr=False, compare=False
+    )
+
+    def get_commits(self) -> List["CommitRecord"]:
+        return self.commits_loader()
+
+
+# Pull request из REST API или из альтернативного источника данных
+AnyPullRequest = Union[PullRequest.PullRequest, PullRequestRecord]
+
+
+@dataclass
+class CommitRecord:
+    """
+    Коммит, полученный не через REST-объекты PyGithub.
+
+    Повторяет атрибуты Commit, которые используют сборщики задач.
+    """
+
+    sha: str
+    commit: GitCommitRecord
+    author: Optional[Union[UserRecord, GitUserRecord]]
+    parents: Tuple[str, ...]
+    pulls_loader: Callable[[], List[AnyPullRequest]] = field(repr=False, compare=False)
+
+    def get_pulls(self) -> List[AnyPullRequest]:
+        return self.pulls_loader()
@@ -0,0 +1,206 @@
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Tuple, Type
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# conflict with black linter
+# isort: off
+from github.Requester import (
+    HTTPRequestsConnectionClass,
+    HTTPSRequestsConnectionClass,
+    RequestsResponse,
+)
+
+# isort: on
+
+from .file_cache import FileCache
+from .github_rate_limit import RateLimitConnectionMixin, RateLimitScheduler
+from .run_metrics import RunMetrics, run_metrics
+
+# Заголовки ответа, которые нужны PyGithub для разбора сохранённого ответа
+_CACHED_HEADERS = ("content-type", "etag", "last-modified", "link")
+
+
+class ETagCacheConnectionMixin:
+    """
+    Соединение PyGithub, которое повторно использует неизменившиеся ответы GET.
+
+    Ответы с ETag сохраняются в кэш, а следующий запрос того же ресурса
+    отправляется с If-None-Match. Ответ 304 не расходует лимит запросов
+    и заменяется сохранённым телом.
+    """
+
+    etag_cache: Optional[FileCache]
+    host: str
+    _cache_key: Optional[str] = None
+
+    def request(  # pylint: disable=too-many-positional-arguments
+        self,
+        verb: str,
+        url: str,
+        input: Any,  # pylint: disable=redefined-builtin
+        headers: Dict[str, str],
+        stream: bool = False,
+    ) -> None:
+        self._cache_key = None
+        if self.etag_cache is not None and verb == "GET" and not stream:
+            self._cache_key = hashlib.sha256(
+                f"{self.host}{url}|{headers.get('Accept', '')}".encode("utf8")
+            ).hexdigest()
+            cached = self.etag_cache.get(self._cache_key)
+            if cached:
+                headers = {**headers, "If-None-Match": cached["etag"]}
+        super().request(verb, url, input, headers, stream)  # type: ignore[misc]
+
+    def getresponse(self) -> RequestsResponse:
+        response = super().getresponse()  # type: ignore[misc]
+        if self.etag_cache is None or self._cache_key is None:
+            return response
+
+        if response.status == 304:
+            cached = self.etag_cache.get(self._cache_key)
+            if cached:
+                run_metrics.record_cache("github_etags", True)
+                return self._cached_response(cached)
+        run_metrics.record_cache("github_etags", False)
+        if response.status == 200:
+            headers = {key.lower(): value for key, value in response.getheaders()}
+            if "etag" in headers:
+                self.etag_cache.set(
+                    self._cache_key,
+                    {
+                        "etag": headers["etag"],
+                        "headers": {
+                            name: headers[name]
+                            for name in _CACHED_HEADERS
+                            if name in headers
+                        },
+                        "body": response.read(),
+                    },
+                )
+        return response
+
+    @staticmethod
+    def _cached_response(cached: Dict[str, Any]) -> RequestsResponse:
+        """
+        Собирает ответ из сохранённой записи кэша.
+
+        :param cached: Запись кэша.
+        :return: Ответ в формате, который ожидает PyGithub.
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(cached["headers"])
+        content = cached["body"].encode("utf8")
+        response._content = content  # pylint: disable=protected-access
+        response.encoding = "utf-8"
+        return RequestsResponse(response)
+
+
+class RequestMetricsConnectionMixin:
+    """
+    Соединение PyGithub, которое учитывает каждый HTTP-запрос в метриках запуска.
+    """
+
+    metrics: RunMetrics
+    _verb = ""
+    _url = ""
+    _stream = False
+
+    def request(  # pylint: disable=too-many-positional-arguments
+        self,
+        verb: str,
+        url: str,
+        input: Any,  # pylint: disable=redefined-builtin
+        headers: Dict[str, str],
+        stream: bool = False,
+    ) -> None:
+        self._verb = verb
+        self._url = url
+        self._stream = stream
+        super().request(verb, url, input, headers, stream)  # type: ignore[misc]
+
+    def getresponse(self) -> RequestsResponse:
+        response = super().getresponse()  # type: ignore[misc]
+        # Размер ответа по заголовку, а без него - по уже полученному телу.
+        # Тело потокового ответа не читается, чтобы не загружать его заранее
+        size = response.headers.get("Content-Length")
+        if size is None and not self._stream:
+            size = len(response.response.content)
+        self.metrics.record_request(
+            "github", self._verb, self._url, response.status, int(size or 0)
+        )
+        return response
+
+
+class SessionReuseConnectionMixin:  # pylint: disable=too-few-public-methods
+    """
+    Соединение PyGithub, которое использует keep-alive сессию своего потока.
+
+    После injectConnectionClasses PyGithub создаёт новое соединение на каждый
+    запрос и закрывает предыдущее. Сессия requests с пулом соединений
+    хранится в классе отдельно для каждого потока, поэтому TCP и TLS
+    соединения переиспользуются, а потоки не закрывают сессии друг друга.
+    """
+
+    sessions: threading.local
+    session: requests.Session
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)  # type: ignore[call-arg]
+        session = getattr(self.sessions, "session", None)
+        if session is None:
+            self.sessions.session = self.session
+        else:
+            # Новая сессия ещё не открывала соединений, её можно сразу заменить
+            self.session.close()
+            self.session = session
+
+    def close(self) -> None:
+        # Сессия остаётся открытой для следующих запросов потока
+        pass
+
+
+def github_connection_classes(
+    scheduler: RateLimitScheduler, etag_cache: Optional[FileCache] = None
+) -> Tuple[Type[HTTPRequestsConnectionClass], Type[HTTPSRequestsConnectionClass]]:
+    """
+    Создаёт классы соединений PyGithub с планировщиком лимита, кэшем ETag,
+    учётом запросов в метриках запуска и keep-alive сессиями потоков.
+
+    Классы передаются в Requester.injectConnectionClasses.
+
+    :param scheduler: Планировщик запросов.
+    :param etag_cache: Кэш ответов по ETag или None, если кэш не используется.
+    :return: Классы соединений для http и https.
+    """
+    attributes = {
+        "scheduler": scheduler,
+        "etag_cache": etag_cache,
+        "metrics": run_metrics,
+    }
+    http_class = type(
+        "GithubHTTPConnection",
+        (
+            ETagCacheConnectionMixin,
+            RateLimitConnectionMixin,
+            RequestMetricsConnectionMixin,
+            SessionReuseConnectionMixin,
+            HTTPRequestsConnectionClass,
+        ),
+        {**attributes, "sessions": threading.local()},
+    )
+    https_class = type(
+        "GithubHTTPSConnection",
+        (
+            ETagCacheConnectionMixin,
+            RateLimitConnectionMixin,
+            RequestMetricsConnectionMixin,
+            SessionReuseConnectionMixin,
+            HTTPSRequestsConnectionClass,
+        ),
+        {**attributes, "sessions": threading.local()},
+    )
+    return http_class, https_class
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from config.constants import EPIC_BRANCH_PREFIX, MERGE_PULL_REQUEST_PREFIX
+
+
+@dataclass(frozen=True)
+class MergeCommit:
+    """
+    Данные pull request'а из сообщения merge-коммита GitHub.
+    """
+
+    number: int
+
+
+def parse_merge_commit(message: str) -> Optional[MergeCommit]:
+    """
+    Разбирает сообщение "Merge pull request #N from owner/branch".
+
+    Из сообщения берётся только номер pull request'а: ветку и автора
+    экшен получает из самого pull request'а.
+
+    Разбор выполняется поиском подстрок, без регулярных выражений, и занимает
+    линейное от длины сообщения время.
+
+    :param message: Сообщение коммита.
+    :return: Данные merge-коммита или None, если коммит не является merge-коммитом.
+    """
+    start = message.find(MERGE_PULL_REQUEST_PREFIX)
+    while start >= 0:
+        number_start = start + len(MERGE_PULL_REQUEST_PREFIX)
+        number_end = _skip(message, number_start, str.isdecimal)
+        if number_end > number_start:
+            return MergeCommit(number=int(message[number_start:number_end]))
+        start = message.find(MERGE_PULL_REQUEST_PREFIX, number_start)
+    return None
+
+
+def _skip(message: str, position: int, predicate: Callable[[str], bool]) -> int:
+    # Позиция первого символа, не подходящего под условие
+    while position < len(message) and predicate(message[position]):
+        position += 1
+    return position
+
+
+def is_epic_branch(branch: str) -> bool:
+    """
+    Проверяет, что ветка является веткой эпика: epic/<название>.
+
+    :param branch: Название ветки.
+    :return: True для ветки эпика.
+    """
+    prefix, separator, _ = branch.partition("/")
+    return prefix == EPIC_BRANCH_PREFIX and bool(separator)
+
+
+def pull_request_link(pull_url: str, number: int) -> str:
+    """
+    Строит ссылку на pull request того же репозитория без запроса к GitHub.
+
+    :param pull_url: Ссылка на любой pull request репозитория.
+    :param number: Номер pull request.
+    :return: Ссылка на pull request.
+    """
+    return f"{pull_url.rsplit('/', 1)[0]}/{number}"
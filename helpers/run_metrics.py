@@ -0,0 +1,255 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config.constants import ISSUE_KEY_PATTERN
+
+# SHA коммита в пути запроса заменяется шаблоном при группировке запросов
+_SHA_LENGTH = 40
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+@dataclass
+class PhaseMetrics:
+    """
+    Время и количество запросов одного этапа запуска.
+    """
+
+    name: str
+    seconds: float = 0.0
+    requests: int = 0
+    calls: int = 0
+
+
+@dataclass
+class EndpointMetrics:
+    """
+    Запросы к одному эндпоинту API.
+    """
+
+    service: str
+    endpoint: str
+    requests: int = 0
+    bytes: int = 0
+    errors: int = 0
+
+
+@dataclass
+class CacheMetrics:
+    """
+    Попадания в кэш и промахи.
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+
+class RunMetrics:
+    """
+    Метрики запуска: время этапов, запросы к API, кэши и остаток лимита GitHub.
+
+    Этапы могут быть вложенными, время вложенного этапа входит и во внешний.
+    Повторный вход в этап суммирует время.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.phases: Dict[str, PhaseMetrics] = {}
+        self.endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+        self.caches: Dict[str, CacheMetrics] = {}
+        # Остаток лимита GitHub по ресурсу в конце запуска
+        self.rate_limit: Dict[str, int] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Измеряет время этапа и количество запросов, выполненных за это время.
+
+        :param name: Название этапа.
+        """
+        started_at = self.clock()
+        requests = self.requests
+        try:
+            yield
+        finally:
+            with self._lock:
+                phase = self.phases.setdefault(name, PhaseMetrics(name))
+                phase.seconds += self.clock() - started_at
+                phase.requests += self.requests - requests
+                phase.calls += 1
+
+    def record_request(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, service: str, method: str, url: str, status: int, size: int
+    ) -> None:
+        """
+        Учитывает выполненный HTTP-запрос.
+
+        :param service: Сервис: github или tracker.
+        :param method: HTTP-метод.
+        :param url: Адрес запроса.
+        :param status: HTTP-статус ответа.
+        :param size: Размер тела ответа в байтах.
+        """
+        endpoint = endpoint_name(method, url)
+        with self._lock:
+            self.requests += 1
+            metrics = self.endpoints.setdefault(
+                (service, endpoint), EndpointMetrics(service, endpoint)
+            )
+            metrics.requests += 1
+            metrics.bytes += size
+            if status >= 400:
+                metrics.errors += 1
+
+    def record_cache(self, name: str, hit: bool, count: int = 1) -> None:
+        """
+        Учитывает обращения к кэшу.
+
+        :param name: Название кэша.
+        :param hit: True, если данные взяты из кэша.
+        :param count: Количество обращений.
+        """
+        with self._lock:
+            metrics = self.caches.setdefault(name, CacheMetrics())
+            if hit:
+                metrics.hits += count
+            else:
+                metrics.misses += count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Возвращает метрики в виде, пригодном для сохранения в JSON.
+
+        :return: Словарь метрик.
+        """
+        return {
+            "phases": [
+                {**asdict(phase), "seconds": round(phase.seconds, 3)}
+                for phase in self.phases.values()
+            ],
+            "endpoints": [asdict(endpoint) for endpoint in self._sorted_endpoints()],
+            "caches": {
+                name: {**asdict(cache), "hit_ratio": cache.hit_ratio}
+                for name, cache in sorted(self.caches.items())
+            },
+            "rate_limit": dict(sorted(self.rate_limit.items())),
+        }
+
+    def to_markdown(self) -> str:
+        """
+        Формирует таблицы метрик для сводки GitHub Actions.
+
+        :return: Текст в формате Markdown.
+        """
+        lines = [
+            "### Release notes metrics",
+            "",
+            "| Phase | Time, s | Requests |",
+            "|-------|---------|----------|",
+        ]
+        lines.extend(
+            f"| {phase.name} | {phase.seconds:.2f} | {phase.requests} |"
+            for phase in self.phases.values()
+        )
+        if self.endpoints:
+            lines.extend(
+                [
+                    "",
+                    "| Service | Endpoint | Requests | Bytes | Errors |",
+                    "|---------|----------|----------|-------|--------|",
+                ]
+            )
+            lines.extend(
+                f"| {endpoint.service} | `{endpoint.endpoint}` | {endpoint.requests} "
+                f"| {endpoint.bytes} | {endpoint.errors} |"
+                for endpoint in self._sorted_endpoints()
+            )
+        if self.caches:
+            lines.extend(
+                [
+                    "",
+                    "| Cache | Hits | Misses | Hit ratio |",
+                    "|-------|------|--------|-----------|",
+                ]
+            )
+            lines.extend(
+                f"| {name} | {cache.hits} | {cache.misses} | "
+                f"{'-' if cache.hit_ratio is None else f'{cache.hit_ratio:.0%}'} |"
+                for name, cache in sorted(self.caches.items())
+            )
+        if self.rate_limit:
+            remaining = ", ".join(
+                f"{resource}: {value}"
+                for resource, value in sorted(self.rate_limit.items())
+            )
+            lines.extend(["", f"GitHub rate limit remaining: {remaining}"])
+        return "\n".join(lines) + "\n"
+
+    def _sorted_endpoints(self) -> List[EndpointMetrics]:
+        # Сначала самые частые запросы каждого сервиса
+        return sorted(
+            self.endpoints.values(),
+            key=lambda endpoint: (endpoint.service, -endpoint.requests),
+        )
+
+    def write(self, summary_path: Optional[str], json_path: Optional[str]) -> None:
+        """
+        Записывает метрики в сводку задания и в JSON-файл.
+
+        :param summary_path: Файл сводки из $GITHUB_STEP_SUMMARY или None.
+        :param json_path: Путь к JSON-файлу или None.
+        """
+        if summary_path:
+            # Сводку могут дополнять другие шаги, поэтому файл дописывается
+            with open(summary_path, "a", encoding="utf8") as f:
+                f.write(self.to_markdown())
+        if json_path:
+            with open(json_path, "w", encoding="utf8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """
+    Группирует адреса запросов по эндпоинтам.
+
+    Номера и SHA коммитов в пути, в том числе в сравнении "sha...sha",
+    и ключи задач Трекера в пути /issues/ заменяются шаблонами, параметры
+    запроса отбрасываются.
+
+    :param method: HTTP-метод.
+    :param url: Адрес запроса, полный или только путь.
+    :return: Строка вида "GET /repos/owner/repo/pulls/{number}".
+    """
+    segments: List[str] = []
+    for segment in urlsplit(url).path.split("/"):
+        if segment.isdecimal():
+            segment = "{number}"
+        elif "..." in segment:
+            segment = "...".join(
+                "{sha}" if _is_sha(ref) else ref for ref in segment.split("...")
+            )
+        elif _is_sha(segment):
+            segment = "{sha}"
+        elif segments[-1:] == ["issues"] and ISSUE_KEY_PATTERN.fullmatch(segment):
+            segment = "{key}"
+        segments.append(segment)
+    return f"{method} {'/'.join(segments)}"
+
+
+def _is_sha(value: str) -> bool:
+    return len(value) == _SHA_LENGTH and set(value) <= _HEX_DIGITS
+
+
+# Метрики текущего запуска, общие для всех сервисов
+run_metrics = RunMetrics()
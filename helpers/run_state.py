@@ -0,0 +1,60 @@
+import base64
+import json
+import zlib
+from typing import Any, Dict, Optional
+
+from config.constants import RUN_STATE_PATTERN
+from config.logger_config import logger
+
+# Версия формата состояния, состояние другой версии игнорируется
+RUN_STATE_VERSION = 2
+# Максимальная длина описания pull request'а в GitHub
+MAX_BODY_LENGTH = 65536
+# Ограничение на размер состояния независимо от длины описания
+_MAX_RUN_STATE_LENGTH = 30000
+
+
+def encode_run_state(
+    state: Dict[str, Any], max_length: int = _MAX_RUN_STATE_LENGTH
+) -> Optional[str]:
+    """
+    Упаковывает состояние запуска в скрытый HTML-комментарий.
+
+    :param state: Состояние запуска, сериализуемое в JSON.
+    :param max_length: Допустимая длина комментария, например остаток
+        длины описания pull request'а.
+    :return: HTML-комментарий или None, если состояние слишком велико.
+    """
+    data = json.dumps(
+        {"version": RUN_STATE_VERSION, **state},
+        ensure_ascii=False,
+        separators=(",", ":"),
+        # Одинаковое состояние всегда кодируется одинаково
+        sort_keys=True,
+    )
+    payload = base64.b64encode(zlib.compress(data.encode("utf8"), 9)).decode("ascii")
+    comment = f"<!-- release-notes-state: {payload} -->"
+    if len(comment) > min(max_length, _MAX_RUN_STATE_LENGTH):
+        logger.info("Run state is too large to store: %s bytes", len(comment))
+        return None
+    return comment
+
+
+def decode_run_state(body: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Извлекает состояние предыдущего запуска из описания pull request'а.
+
+    :param body: Описание pull request'а.
+    :return: Состояние запуска или None, если его нет или оно повреждено.
+    """
+    match = RUN_STATE_PATTERN.search(body or "")
+    if not match:
+        return None
+    try:
+        state = json.loads(zlib.decompress(base64.b64decode(match.group(1))))
+    except (ValueError, zlib.error) as e:
+        logger.info("Run state is unreadable, ignoring it: %s", e)
+        return None
+    if not isinstance(state, dict) or state.get("version") != RUN_STATE_VERSION:
+        return None
+    return state
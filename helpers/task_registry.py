@@ -0,0 +1,197 @@
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+@dataclass(slots=True)
+class TaskRecord:
+    """
+    Задача релиза или задача эпика.
+
+    Ссылки на pull request'ы не хранятся, а строятся по номерам при выводе.
+    Изменяется только через TaskRegistry.
+    """
+
+    task_key: Optional[str]
+    # Заголовок pull request'а или сообщение коммита для задачи без ключа
+    message: Optional[str]
+    author: Optional[str]
+    numbers: List[int]
+    is_epic: bool = False
+    # Задачи эпика, у остальных задач None
+    tasks: Optional[List["TaskRecord"]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Преобразует задачу в словарь для сохранения в состоянии запуска.
+
+        :return: Словарь задачи.
+        """
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskRecord":
+        """
+        Восстанавливает задачу из словаря состояния запуска.
+
+        :param data: Словарь задачи.
+        :return: Задача.
+        """
+        tasks = data.get("tasks")
+        return cls(
+            task_key=data["task_key"],
+            message=data["message"],
+            author=data["author"],
+            numbers=list(data["numbers"]),
+            is_epic=data["is_epic"],
+            tasks=None if tasks is None else [cls.from_dict(task) for task in tasks],
+        )
+
+
+def task_sort_key(task: TaskRecord) -> Tuple:
+    # Задачи с ключом по алфавиту, затем задачи без ключа, эпики после задач
+    return task.task_key is None, task.task_key, task.is_epic
+
+
+class TaskRegistry:
+    """
+    Задачи релиза с индексами, заменяющими перебор списка задач.
+
+    Индексы по ключу задачи и автору, номерам pull request'ов и задачам
+    эпиков обновляются при каждом изменении через методы реестра. Изменения
+    выполняются под блокировкой, поэтому реестр можно заполнять из потоков.
+    """
+
+    def __init__(self, tasks: Iterable[TaskRecord] = ()):
+        self._tasks: List[TaskRecord] = []
+        self._by_key_author: Dict[
+            Tuple[Optional[str], Optional[str]], List[TaskRecord]
+        ] = {}
+        # Номера pull request'ов и задачи эпиков по id словаря задачи
+        self._numbers: Dict[int, Set[int]] = {}
+        self._epic_tasks: Dict[int, Set[Tuple[Optional[str], Optional[str]]]] = {}
+        # Номера pull request'ов, которые уже входят в эпики
+        self._epic_numbers: Set[int] = set()
+        self._ordered: Optional[List[TaskRecord]] = None
+        self._lock = threading.RLock()
+        for task in tasks:
+            self.append(task)
+
+    def __iter__(self) -> Iterator[TaskRecord]:
+        return iter(list(self._tasks))
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __getitem__(self, index: int) -> TaskRecord:
+        return self._tasks[index]
+
+    def append(self, task: TaskRecord) -> None:
+        """
+        Добавляет задачу в реестр.
+
+        :param task: Задача.
+        """
+        with self._lock:
+            self._tasks.append(task)
+            self._by_key_author.setdefault((task.task_key, task.author), []).append(
+                task
+            )
+            self._numbers[id(task)] = set(task.numbers)
+            if task.is_epic:
+                self._epic_numbers.update(task.numbers)
+                self._epic_tasks[id(task)] = {
+                    (epic_task.task_key, epic_task.message)
+                    for epic_task in task.tasks or []
+                }
+            self._ordered = None
+
+    def upsert(self, task: TaskRecord) -> None:
+        """
+        Добавляет задачу или объединяет её с задачами того же ключа и автора.
+
+        Поиск и изменение выполняются под одной блокировкой, поэтому задачу
+        с одним ключом из разных потоков нельзя добавить дважды.
+
+        :param task: Новая задача; для эпика - вместе с его задачами.
+        """
+        with self._lock:
+            existing = self._by_key_author.get((task.task_key, task.author))
+            if not existing:
+                self.append(task)
+                return
+            for existing_task in existing:
+                for number in task.numbers:
+                    self.add_pull_request(existing_task, number)
+                if task.is_epic and task.tasks is not None:
+                    self.add_epic_tasks(existing_task, task.tasks)
+
+    def find(self, task_key: Optional[str], author: Optional[str]) -> List[TaskRecord]:
+        """
+        Возвращает задачи с указанным ключом и автором.
+
+        :param task_key: Ключ задачи.
+        :param author: Логин автора.
+        :return: Список задач в порядке добавления.
+        """
+        return list(self._by_key_author.get((task_key, author), []))
+
+    def has_epic(self, number: int) -> bool:
+        """
+        Проверяет, что pull request уже входит в эпическую задачу.
+
+        :param number: Номер pull request.
+        :return: True, если эпик с этим pull request'ом уже собран.
+        """
+        return number in self._epic_numbers
+
+    def add_pull_request(self, task: TaskRecord, number: int) -> None:
+        """
+        Добавляет к задаче pull request, если его ещё нет в задаче.
+
+        :param task: Задача из реестра.
+        :param number: Номер pull request.
+        """
+        with self._lock:
+            numbers = self._numbers[id(task)]
+            if number in numbers:
+                return
+            numbers.add(number)
+            task.numbers.append(number)
+            if task.is_epic:
+                self._epic_numbers.add(number)
+
+    def add_epic_tasks(
+        self, task: TaskRecord, epic_tasks: Iterable[TaskRecord]
+    ) -> None:
+        """
+        Добавляет к эпику задачи, которых в нём ещё нет.
+
+        Задача эпика считается уже добавленной, если совпадают ключ и сообщение.
+
+        :param task: Эпическая задача из реестра.
+        :param epic_tasks: Задачи эпика.
+        """
+        with self._lock:
+            known = self._epic_tasks.setdefault(id(task), set())
+            if task.tasks is None:
+                task.tasks = []
+            for epic_task in epic_tasks:
+                identity = (epic_task.task_key, epic_task.message)
+                if identity in known:
+                    continue
+                known.add(identity)
+                task.tasks.append(epic_task)
+
+    def ordered(self) -> List[TaskRecord]:
+        """
+        Возвращает задачи в порядке вывода в описании.
+
+        Порядок вычисляется один раз и сбрасывается при добавлении задачи.
+
+        :return: Отсортированный список задач.
+        """
+        with self._lock:
+            if self._ordered is None:
+                self._ordered = sorted(self._tasks, key=task_sort_key)
+            return list(self._ordered)
@@ -1,41 +1,246 @@
+import asyncio
+import hashlib
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
 import requests
+from requests.adapters import HTTPAdapter
 
+from config.constants import ISSUE_KEY_PATTERN
 from config.logger_config import logger
 
+from .file_cache import FileCache
+from .run_metrics import run_metrics
+
 _REQUEST_TIMEOUT = 300.0
+DEFAULT_IAM_TOKEN_URL = "https://iam.api.cloud.yandex.net/iam/v1/tokens"
+# Таймауты (подключение, чтение) обмена OAuth-токена на IAM-токен
+_IAM_TIMEOUT = (10.0, 60.0)
+# Время жизни IAM-токена, если API не вернул expiresAt
+_IAM_TOKEN_LIFETIME = 12 * 60 * 60
+# IAM-токен обновляется заранее, за это количество секунд до истечения
+_IAM_TOKEN_REFRESH_MARGIN = 5 * 60
+DEFAULT_TRACKER_API_URL = "https://api.tracker.yandex.net/v2"
+# Поля задачи, которые используются при формировании описания
+_ISSUE_FIELDS = "key,summary,aliases,updatedAt"
+# Поля задачи, достаточные для проверки актуальности кэша
+_REVALIDATE_FIELDS = "key,aliases,updatedAt"
+# Количество пулов соединений: по одному на хост IAM и Трекера
+_POOL_CONNECTIONS = 2
+# Количество одновременных запросов задач по умолчанию
+DEFAULT_CONCURRENCY = 10
+# Ответы, после которых задача считается ненайденной до конца запуска
+_MISSING_ISSUE_STATUSES = (403, 404)
+# Максимальное количество ключей в одном запросе поиска задач
+_SEARCH_CHUNK_SIZE = 50
+# Размер страницы при получении списка очередей
+_QUEUES_PAGE_SIZE = 100
 
 
-class YandexTracker:  # pylint: disable=too-few-public-methods
+class YandexTracker:  # pylint: disable=too-many-instance-attributes
 
-    def __init__(self, org_id, token):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        org_id,
+        token,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        *,
+        cache: Optional[FileCache] = None,
+        token_cache: Optional[FileCache] = None,
+        api_url: str = DEFAULT_TRACKER_API_URL,
+        iam_token_url: str = DEFAULT_IAM_TOKEN_URL,
+    ):
         self.org_id = org_id
-        response = requests.post(
-            headers={
-                "Content-Type": "application/json",
-            },
-            url="https://iam.api.cloud.yandex.net/iam/v1/tokens",
-            json={"yandexPassportOauthToken": token},
-            timeout=300.0,
+        self.api_url = api_url.rstrip("/")
+        self.iam_token_url = iam_token_url
+        self.cache = cache
+        self.concurrency = max(concurrency, 1)
+        self.session = self._create_session(self.concurrency)
+        self.token_cache = token_cache
+        self._oauth_token = token
+        # Ключ кэша зависит от OAuth-токена, чтобы не использовать чужой IAM-токен
+        self._token_cache_key = hashlib.sha256(token.encode()).hexdigest()
+        self._iam_token: Optional[str] = None
+        self._iam_token_expires_at = 0.0
+        self._iam_token_lock = threading.Lock()
+        # Заголовки задач, уже полученные за запуск; None - задача не найдена
+        self._summaries: Dict[str, Optional[str]] = {}
+        # Ключи очередей организации, None - список недоступен
+        self._queue_keys: Optional[Set[str]] = None
+        self._queue_keys_requested = False
+
+    @property
+    def iam_token(self) -> Optional[str]:
+        """
+        IAM-токен, обновляемый при приближении срока его действия.
+
+        Токен получается при первом обращении, поэтому запуски без задач
+        не обращаются к Yandex Cloud.
+        """
+        if self._iam_token is None:
+            self._load_iam_token()
+        if time.time() >= self._iam_token_expires_at - _IAM_TOKEN_REFRESH_MARGIN:
+            self.refresh_iam_token(self._iam_token)
+        return self._iam_token
+
+    def _load_iam_token(self) -> None:
+        """
+        Берёт IAM-токен из кэша, если он ещё действителен, иначе получает новый.
+        """
+        if self.token_cache:
+            cached = self.token_cache.get(self._token_cache_key)
+            if cached and time.time() < (
+                cached["expires_at"] - _IAM_TOKEN_REFRESH_MARGIN
+            ):
+                self._iam_token = cached["iam_token"]
+                self._iam_token_expires_at = cached["expires_at"]
+                return
+        self.refresh_iam_token(None)
+
+    def refresh_iam_token(self, expired_token: Optional[str]) -> None:
+        """
+        Обменивает OAuth-токен на новый IAM-токен.
+
+        Если токен уже обновлён другим потоком, повторный обмен не выполняется.
+
+        :param expired_token: IAM-токен, который нужно заменить.
+        """
+        with self._iam_token_lock:
+            if self._iam_token != expired_token:
+                return
+            with run_metrics.phase("iam"):
+                response = self.session.post(
+                    headers={
+                        "Content-Type": "application/json",
+                    },
+                    url=self.iam_token_url,
+                    json={"yandexPassportOauthToken": self._oauth_token},
+                    timeout=_IAM_TIMEOUT,
+                )
+            if response.status_code != 200:
+                logger.error(
+                    "YandexTracker Get IAM token exception: %s: %s",
+                    response.status_code,
+                    response.text,
+                )
+                response.raise_for_status()
+            response_data = response.json()
+            self._iam_token = response_data.get("iamToken")
+            self._iam_token_expires_at = self._parse_expires_at(
+                response_data.get("expiresAt")
+            )
+            if self.token_cache:
+                self.token_cache.set(
+                    self._token_cache_key,
+                    {
+                        "iam_token": self._iam_token,
+                        "expires_at": self._iam_token_expires_at,
+                    },
+                )
+                self.token_cache.save()
+
+    @staticmethod
+    def _parse_expires_at(expires_at: Optional[str]) -> float:
+        """
+        Преобразует срок действия IAM-токена в timestamp.
+
+        :param expires_at: Срок действия в формате ISO 8601.
+        :return: Timestamp окончания действия токена.
+        """
+        if expires_at:
+            try:
+                return datetime.fromisoformat(expires_at).timestamp()
+            except ValueError:
+                logger.info("Unexpected IAM token expiresAt: %s", expires_at)
+        return time.time() + _IAM_TOKEN_LIFETIME
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Выполняет запрос к API Трекера с авторизацией.
+
+        При ответе 401 IAM-токен обновляется и запрос повторяется один раз.
+
+        :param method: HTTP-метод.
+        :param url: Адрес запроса.
+        :return: Объект requests.Response.
+        """
+        iam_token = self.iam_token
+        resp = self.session.request(
+            method, url, headers=self._headers(iam_token), **kwargs
         )
-        if response.status_code != 200:
-            logger.error(
-                "YandexTracker Get IAM token exception: %s: %s",
-                response.status_code,
-                response.text,
+        if resp.status_code == 401:
+            logger.info("IAM token rejected by Tracker, refreshing it")
+            self.refresh_iam_token(iam_token)
+            resp = self.session.request(
+                method, url, headers=self._headers(self.iam_token), **kwargs
             )
-            response.raise_for_status()
-        response_data = response.json()
-        self.iam_token = response_data.get("iamToken")
+        return resp
+
+    @staticmethod
+    def _create_session(pool_maxsize: int) -> requests.Session:
+        """
+        Создаёт сессию с пулом keep-alive соединений и сжатием ответов.
+
+        :param pool_maxsize: Количество соединений с одним хостом.
+        :return: Объект requests.Session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=_POOL_CONNECTIONS, pool_maxsize=pool_maxsize
+        )
+        session.mount("https://", adapter)
+        session.headers.update(
+            {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        )
+        session.hooks["response"].append(YandexTracker._record_response)
+        return session
+
+    @staticmethod
+    def _record_response(
+        response: requests.Response, *_args: Any, **_kwargs: Any
+    ) -> None:
+        """
+        Учитывает ответ Трекера или IAM в метриках запуска.
+
+        :param response: Объект requests.Response.
+        """
+        size = response.headers.get("Content-Length")
+        run_metrics.record_request(
+            "tracker",
+            response.request.method or "",
+            response.url,
+            response.status_code,
+            int(size) if size is not None else len(response.content),
+        )
+
+    def _headers(self, iam_token: Optional[str]) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {iam_token}",
+            "X-Org-ID": self.org_id,
+            "Content-Type": "application/json",
+        }
 
     def get_issue_summary(self, issue):
-        url = f"https://api.tracker.yandex.net/v2/issues/{issue}"
-        resp = requests.get(
-            url=url,
-            headers={
-                "Authorization": f"Bearer {self.iam_token}",
-                "X-Org-ID": self.org_id,
-                "Content-Type": "application/json",
-            },
+        if issue not in self._summaries and self.filter_issue_keys([issue]):
+            issue_data = self._get_issue(issue)
+            if issue_data:
+                self._summaries[issue] = issue_data["summary"]
+        return self._summaries.get(issue)
+
+    def _get_issue(self, issue: str) -> Optional[Dict[str, Any]]:
+        """
+        Получает задачу по ключу.
+
+        :param issue: Ключ задачи.
+        :return: Данные задачи или None, если задача не получена.
+        """
+        url = f"{self.api_url}/issues/{issue}"
+        resp = self._request(
+            "GET",
+            url,
+            params={"fields": _ISSUE_FIELDS},
             timeout=_REQUEST_TIMEOUT,
         )
         if resp.status_code != 200:
@@ -44,6 +249,263 @@ class YandexTracker:  # pylint: disable=too-few-public-methods
                 resp.status_code,
                 resp.text,
             )
+            if resp.status_code in _MISSING_ISSUE_STATUSES:
+                # Задача не появится до конца запуска, повторно не запрашиваем
+                self._summaries[issue] = None
+            return None
+        return resp.json()
+
+    def get_issue_summaries(self, issues: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Получает заголовки нескольких задач через поиск по ключам.
+
+        Каждый ключ запрашивается не больше одного раза за запуск, в том числе
+        ключи ненайденных задач. Если подключён кэш, свежие записи берутся
+        из него, а устаревшие перезапрашиваются только при изменении поля
+        updatedAt задачи.
+
+        :param issues: Ключи задач.
+        :return: Словарь "ключ задачи -> заголовок", для ненайденных задач None.
+        """
+        requested_keys = set(issues)
+        stale_keys: List[str] = []
+        keys_to_fetch: List[str] = []
+        for key in self.filter_issue_keys(requested_keys - self._summaries.keys()):
+            cached = self.cache.get(self._cache_key(key)) if self.cache else None
+            if cached is None:
+                run_metrics.record_cache("tracker_issues", False)
+                keys_to_fetch.append(key)
+            elif self.cache and self.cache.is_fresh(self._cache_key(key)):
+                run_metrics.record_cache("tracker_issues", True)
+                self._summaries[key] = cached["summary"]
+            else:
+                stale_keys.append(key)
+
+        keys_to_fetch.extend(self._revalidate(stale_keys))
+        for key, issue_data in self._fetch_issues(keys_to_fetch).items():
+            if issue_data is None:
+                continue
+            self._summaries[key] = issue_data["summary"]
+            self._cache_issue(key, issue_data)
+
+        if self.cache:
+            self.cache.save()
+        return {key: self._summaries.get(key) for key in requested_keys}
+
+    def is_missing(self, issue: str) -> bool:
+        """
+        Проверяет, что задачи точно нет в Трекере.
+
+        :param issue: Ключ задачи.
+        :return: True, если ключ не является задачей Трекера или задача не найдена;
+            False, если задача найдена или не получена из-за ошибки запроса.
+        """
+        return issue in self._summaries and self._summaries[issue] is None
+
+    def filter_issue_keys(self, issues: Iterable[str]) -> List[str]:
+        """
+        Отбирает ключи, которые могут быть задачами Трекера.
+
+        Ключ должен иметь вид "ОЧЕРЕДЬ-НОМЕР" и относиться к одной из очередей
+        организации. Остальные ключи, например [Backend] или [WIP], запоминаются
+        как ненайденные и в Трекер не отправляются.
+
+        :param issues: Ключи задач.
+        :return: Отсортированный список допустимых ключей.
+        """
+        valid_keys: List[str] = []
+        candidates = {
+            issue: match.group(1).upper()
+            for issue in issues
+            if (match := ISSUE_KEY_PATTERN.fullmatch(issue))
+        }
+        queue_keys = self.get_queue_keys() if candidates else None
+        for issue in sorted(issues):
+            queue = candidates.get(issue)
+            if queue is None or (queue_keys is not None and queue not in queue_keys):
+                logger.info("[%s] (Not a Tracker issue key, skipped)", issue)
+                self._summaries[issue] = None
+                continue
+            valid_keys.append(issue)
+        return valid_keys
+
+    def get_queue_keys(self) -> Optional[Set[str]]:
+        """
+        Получает ключи очередей организации, один раз за запуск.
+
+        :return: Множество ключей очередей или None, если список недоступен.
+        """
+        if self._queue_keys_requested:
+            return self._queue_keys
+        self._queue_keys_requested = True
+        cache_key = f"{self.org_id}:queues"
+        if self.cache and self.cache.is_fresh(cache_key):
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._queue_keys = set(cached["keys"])
+                return self._queue_keys
+
+        queue_keys: Set[str] = set()
+        page, total_pages = 1, 1
+        while page <= total_pages:
+            resp = self._request(
+                "GET",
+                f"{self.api_url}/queues",
+                params={
+                    "fields": "key",
+                    "perPage": str(_QUEUES_PAGE_SIZE),
+                    "page": str(page),
+                },
+                timeout=_REQUEST_TIMEOUT,
+            )
+            if resp.status_code != 200:
+                logger.info(
+                    "Get Queues BadRequest: status_code: %s; text: %s",
+                    resp.status_code,
+                    resp.text,
+                )
+                return None
+            queue_keys.update(queue["key"].upper() for queue in resp.json())
+            total_pages = int(resp.headers.get("X-Total-Pages", page))
+            page += 1
+
+        self._queue_keys = queue_keys
+        if self.cache:
+            self.cache.set(cache_key, {"keys": sorted(queue_keys)})
+        return self._queue_keys
+
+    def _revalidate(self, keys: List[str]) -> List[str]:
+        """
+        Проверяет устаревшие записи кэша по времени обновления задач.
+
+        Неизменившиеся задачи берутся из кэша, их срок жизни продлевается.
+
+        :param keys: Ключи задач с устаревшими записями кэша.
+        :return: Ключи задач, которые нужно запросить заново.
+        """
+        if not keys or self.cache is None:
+            return keys
+        changed_keys: List[str] = []
+        for chunk in self._chunks(keys):
+            found = self._search_issues(chunk, _REVALIDATE_FIELDS)
+            if found is None:
+                run_metrics.record_cache("tracker_issues", False, len(chunk))
+                changed_keys.extend(chunk)
+                continue
+            for key in chunk:
+                cached = self.cache.get(self._cache_key(key))
+                issue_data = found.get(key.upper())
+                if (
+                    cached is None
+                    or issue_data is None
+                    or issue_data.get("updatedAt") != cached["updated_at"]
+                ):
+                    run_metrics.record_cache("tracker_issues", False)
+                    changed_keys.append(key)
+                    continue
+                run_metrics.record_cache("tracker_issues", True)
+                self._summaries[key] = cached["summary"]
+                self.cache.set(self._cache_key(key), cached)
+        return changed_keys
+
+    def _fetch_issues(self, keys: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Получает задачи поиском по ключам, а при ошибке поиска - по одной.
+
+        :param keys: Ключи задач.
+        :return: Словарь "ключ задачи -> данные задачи", для ненайденных задач None.
+        """
+        issues: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(keys)
+        unresolved_keys: List[str] = []
+        for chunk in self._chunks(keys):
+            found = self._search_issues(chunk, _ISSUE_FIELDS)
+            if found is None:
+                unresolved_keys.extend(chunk)
+                continue
+            for key in chunk:
+                issues[key] = found.get(key.upper())
+                if issues[key] is None:
+                    self._summaries[key] = None
+        if unresolved_keys:
+            # Поиск недоступен - запрашиваем оставшиеся задачи по одной
+            issues.update(self._get_issues_concurrently(unresolved_keys))
+        return issues
+
+    def _get_issues_concurrently(
+        self, issues: Iterable[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Получает задачи отдельными запросами, выполняя их параллельно.
+
+        Количество одновременных запросов ограничено параметром concurrency.
+
+        :param issues: Ключи задач.
+        :return: Словарь "ключ задачи -> данные задачи", для ненайденных задач None.
+        """
+        return dict(asyncio.run(self._gather_issues(issues)))
+
+    async def _gather_issues(
+        self, issues: Iterable[str]
+    ) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(issue: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+            async with semaphore:
+                return issue, await asyncio.to_thread(self._get_issue, issue)
+
+        return await asyncio.gather(*(fetch(issue) for issue in issues))
+
+    def _search_issues(
+        self, keys: List[str], fields: str
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Выполняет поиск задач по списку ключей.
+
+        Ключи в коммитах могут быть записаны в любом регистре, поэтому поиск
+        выполняется, а результат индексируется по ключам в верхнем регистре.
+
+        :param keys: Ключи задач, не больше размера страницы поиска.
+        :param fields: Поля задач, которые нужно получить.
+        :return: Словарь "ключ задачи в верхнем регистре -> данные задачи"
+            или None при ошибке запроса.
+        """
+        resp = self._request(
+            "POST",
+            f"{self.api_url}/issues/_search",
+            params={"perPage": str(_SEARCH_CHUNK_SIZE), "fields": fields},
+            json={"keys": [key.upper() for key in keys]},
+            timeout=_REQUEST_TIMEOUT,
+        )
+        if resp.status_code != 200:
+            logger.info(
+                "Search Issues BadRequest: status_code: %s; text: %s",
+                resp.status_code,
+                resp.text,
+            )
             return None
-        resp_json = resp.json()
-        return resp_json["summary"]
+        # Перенесённые задачи находятся по старому ключу, он хранится в aliases
+        return {
+            key.upper(): issue
+            for issue in resp.json()
+            for key in (issue["key"], *issue.get("aliases", []))
+        }
+
+    def _cache_key(self, issue: str) -> str:
+        return f"{self.org_id}:{issue}"
+
+    def _cache_issue(self, issue: str, issue_data: Dict[str, Any]) -> None:
+        if self.cache is None:
+            return
+        self.cache.set(
+            self._cache_key(issue),
+            {
+                "summary": issue_data["summary"],
+                "updated_at": issue_data.get("updatedAt"),
+            },
+        )
+
+    @staticmethod
+    def _chunks(keys: List[str]) -> Iterator[List[str]]:
+        for start in range(0, len(keys), _SEARCH_CHUNK_SIZE):
+            stop = start + _SEARCH_CHUNK_SIZE
+            yield keys[start:stop]
@@ -1,7 +1,21 @@
 from environs import Env
+from github import Consts
 
-from helpers.github import GithubService
-from helpers.yandex_tracker import YandexTracker
+from config.logger_config import logger
+from helpers.file_cache import FileCache
+from helpers.github import DEFAULT_GITHUB_CONCURRENCY, GithubService
+from helpers.run_metrics import run_metrics
+
+# conflict with black linter
+# isort: off
+from helpers.yandex_tracker import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_IAM_TOKEN_URL,
+    DEFAULT_TRACKER_API_URL,
+    YandexTracker,
+)
+
+# isort: on
 
 env = Env()
 
@@ -10,17 +24,73 @@ YANDEX_OAUTH2_TOKEN = env("INPUT_YANDEX_OAUTH2_TOKEN")
 GITHUB_TOKEN = env("INPUT_TOKEN")
 GITHUB_EVENT_PATH = env("GITHUB_EVENT_PATH")
 GITHUB_REPOSITORY = env("GITHUB_REPOSITORY")
+GITHUB_WORKSPACE = env("GITHUB_WORKSPACE", ".")
+GITHUB_API_URL = env("GITHUB_API_URL", Consts.DEFAULT_BASE_URL)
+TRACKER_CONCURRENCY = env.int("INPUT_TRACKER_CONCURRENCY", DEFAULT_CONCURRENCY)
+GITHUB_API = env("INPUT_GITHUB_API", "rest")
+GITHUB_CONCURRENCY = env.int("INPUT_GITHUB_CONCURRENCY", DEFAULT_GITHUB_CONCURRENCY)
+COMMIT_SOURCE = env("INPUT_COMMIT_SOURCE", "api")
+CACHE_DIR = env("INPUT_CACHE_DIR", "")
+CACHE_TTL = env.float("INPUT_CACHE_TTL", 6 * 60 * 60)
+# IAM-токен сохраняется на диск только по явному согласию: кэш могут восстановить
+# другие workflow, а токен действует до 12 часов
+CACHE_IAM_TOKEN = env.bool("INPUT_CACHE_IAM_TOKEN", False)
+METRICS_FILE = env("INPUT_METRICS_FILE", "")
+GITHUB_STEP_SUMMARY = env("GITHUB_STEP_SUMMARY", "")
+# Адреса API Трекера и Yandex Cloud IAM, переопределяются в бенчмарках
+TRACKER_API_URL = env("YANDEX_TRACKER_API_URL", DEFAULT_TRACKER_API_URL)
+IAM_TOKEN_URL = env("YANDEX_IAM_TOKEN_URL", DEFAULT_IAM_TOKEN_URL)
 
 
 def main():
-    yandex_tracker = YandexTracker(YANDEX_ORG_ID, YANDEX_OAUTH2_TOKEN)
-    github_service = GithubService(
-        GITHUB_EVENT_PATH, GITHUB_TOKEN, GITHUB_REPOSITORY, yandex_tracker
-    )
+    with run_metrics.phase("startup"):
+        yandex_tracker = YandexTracker(
+            YANDEX_ORG_ID,
+            YANDEX_OAUTH2_TOKEN,
+            TRACKER_CONCURRENCY,
+            cache=(
+                FileCache(CACHE_DIR, "tracker_issues", CACHE_TTL, evict_expired=True)
+                if CACHE_DIR
+                else None
+            ),
+            token_cache=(
+                FileCache(CACHE_DIR, "iam_token", 0)
+                if CACHE_DIR and CACHE_IAM_TOKEN
+                else None
+            ),
+            api_url=TRACKER_API_URL,
+            iam_token_url=IAM_TOKEN_URL,
+        )
+        github_service = GithubService(
+            GITHUB_EVENT_PATH,
+            GITHUB_TOKEN,
+            GITHUB_REPOSITORY,
+            yandex_tracker,
+            use_graphql=GITHUB_API == "graphql",
+            github_concurrency=GITHUB_CONCURRENCY,
+            etag_cache=(
+                FileCache(CACHE_DIR, "github_etags", 0, evict_unused=True)
+                if CACHE_DIR
+                else None
+            ),
+            git_path=GITHUB_WORKSPACE if COMMIT_SOURCE == "git" else None,
+            api_url=GITHUB_API_URL,
+        )
     description_parts = github_service.build_description_parts()
     pr_description = "\n".join(description_parts)
-    github_service.change_pull_request_body(pr_description)
-    github_service.create_draft_release(pr_description)
+    with run_metrics.phase("pull_request_edit"):
+        github_service.change_pull_request_body(pr_description)
+    with run_metrics.phase("release"):
+        github_service.create_draft_release(pr_description)
+    github_service.save_cache()
+    github_service.close()
+    logger.info(github_service.rate_limit.summary())
+
+    run_metrics.rate_limit = {
+        resource: remaining
+        for resource, (remaining, _) in github_service.rate_limit.budgets.items()
+    }
+    run_metrics.write(GITHUB_STEP_SUMMARY or None, METRICS_FILE or None)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
-from typing import Any, Dict, List, Optional
+from typing import List, Optional
 
 from github import Commit
 
-from config.constants import TASK_KEY_PATTERN
+from helpers.commit_message import tokenize_commit_messages
+from helpers.task_registry import TaskRecord
 
 
 class HotfixMixin:
@@ -10,32 +11,29 @@ class HotfixMixin:
     Миксин для работы с ветками hotfix в GitHub.
     """
 
-    def add_hotfix_task_dict(
+    def add_hotfix_task(
         self, commit: Commit.Commit, task_key: Optional[str] = None
-    ):
-        return {
-            "is_epic": False,
-            "number": [self.main_pull_request.number],  # type: ignore[attr-defined]
-            "links": [self.main_pull_request.html_url],  # type: ignore[attr-defined]
-            "message": commit.commit.message if task_key is None else None,
-            "author": commit.author.login,
-            "task_key": task_key,
-            "tasks": [],
-        }
+    ) -> TaskRecord:
+        return TaskRecord(
+            task_key=task_key,
+            message=commit.commit.message if task_key is None else None,
+            author=commit.author.login if commit.author else None,
+            numbers=[self.main_pull_request.number],  # type: ignore[attr-defined]
+        )
 
-    def collect_hotfix_tasks(self) -> List[Dict[str, Any]]:
-        for commit in self.main_commits:  # type: ignore[attr-defined]
-            commit_message = commit.commit.message
-            if "Merge pull request" in commit_message:
-                continue
-            all_matches = self.extract_task_keys(commit_message, TASK_KEY_PATTERN)  # type: ignore[attr-defined]
-            if all_matches:
-                for task_key in all_matches:
-                    self.tasks.append(self.add_hotfix_task_dict(commit, task_key))  # type: ignore[attr-defined]
-            else:
-                self.tasks.append(self.add_hotfix_task_dict(commit, task_key=None))  # type: ignore[attr-defined]
-        sorted_tasks = sorted(
-            self.tasks,  # type: ignore[attr-defined]
-            key=lambda x: (x["task_key"] is None, x["task_key"], x["is_epic"]),
+    def collect_hotfix_tasks(self) -> List[TaskRecord]:
+        commits = [
+            commit
+            for commit in self.main_commits  # type: ignore[attr-defined]
+            if "Merge pull request" not in commit.commit.message
+        ]
+        commit_tokens = tokenize_commit_messages(
+            commit.commit.message for commit in commits
         )
-        return sorted_tasks
+        for commit, tokens in zip(commits, commit_tokens):
+            if tokens.task_keys:
+                for task_key in tokens.task_keys:
+                    self.tasks.append(self.add_hotfix_task(commit, task_key))  # type: ignore[attr-defined]
+            else:
+                self.tasks.append(self.add_hotfix_task(commit, task_key=None))  # type: ignore[attr-defined]
+        return self.tasks.ordered()  # type: ignore[attr-defined]
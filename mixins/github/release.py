@@ -1,9 +1,12 @@
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from github import GitRelease
-from github.GithubException import UnknownObjectException
 
+from config.constants import RELEASE_TAG_PATTERN
 from config.logger_config import logger
+from helpers.fingerprint import add_fingerprint, is_up_to_date
+
+ReleaseVersion = Tuple[int, int, int]
 
 
 class ReleaseMixin:
@@ -50,46 +53,58 @@ class ReleaseMixin:
         :param pr_description: Описание pull request.
         :return: Объект GitRelease.
         """
-        last_version = self._get_latest_release_version()
+        last_version, releases = self._build_release_index()
         new_version = self.get_new_release_version(last_version, release_type)
-        if current_release := self._check_draft_release_exist(new_version):
+        if current_release := releases.get(self.parse_release_version(new_version)):
             self._update_release(current_release, pr_description)
             return
         self._create_release(pr_description, new_version, release_type)
 
-    def _get_latest_release_version(self) -> str:
+    def _build_release_index(
+        self,
+    ) -> Tuple[str, Dict[Optional[ReleaseVersion], GitRelease.GitRelease]]:
         """
-        Получает последнюю версию релиза из GitHub.
+        Находит последнюю опубликованную версию и более новые релизы за один проход.
+
+        GitHub отдаёт релизы от новых к старым. Черновик следующей версии может
+        быть создан раньше последнего опубликованного релиза, например если
+        хотфикс выпущен, пока готовился релиз. Поэтому обход продолжается
+        до первого опубликованного релиза с версией меньше последней.
 
-        :return: Строка с последней версией релиза.
+        :return: Кортеж из последней версии релиза и словаря релизов по версии.
         """
-        release_version = "1.0.0"
-        try:
-            latest_release = self.repo.get_latest_release()  # type: ignore[attr-defined]
-            release_version = latest_release.tag_name.strip().replace("v", "")
-        except UnknownObjectException:
+        releases: Dict[Optional[ReleaseVersion], GitRelease.GitRelease] = {}
+        last_version: Optional[ReleaseVersion] = None
+        for release in self.repo.get_releases():  # type: ignore[attr-defined]
+            version = self.parse_release_version(release.tag_name)
+            if version is None:
+                continue
+            if release.draft or release.prerelease:
+                releases.setdefault(version, release)
+            elif last_version is None:
+                last_version = version
+            elif version < last_version:
+                # Более старые релизы относятся к уже выпущенным версиям
+                break
+
+        if last_version is None:
             logger.info("No releases yet")
+            return "1.0.0", releases
+        return ".".join(str(part) for part in last_version), releases
 
-        return release_version
-
-    def _check_draft_release_exist(
-        self, last_version: str
-    ) -> Optional[GitRelease.GitRelease]:
+    @staticmethod
+    def parse_release_version(tag_name: str) -> Optional[ReleaseVersion]:
         """
-        Проверяет существование черновика релиза с указанной версией.
+        Разбирает версию релиза из тега.
 
-        :param last_version: Последняя версия релиза.
-        :return: Объект GitRelease или None.
+        :param tag_name: Тег релиза, например "v1.2.3".
+        :return: Кортеж из трёх чисел версии или None, если тег не является версией.
         """
-        releases = self.repo.get_releases()  # type: ignore[attr-defined]
-        current_version_releases = [
-            release for release in releases if last_version in release.tag_name
-        ]
-
-        if not current_version_releases:
+        match = RELEASE_TAG_PATTERN.fullmatch(tag_name.strip())
+        if not match:
             return None
-
-        return current_version_releases[0]
+        major, minor, patch = (int(part) for part in match.groups())
+        return major, minor, patch
 
     def get_new_release_version(self, last_version: str, release_type: str) -> str:
         """
@@ -120,9 +135,12 @@ class ReleaseMixin:
         :param release: Объект GitRelease.
         :param new_body: Новое описание релиза.
         """
+        if is_up_to_date(release.body, new_body):
+            logger.info("Release %s is up to date", release.tag_name)
+            return
         release.update_release(
             name=release.title,  # Оставляем текущее название
-            message=new_body,  # Обновляемое тело релиза
+            message=add_fingerprint(new_body),  # Обновляемое тело релиза
             draft=release.draft,  # Сохраняем текущее состояние draft
             prerelease=release.prerelease,  # Сохраняем текущее состояние prerelease
         )
@@ -133,7 +151,7 @@ class ReleaseMixin:
         self.repo.create_git_release(  # type: ignore[attr-defined]
             tag=f"v{version}",
             name=title,
-            message=description,
+            message=add_fingerprint(description),
             draft=True,
             prerelease=True,
             target_commitish="master",
@@ -2,17 +2,23 @@ import json
 import unittest
 from unittest.mock import MagicMock, patch
 
+from github.Requester import Requester
+
 from helpers.github import GithubService
 from helpers.yandex_tracker import YandexTracker
 
+from .utils import PULL_URL_EXAMPLE
+
 
 class BaseTestCase(unittest.TestCase):
     def setUp(self):
-        # Патчим requests.post внутри метода setUp
-        self.patcher = patch("requests.post")
+        # Патчим requests.Session.post внутри метода setUp
+        self.patcher = patch("requests.Session.post")
         mock_post = self.patcher.start()
+        # Сервис подключает свои классы соединений ко всему PyGithub
+        self.addCleanup(Requester.resetConnectionClasses)
 
-        # Создаем фиктивный ответ, который будет возвращен вместо реального вызова requests.post
+        # Создаем фиктивный ответ, который будет возвращен вместо реального вызова requests.Session.post
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"iamToken": "fake_iam_token"}
@@ -21,14 +27,22 @@ class BaseTestCase(unittest.TestCase):
         ya_org_id = "fake_org_id"
         ya_token = "fake_token"  # noqa
 
-        # Создаем экземпляр YandexTracker, который будет использовать замоканный requests.post
+        # Создаем экземпляр YandexTracker, который будет использовать замоканный requests.Session.post
         self.mocked_tracker = YandexTracker(ya_org_id, ya_token)
         # Используем patch.object для замены метода get_issue_summary
-        patch.object(
+        self.mock_get_issue_summary = patch.object(
             self.mocked_tracker,
             "get_issue_summary",
             side_effect=lambda task_key: task_key if "ERP" in task_key else None,
         ).start()
+        self.mock_get_issue_summaries = patch.object(
+            self.mocked_tracker,
+            "get_issue_summaries",
+            side_effect=lambda task_keys: {
+                task_key: task_key if "ERP" in task_key else None
+                for task_key in task_keys
+            },
+        ).start()
 
     def prepare_github_service(self, mock_github):
         """
@@ -36,12 +50,12 @@ class BaseTestCase(unittest.TestCase):
         """
         # Создаем мок репозитория и Pull Request
         mock_repo = MagicMock()
-        mock_pull_request = MagicMock()
+        mock_pull_request = MagicMock(body=None, html_url=f"{PULL_URL_EXAMPLE}/1")
 
         # Настраиваем возвращаемые значения для методов
-        mock_repo.get_pull.return_value = mock_pull_request
         mock_github_instance = mock_github.return_value
         mock_github_instance.get_repo.return_value = mock_repo
+        mock_github_instance.create_from_raw_data.return_value = mock_pull_request
 
         # Настраиваем данные для тестов
         github_data_path = "mock_data.json"
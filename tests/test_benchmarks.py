@@ -0,0 +1,104 @@
+import unittest
+
+import requests
+
+from benchmarks.repository import RepositorySpec, generate_repository
+from benchmarks.runner import Scenario, run_scenario
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.servers import FakeGithubServer
+from helpers.merge_commit import is_epic_branch
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_generate_repository(self):
+        spec = RepositorySpec(features=10, epics=2, epic_features=3, commits_per_pull=2)
+        repository = generate_repository(spec)
+
+        self.assertEqual(repository, generate_repository(spec))
+        # Основной pull request, фичи, эпики и фичи эпиков
+        self.assertEqual(len(repository.pulls), 1 + 10 + 2 + 2 * 3)
+        main_pull = repository.pulls[repository.main_pull]
+        self.assertEqual((main_pull.head, main_pull.base), ("release/1.21", "master"))
+        # Коммиты фич и merge-коммиты каждого pull request'а
+        self.assertEqual(len(main_pull.commits), (10 + 2 * 3) * 3 + 2)
+        epics = [
+            pull for pull in repository.pulls.values() if is_epic_branch(pull.head)
+        ]
+        self.assertEqual(len(epics), 2)
+        for epic in epics:
+            self.assertEqual(len(epic.commits), 3 * 3)
+            for sha in epic.commits:
+                self.assertIn(epic.number, repository.commits[sha].pulls)
+
+    def test_fake_github_rate_limit(self):
+        repository = generate_repository(RepositorySpec(features=1))
+        github = FakeGithubServer(repository, rate_limit=2)
+        with github:
+            url = f"{github.api_url}/repos/owner/repo/pulls/1"
+            responses = [requests.get(url, timeout=10) for _ in range(3)]
+
+        self.assertEqual([r.status_code for r in responses], [200, 200, 403])
+        self.assertEqual(responses[0].headers["X-RateLimit-Remaining"], "1")
+        self.assertEqual(responses[2].headers["X-RateLimit-Remaining"], "0")
+        self.assertEqual(github.rate_limited, 1)
+
+    def test_fake_github_etag_and_body_limit(self):
+        repository = generate_repository(RepositorySpec(features=1))
+        github = FakeGithubServer(repository, rate_limit=10)
+        with github:
+            url = f"{github.api_url}/repos/owner/repo/pulls/1"
+            response = requests.get(url, timeout=10)
+            not_modified = requests.get(
+                url, headers={"If-None-Match": response.headers["ETag"]}, timeout=10
+            )
+            too_long = requests.patch(url, json={"body": "x" * 65537}, timeout=10)
+
+        self.assertEqual(not_modified.status_code, 304)
+        # Ответ 304 не расходует лимит запросов
+        self.assertEqual(not_modified.headers["X-RateLimit-Remaining"], "9")
+        self.assertEqual(github.not_modified, 1)
+        self.assertEqual(too_long.status_code, 422)
+        self.assertIsNone(repository.pulls[1].body)
+
+    def test_rerun_restores_state(self):
+        spec = RepositorySpec(features=10, epics=2, epic_features=2, commits_per_pull=2)
+        results = run_scenario(
+            Scenario(
+                "rerun",
+                spec,
+                github_latency=0.0,
+                tracker_latency=0.0,
+                runs=2,
+                cache=True,
+            )
+        )
+
+        first, second = results[0], results[1]
+        # Задачи и заголовки восстановлены из описания pull request'а,
+        # описание и черновик релиза не изменились
+        self.assertGreater(first.tracker_requests, 0)
+        self.assertEqual(second.tracker_requests, 0)
+        self.assertLess(second.github_requests, first.github_requests / 10)
+        self.assertNotIn(
+            "github PATCH /api/v3/repos/owner/repo/pulls/{number}", second.endpoints
+        )
+
+    def test_smoke_scenario(self):
+        results = run_scenario(SCENARIOS["smoke"])
+
+        self.assertEqual(len(results), 1)
+        result = results[0]
+        self.assertGreater(result.peak_memory_mb, 0)
+        self.assertEqual(result.rate_limited, 0)
+        # Описание pull request'а обновлено, черновик релиза создан
+        self.assertEqual(
+            result.endpoints["github PATCH /api/v3/repos/owner/repo/pulls/{number}"], 1
+        )
+        self.assertEqual(
+            result.endpoints["github POST /api/v3/repos/owner/repo/releases"], 1
+        )
+        self.assertEqual(
+            sum(endpoint["requests"] for endpoint in result.metrics["endpoints"]),
+            result.github_requests + result.tracker_requests,
+        )
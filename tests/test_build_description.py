@@ -1,8 +1,10 @@
 from unittest.mock import MagicMock, patch
 
 from config.constants import EPIC_TITLE_NAME, MAIN_TITLE_NAME
+from helpers.task_registry import TaskRecord
 
 from .base_test import BaseTestCase
+from .utils import PULL_URL_EXAMPLE
 
 
 class TestGithubServiceBuildDescriptionParts(BaseTestCase):
@@ -13,66 +15,45 @@ class TestGithubServiceBuildDescriptionParts(BaseTestCase):
         github_service, _, _ = self.prepare_github_service(mock_github)
 
         # Мокируем метод collect_tasks
-        LINK_EXAMPLE = "https://link.com"
         github_service.collect_tasks = MagicMock(
             return_value=(
                 [  # Список задач
-                    {
-                        "is_epic": False,
-                        "task_key": None,
-                        "message": "Support: something",
-                        "author": "user",
-                        "number": [1],
-                        "links": [LINK_EXAMPLE],
-                    },
-                    {
-                        "is_epic": False,
-                        "task_key": "ERP-1",
-                        "message": None,
-                        "author": "user",
-                        "number": [2, 3],
-                        "links": [LINK_EXAMPLE, LINK_EXAMPLE],
-                    },
-                    {
-                        "is_epic": False,
-                        "task_key": "ERP-2",
-                        "message": None,
-                        "author": "user",
-                        "number": [3],
-                        "links": [LINK_EXAMPLE],
-                    },
-                    {
-                        "is_epic": False,
-                        "task_key": "Backend",
-                        "message": None,
-                        "author": "user",
-                        "number": [3],
-                        "links": [LINK_EXAMPLE],
-                    },
-                    {
-                        "is_epic": True,
-                        "task_key": "ERP-5",
-                        "number": [4],
-                        "links": [LINK_EXAMPLE],
-                        "tasks": [
-                            {
-                                "is_epic": False,
-                                "task_key": "ERP-2",
-                                "message": None,
-                                "author": "user",
-                                "number": [5],
-                                "links": [LINK_EXAMPLE],
-                            },
-                            {
-                                "is_epic": False,
-                                "task_key": "ERP-3",
-                                "message": None,
-                                "author": "user",
-                                "number": [5],
-                                "links": [LINK_EXAMPLE],
-                            },
+                    TaskRecord(
+                        task_key=None,
+                        message="Support: something",
+                        author="user",
+                        numbers=[1],
+                    ),
+                    TaskRecord(
+                        task_key="ERP-1", message=None, author="user", numbers=[2, 3]
+                    ),
+                    TaskRecord(
+                        task_key="ERP-2", message=None, author="user", numbers=[3]
+                    ),
+                    TaskRecord(
+                        task_key="Backend", message=None, author="user", numbers=[3]
+                    ),
+                    TaskRecord(
+                        task_key="ERP-5",
+                        message=None,
+                        author="user",
+                        numbers=[4],
+                        is_epic=True,
+                        tasks=[
+                            TaskRecord(
+                                task_key="ERP-2",
+                                message=None,
+                                author="user",
+                                numbers=[5],
+                            ),
+                            TaskRecord(
+                                task_key="ERP-3",
+                                message=None,
+                                author="user",
+                                numbers=[5],
+                            ),
                         ],
-                    },
+                    ),
                 ],
                 {"ERP-2"},  # Уникальные эпические задачи
             )
@@ -81,15 +62,102 @@ class TestGithubServiceBuildDescriptionParts(BaseTestCase):
         # Вызываем тестируемый метод
         description_parts = github_service.build_description_parts()
         epic_description = (
-            f"\n {EPIC_TITLE_NAME}: [[ERP-5](https://tracker.yandex.ru/ERP-5)] ERP-5 in [#4](https://link.com)\n"
-            "* [[ERP-2](https://tracker.yandex.ru/ERP-2)] ERP-2 by @user in [#5](https://link.com)\n"
-            "* [[ERP-3](https://tracker.yandex.ru/ERP-3)] ERP-3 by @user in [#5](https://link.com)"
+            f"\n {EPIC_TITLE_NAME}: [[ERP-5](https://tracker.yandex.ru/ERP-5)] ERP-5 in [#4]({PULL_URL_EXAMPLE}/4)\n"
+            f"* [[ERP-2](https://tracker.yandex.ru/ERP-2)] ERP-2 by @user in [#5]({PULL_URL_EXAMPLE}/5)\n"
+            f"* [[ERP-3](https://tracker.yandex.ru/ERP-3)] ERP-3 by @user in [#5]({PULL_URL_EXAMPLE}/5)"
         )
         # Проверяем результат
         expected_description = [
             MAIN_TITLE_NAME,
-            "* Support: something by @user in [#1](https://link.com)",
-            "* [[ERP-1](https://tracker.yandex.ru/ERP-1)] ERP-1 by @user in [#2](https://link.com), [#3](https://link.com)",
+            f"* Support: something by @user in [#1]({PULL_URL_EXAMPLE}/1)",
+            "* [[ERP-1](https://tracker.yandex.ru/ERP-1)] ERP-1 by @user in "
+            f"[#2]({PULL_URL_EXAMPLE}/2), [#3]({PULL_URL_EXAMPLE}/3)",
             epic_description,
         ]
         self.assertEqual(description_parts, expected_description)
+
+    @patch("helpers.github.Github")
+    def test_build_description_parts_resolves_summaries_once(self, mock_github):
+        github_service, _, _ = self.prepare_github_service(mock_github)
+        github_service.collect_tasks = MagicMock(
+            return_value=(
+                [
+                    TaskRecord(
+                        task_key="ERP-1", message=None, author="user", numbers=[2]
+                    ),
+                    TaskRecord(
+                        task_key="ERP-5",
+                        message=None,
+                        author="user",
+                        numbers=[4],
+                        is_epic=True,
+                        tasks=[
+                            TaskRecord(
+                                task_key="ERP-6",
+                                message=None,
+                                author="user",
+                                numbers=[5],
+                            ),
+                        ],
+                    ),
+                ],
+                {"ERP-6"},
+            )
+        )
+
+        github_service.build_description_parts()
+
+        # Все ключи запрашиваются одним пакетом, без поштучных запросов
+        self.mock_get_issue_summaries.assert_called_once_with(
+            {"ERP-1", "ERP-5", "ERP-6"}
+        )
+        self.mock_get_issue_summary.assert_not_called()
+
+    @patch("helpers.github.Github")
+    def test_build_description_parts_without_task_keys(self, mock_github):
+        github_service, _, _ = self.prepare_github_service(mock_github)
+        github_service.collect_tasks = MagicMock(
+            return_value=(
+                [
+                    TaskRecord(
+                        task_key=None,
+                        message="Docs: update readme",
+                        author="user",
+                        numbers=[2],
+                    ),
+                ],
+                set(),
+            )
+        )
+
+        description_parts = github_service.build_description_parts()
+
+        # Без ключей задач к Трекеру не обращаемся, IAM-токен не запрашивается
+        self.mock_get_issue_summaries.assert_not_called()
+        self.mock_get_issue_summary.assert_not_called()
+        self.assertIsNone(
+            self.mocked_tracker._iam_token  # pylint: disable=protected-access
+        )
+        self.assertEqual(
+            description_parts,
+            [
+                MAIN_TITLE_NAME,
+                f"* Docs: update readme by @user in [#2]({PULL_URL_EXAMPLE}/2)",
+            ],
+        )
+
+    @patch("helpers.github.Github")
+    def test_build_task_lines_summary_requested_once(self, mock_github):
+        github_service, _, _ = self.prepare_github_service(mock_github)
+        tasks = [
+            TaskRecord(task_key=task_key, message=None, author=author, numbers=[number])
+            for number, (task_key, author) in enumerate(
+                [("ERP-1", "user"), ("ERP-1", "other"), ("Backend", "user")] * 2
+            )
+        ]
+
+        lines = github_service.build_task_lines(tasks)
+
+        # Каждый ключ, в том числе ненайденный, запрашивается один раз
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(self.mock_get_issue_summary.call_count, 2)
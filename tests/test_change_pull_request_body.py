@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from helpers.fingerprint import add_fingerprint
+
+from .base_test import BaseTestCase
+
+
+class TestGithubServiceChangePullRequestBody(BaseTestCase):
+
+    @patch("helpers.github.Github")
+    def test_change_pull_request_body(self, mock_github):
+        github_service, _, mock_pull_request = self.prepare_github_service(mock_github)
+        mock_pull_request.body = None
+
+        github_service.change_pull_request_body("## What's Changed")
+
+        mock_pull_request.edit.assert_called_once_with(
+            body=add_fingerprint("## What's Changed")
+        )
+
+    @patch("helpers.github.Github")
+    def test_unchanged_pull_request_body(self, mock_github):
+        github_service, _, mock_pull_request = self.prepare_github_service(mock_github)
+        mock_pull_request.body = add_fingerprint("## What's Changed")
+
+        github_service.change_pull_request_body("## What's Changed")
+
+        # Совпадающее описание не перезаписывается
+        mock_pull_request.edit.assert_not_called()
+
+    @patch("helpers.github.Github")
+    def test_edited_pull_request_body(self, mock_github):
+        github_service, _, mock_pull_request = self.prepare_github_service(mock_github)
+        mock_pull_request.body = add_fingerprint("## What's Changed").replace(
+            "Changed", "Changed manually", 1
+        )
+
+        github_service.change_pull_request_body("## What's Changed")
+
+        # Отпечаток не совпадает с текстом перед ним, описание восстанавливается
+        mock_pull_request.edit.assert_called_once()
@@ -1,7 +1,12 @@
 from typing import Any, Dict, List
 from unittest.mock import MagicMock, patch
 
+from github.PullRequest import PullRequest
+
+from helpers.task_registry import TaskRecord
+
 from .base_test import BaseTestCase
+from .utils import LINK_EXAMPLE, MERGED_AT_EXAMPLE, track_concurrency
 
 
 class TestGithubServiceCollectTasks(BaseTestCase):
@@ -14,19 +19,17 @@ class TestGithubServiceCollectTasks(BaseTestCase):
         # Настраиваем Pull Request
         mock_pull_request.number = 1
         mock_pull_request.head.ref = "feature/some-feature"
-        mock_pull_request.mergeable = True
 
         # Мокаем `_process_epic_tasks` и `process_pull` для упрощения теста
         github_service._process_epic_tasks = MagicMock(  # pylint: disable=W0212
             return_value=[]
         )
-        LINK_EXAMPLE = "https://link.com"
         commits_data: List[Dict[str, Any]] = [
             {
                 "message": "Support: fixed a bug",
                 "pulls": [
                     {
-                        "mergeable": False,
+                        "merged_at": MERGED_AT_EXAMPLE,
                         "number": 2,
                         "head.ref": "feature/2",
                         "user.login": "user",
@@ -39,7 +42,7 @@ class TestGithubServiceCollectTasks(BaseTestCase):
                 "message": "Merge pull request 3",
                 "pulls": [
                     {
-                        "mergeable": False,
+                        "merged_at": MERGED_AT_EXAMPLE,
                         "number": 3,
                         "head.ref": "feature/3",
                         "user.login": "user",
@@ -52,7 +55,7 @@ class TestGithubServiceCollectTasks(BaseTestCase):
                 "message": "Merge pull request 3",
                 "pulls": [
                     {
-                        "mergeable": False,
+                        "merged_at": MERGED_AT_EXAMPLE,
                         "number": 3,
                         "head.ref": "feature/3",
                         "user.login": "user",
@@ -65,15 +68,15 @@ class TestGithubServiceCollectTasks(BaseTestCase):
                 "message": "[ERP-163] New feature",
                 "pulls": [
                     {
-                        "mergeable": True,
-                        "number": 4,
+                        "merged_at": None,
+                        "number": 5,
                         "head.ref": "feature/4",
                         "user.login": "user",
                         "title": "[ERP-163] Need to miss",
                         "html_url": LINK_EXAMPLE,
                     },
                     {
-                        "mergeable": False,
+                        "merged_at": MERGED_AT_EXAMPLE,
                         "number": 1,
                         "head.ref": "feature/1",
                         "user.login": "user",
@@ -81,7 +84,7 @@ class TestGithubServiceCollectTasks(BaseTestCase):
                         "html_url": LINK_EXAMPLE,
                     },
                     {
-                        "mergeable": False,
+                        "merged_at": MERGED_AT_EXAMPLE,
                         "number": 4,
                         "head.ref": "feature/4",
                         "user.login": "user",
@@ -98,7 +101,7 @@ class TestGithubServiceCollectTasks(BaseTestCase):
             mock_pulls = []
             for pull in commit["pulls"]:
                 mocked_pull = MagicMock()
-                mocked_pull.mergeable = pull["mergeable"]
+                mocked_pull.merged_at = pull["merged_at"]
                 mocked_pull.number = pull["number"]
                 mocked_pull.head.ref = pull["head.ref"]
                 mocked_pull.user.login = pull["user.login"]
@@ -114,25 +117,106 @@ class TestGithubServiceCollectTasks(BaseTestCase):
 
         # Ожидаемый результат
         expected_tasks = [
-            {
-                "is_epic": False,
-                "number": [4],
-                "links": ["https://link.com"],
-                "message": None,
-                "author": "user",
-                "task_key": "ERP-163",
-                "tasks": [],
-            },
-            {
-                "is_epic": False,
-                "number": [2],
-                "links": ["https://link.com"],
-                "message": "Support: fixed a bug",
-                "author": "user",
-                "task_key": None,
-                "tasks": [],
-            },
+            TaskRecord(
+                task_key="ERP-163", message=None, author="user", numbers=[4], tasks=[]
+            ),
+            TaskRecord(
+                task_key=None,
+                message="Support: fixed a bug",
+                author="user",
+                numbers=[2],
+                tasks=[],
+            ),
         ]
         # Проверяем результат
         self.assertEqual(tasks, expected_tasks)
         self.assertEqual(unique_epic_tasks, set())
+
+    @patch("helpers.github.Github")
+    def test_fetch_commit_pulls_concurrently(self, mock_github):
+        github_service, _, _ = self.prepare_github_service(mock_github)
+        github_service.github_concurrency = 3
+        state: dict = {}
+        pulls = [MagicMock(number=index) for index in range(10, 22)]
+        commits = [
+            MagicMock(get_pulls=track_concurrency(lambda p=pull: iter([p]), state))
+            for pull in pulls
+        ]
+
+        commit_pulls = github_service.fetch_commit_pulls(commits)
+
+        # Запросы выполняются параллельно, но не больше заданного лимита,
+        # а результат сохраняет порядок коммитов
+        self.assertEqual(state["max_active"], 3)
+        self.assertEqual(
+            commit_pulls, [(commit, [pull]) for commit, pull in zip(commits, pulls)]
+        )
+
+    @patch("helpers.github.Github")
+    def test_pull_requests_cached_per_run(self, mock_github):
+        github_service, mock_repo, _ = self.prepare_github_service(mock_github)
+        mock_repo.get_pull.reset_mock()
+        first_pull = MagicMock(number=2)
+        commits = [
+            MagicMock(get_pulls=MagicMock(return_value=[first_pull])),
+            MagicMock(get_pulls=MagicMock(return_value=[MagicMock(number=2)])),
+        ]
+
+        commit_pulls = github_service.fetch_commit_pulls(commits)
+
+        # Pull request из разных списков - один и тот же объект
+        self.assertIs(commit_pulls[1][1][0], first_pull)
+        self.assertIs(github_service.pull_requests[2], first_pull)
+        mock_repo.get_pull.assert_not_called()
+
+    @patch("helpers.github.Github")
+    def test_collect_tasks_without_lazy_completion(self, mock_github):
+        github_service, _, mock_pull_request = self.prepare_github_service(mock_github)
+        mock_pull_request.number = 1
+        mock_pull_request.base.ref = "master"
+        requester = MagicMock()
+
+        def create_pull(number, **attributes):
+            # Pull request в том виде, в котором его возвращает commit.get_pulls()
+            return PullRequest(
+                requester,
+                {},
+                {
+                    "url": f"https://api.github.com/repos/owner/repo/pulls/{number}",
+                    "number": number,
+                    "title": f"[ERP-{number}] Feature",
+                    "html_url": LINK_EXAMPLE,
+                    "user": {"login": "user"},
+                    "head": {"ref": f"feature/{number}"},
+                    "base": {"ref": "develop"},
+                    **attributes,
+                },
+                completed=False,
+            )
+
+        commit = MagicMock()
+        commit.commit.message = "[ERP-2] Feature"
+        commit.get_pulls.return_value = [
+            create_pull(2, merged_at=MERGED_AT_EXAMPLE, state="closed"),
+            create_pull(3, merged_at=None, state="open"),
+            create_pull(4, merged_at=MERGED_AT_EXAMPLE, base={"ref": "master"}),
+        ]
+        github_service.main_commits = [commit]
+
+        tasks, _ = github_service.collect_tasks()
+
+        # Фильтр использует только поля из списка, без запроса на каждый pull request
+        self.assertEqual([task.numbers for task in tasks], [[2]])
+        requester.requestJsonAndCheck.assert_not_called()
+        self.assertEqual(github_service.lazy_completions, 0)
+
+        # Обращение к полю, которого нет в списке, догружает pull request и учитывается
+        requester.requestJsonAndCheck.return_value = ({}, {"mergeable": True})
+        commit.get_pulls.return_value = [create_pull(5, merged_at=MERGED_AT_EXAMPLE)]
+        with patch.object(
+            github_service,
+            "is_released_pull",
+            side_effect=lambda pull: not pull.mergeable,
+        ):
+            github_service.collect_tasks()
+        self.assertEqual(github_service.lazy_completions, 1)
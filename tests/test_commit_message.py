@@ -0,0 +1,73 @@
+import re
+import unittest
+from unittest.mock import patch
+
+# conflict with black linter
+# isort: off
+from helpers.commit_message import (
+    extract_task_keys,
+    tokenize_commit_message,
+    tokenize_commit_messages,
+)
+from helpers.merge_commit import MergeCommit
+
+# isort: on
+
+# Регулярное выражение, которое использовалось для поиска ключей раньше
+LEGACY_TASK_KEY_PATTERN = re.compile(r"[^[]*\[([^]]*)\]")
+
+
+class TestCommitMessage(unittest.TestCase):
+
+    def test_extract_task_keys_matches_legacy_pattern(self):
+        messages = [
+            "[ERP-1] Task",
+            "[ERP-1, ERP-2] Tasks\n\n[Backend] part",
+            "No keys",
+            "[] empty [ERP-3",
+            "[a[b] nested ]",
+            "text ] [ERP-4]",
+            "[ERP-5]][ERP-6]",
+        ]
+        for message in messages:
+            with self.subTest(message=message):
+                self.assertEqual(
+                    extract_task_keys(message),
+                    {
+                        key.strip()
+                        for keys in LEGACY_TASK_KEY_PATTERN.findall(message)
+                        for key in keys.split(",")
+                    },
+                )
+
+    def test_extract_task_keys_unclosed_bracket(self):
+        # Длинное сообщение с незакрытой скобкой разбирается за один проход
+        message = "[ERP-1] squash\n" + "[" * 200000
+        self.assertEqual(extract_task_keys(message), {"ERP-1"})
+
+    def test_tokenize_commit_message(self):
+        tokens = tokenize_commit_message(
+            "Merge pull request #x\n\nMerge pull request #7 from owner/epic/big\n\n"
+            "[ERP-2, ERP-1] Tasks"
+        )
+
+        self.assertEqual(tokens.task_keys, ("ERP-1", "ERP-2"))
+        self.assertEqual(tokens.merge_commit, MergeCommit(number=7))
+        self.assertEqual(
+            tokenize_commit_message("Merge pull request #3 from owner").merge_commit,
+            MergeCommit(number=3),
+        )
+
+    def test_tokenize_commit_messages(self):
+        with patch(
+            "helpers.commit_message.tokenize_commit_message",
+            wraps=tokenize_commit_message,
+        ) as tokenize:
+            tokens = tokenize_commit_messages(["[ERP-1] a", "[ERP-2] b", "[ERP-1] a"])
+
+        # Повторяющееся сообщение разбирается один раз
+        self.assertEqual(tokenize.call_count, 2)
+        self.assertEqual(
+            [token.task_keys for token in tokens], [("ERP-1",), ("ERP-2",), ("ERP-1",)]
+        )
+        self.assertIs(tokens[0], tokens[2])
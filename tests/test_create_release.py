@@ -1,8 +1,16 @@
 from unittest.mock import MagicMock, patch
 
+from helpers.fingerprint import add_fingerprint
+
 from .base_test import BaseTestCase
 
 
+def create_release(tag_name, draft=False, prerelease=False):
+    release = MagicMock(draft=draft, prerelease=prerelease, body=None)
+    release.tag_name = tag_name
+    return release
+
+
 class TestGithubServiceCreateRelease(BaseTestCase):
 
     @patch("helpers.github.Github")
@@ -14,13 +22,8 @@ class TestGithubServiceCreateRelease(BaseTestCase):
         releases = ["1.0.0"]
         mocked_releases = []
         for release_version in releases:
-            release = MagicMock()
-            release.tag_name = f"v {release_version}"
-            mocked_releases.append(release)
+            mocked_releases.append(create_release(f"v {release_version}"))
 
-        mock_repo.get_latest_release = MagicMock(
-            return_value=MagicMock(tag_name="v 1.0.0 ")
-        )
         mock_repo.get_releases = MagicMock(return_value=mocked_releases)
         mock_repo.create_git_release = MagicMock(return_value=True)
 
@@ -33,8 +36,80 @@ class TestGithubServiceCreateRelease(BaseTestCase):
         mock_repo.create_git_release.assert_called_once_with(
             tag="v1.1.0",  # Пример: в зависимости от логики обновления версии
             name="Release 1.1.0",
-            message=description,
+            message=add_fingerprint(description),
             draft=True,
             prerelease=True,
             target_commitish="master",
         )
+
+    @patch("helpers.github.Github")
+    def test_update_existing_draft_release(self, mock_github):
+        github_service, mock_repo, _ = self.prepare_github_service(mock_github)
+        draft = create_release("v11.2.10", draft=True, prerelease=True)
+        current_draft = create_release("v1.2.1", draft=True, prerelease=True)
+
+        def releases():
+            yield draft
+            yield current_draft
+            yield create_release("v1.2.0")
+            yield create_release("v1.1.9")
+            # Релизы старше предыдущей опубликованной версии не запрашиваются
+            raise AssertionError("Releases are read past the latest release")
+
+        mock_repo.get_releases = MagicMock(return_value=releases())
+
+        github_service.update_or_create_draft_release("hotfix", "some_description")
+
+        # Версия сравнивается целиком: 1.2.1 не совпадает с v11.2.10
+        draft.update_release.assert_not_called()
+        current_draft.update_release.assert_called_once()
+        mock_repo.get_latest_release.assert_not_called()
+        mock_repo.create_git_release.assert_not_called()
+
+    @patch("helpers.github.Github")
+    def test_update_draft_created_before_hotfix(self, mock_github):
+        github_service, mock_repo, _ = self.prepare_github_service(mock_github)
+        # Хотфикс опубликован, пока черновик следующего релиза ждал выпуска
+        pending_draft = create_release("v1.3.0", draft=True, prerelease=True)
+        mock_repo.get_releases = MagicMock(
+            return_value=[
+                create_release("v1.2.1"),
+                pending_draft,
+                create_release("v1.2.0"),
+            ]
+        )
+
+        github_service.update_or_create_draft_release("release", "some_description")
+
+        pending_draft.update_release.assert_called_once()
+        mock_repo.create_git_release.assert_not_called()
+
+    @patch("helpers.github.Github")
+    def test_parse_release_version(self, mock_github):
+        github_service, _, _ = self.prepare_github_service(mock_github)
+
+        self.assertEqual(github_service.parse_release_version("v1.2.3"), (1, 2, 3))
+        self.assertEqual(github_service.parse_release_version("v 1.0.0 "), (1, 0, 0))
+        self.assertIsNone(github_service.parse_release_version("v1.2.3-rc1"))
+        self.assertIsNone(github_service.parse_release_version("nightly"))
+
+    @patch("helpers.github.Github")
+    def test_unchanged_release_not_updated(self, mock_github):
+        github_service, mock_repo, _ = self.prepare_github_service(mock_github)
+        draft = create_release("v1.1.0", draft=True, prerelease=True)
+        draft.body = add_fingerprint("some_description").replace("\n", "\r\n")
+        mock_repo.get_releases = MagicMock(
+            return_value=[draft, create_release("v1.0.0")]
+        )
+
+        github_service.update_or_create_draft_release("release", "some_description")
+
+        # Описание не изменилось, поэтому релиз не обновляется
+        draft.update_release.assert_not_called()
+
+        github_service.update_or_create_draft_release("release", "new_description")
+        draft.update_release.assert_called_once()
+        self.assertEqual(
+            draft.update_release.call_args.kwargs["message"],
+            add_fingerprint("new_description"),
+        )
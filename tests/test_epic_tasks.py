@@ -3,7 +3,7 @@ from unittest.mock import MagicMock, patch
 from config.constants import EPIC_TITLE_NAME, MAIN_TITLE_NAME
 
 from .base_test import BaseTestCase
-from .utils import LINK_EXAMPLE, get_tasks_with_epic
+from .utils import PULL_URL_EXAMPLE, get_tasks_with_epic
 
 
 class TestGithubServiceEpicTasks(BaseTestCase):
@@ -21,7 +21,7 @@ class TestGithubServiceEpicTasks(BaseTestCase):
             for pull in commit["pulls"]:
                 pull_request = MagicMock()
                 pull_request.number = pull.get("number")
-                pull_request.mergeable = pull.get("mergeable")
+                pull_request.merged_at = pull.get("merged_at")
                 pull_request.head.ref = pull.get("head.ref")
                 pull_request.title = pull.get("title")
                 pull_request.user.login = pull.get("user.login")
@@ -38,19 +38,20 @@ class TestGithubServiceEpicTasks(BaseTestCase):
             mock_commit.get_pulls = MagicMock(return_value=commit_pulls)
             github_service.main_commits.append(mock_commit)
 
-        mock_repo.get_pull = MagicMock(
-            return_value=MagicMock(html_url=LINK_EXAMPLE, number=5)
-        )
-
         description_parts = github_service.build_description_parts()
 
         expected_parts = [
             MAIN_TITLE_NAME,
-            "* [[ERP-4](https://tracker.yandex.ru/ERP-4)] ERP-4 by @user in [#4](https://link.com)",
+            "* [[ERP-4](https://tracker.yandex.ru/ERP-4)] ERP-4 by @user in "
+            f"[#4]({PULL_URL_EXAMPLE}/4)",
             (
                 f"\n {EPIC_TITLE_NAME}: 1\n* "
-                "[[ERP-5](https://tracker.yandex.ru/ERP-5)] ERP-5 by @user in [#5](https://link.com)\n* "
-                "[[ERP-6](https://tracker.yandex.ru/ERP-6)] ERP-6 by @user in [#5](https://link.com)"
+                "[[ERP-5](https://tracker.yandex.ru/ERP-5)] ERP-5 by @user in "
+                f"[#5]({PULL_URL_EXAMPLE}/5)\n* "
+                "[[ERP-6](https://tracker.yandex.ru/ERP-6)] ERP-6 by @user in "
+                f"[#5]({PULL_URL_EXAMPLE}/5)"
             ),
         ]
         self.assertEqual(description_parts, expected_parts)
+        # Номер и ссылка влитого pull request'а взяты из merge-коммита
+        mock_repo.get_pull.assert_not_called()
@@ -2,11 +2,19 @@ import json
 import unittest
 from unittest.mock import MagicMock, patch
 
+from github import Consts, Github
+from github.PullRequest import PullRequest
+from github.Requester import HTTPSRequestsConnectionClass, Requester
+
 from helpers.github import GithubService
+from helpers.github_rate_limit import SERVER_ERROR_RETRY
 
 
 class TestGithubServiceInit(unittest.TestCase):
 
+    def setUp(self):
+        self.addCleanup(Requester.resetConnectionClasses)
+
     @patch("helpers.github.Github")
     def test_init(self, mock_github):
         # Настраиваем mocks для GitHub и YandexTracker
@@ -18,12 +26,12 @@ class TestGithubServiceInit(unittest.TestCase):
         # Возвращаемые значения моков
         mock_github_instance = mock_github.return_value
         mock_github_instance.get_repo.return_value = mock_repo
-        mock_repo.get_pull.return_value = mock_pull_request
+        mock_github_instance.create_from_raw_data.return_value = mock_pull_request
         mock_pull_request.get_commits.return_value = mock_commits
 
         # Мок данных для json файла
         github_data_path = "mock_data.json"
-        data = {"pull_request": {"number": 1}}
+        data = {"pull_request": {"number": 1, "head": {"ref": "release/1"}}}
 
         # Мокируем open для чтения данных из файла
         with patch(
@@ -34,9 +42,52 @@ class TestGithubServiceInit(unittest.TestCase):
             )
 
         # Проверка инициализации
-        mock_github.assert_called_once_with("fake_token")
-        mock_github_instance.get_repo.assert_called_once_with("fake_repo")
-        mock_repo.get_pull.assert_called_once_with(number=1)
+        mock_github.assert_called_once_with(
+            "fake_token",
+            base_url=Consts.DEFAULT_BASE_URL,
+            retry=SERVER_ERROR_RETRY,
+            seconds_between_requests=None,
+            seconds_between_writes=None,
+        )
+        # Pull request строится из события, репозиторий не загружается
+        mock_github_instance.get_repo.assert_called_once_with("fake_repo", lazy=True)
+        mock_github_instance.create_from_raw_data.assert_called_once_with(
+            PullRequest, data["pull_request"]
+        )
+        mock_repo.get_pull.assert_not_called()
         self.assertEqual(service.main_pull_request, mock_pull_request)
         self.assertEqual(service.main_commits, mock_commits)
         self.assertEqual(service.yandex_tracker, mock_tracker)
+
+    @patch("requests.Session.request")
+    def test_init_without_requests(self, mock_request):
+        data = {
+            "pull_request": {
+                "url": "https://api.github.com/repos/owner/repo/pulls/1",
+                "number": 1,
+                "body": None,
+                "html_url": "https://github.com/owner/repo/pull/1",
+                "head": {"ref": "feature/ERP-1", "sha": "abc"},
+                "base": {"ref": "master"},
+            }
+        }
+        with patch(
+            "builtins.open", unittest.mock.mock_open(read_data=json.dumps(data))
+        ):
+            service = GithubService(
+                "mock_data.json", "fake_token", "owner/repo", MagicMock()
+            )
+
+        # Проверка релизной ветки использует только данные события
+        self.assertEqual(service.check_is_release(), (False, ""))
+        self.assertEqual(service.main_pull_request.head.sha, "abc")
+        self.assertEqual(service.rate_limit.requests, 0)
+        mock_request.assert_not_called()
+
+        # После close() новые объекты Github используют стандартные соединения
+        service.close()
+        requester = Github().requester
+        self.assertIs(
+            getattr(requester, "_Requester__connectionClass"),
+            HTTPSRequestsConnectionClass,
+        )
@@ -0,0 +1,124 @@
+import json
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from github.Requester import Requester
+
+from helpers.git_commits import LocalGitCommits
+from helpers.github import GithubService
+
+
+class TestLocalGitCommits(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.addCleanup(Requester.resetConnectionClasses)
+        self.git("init", "-q", "-b", "master")
+        self.base = self.commit("Initial commit", "user@example.com")
+        self.git("checkout", "-q", "-b", "feature")
+        self.commit("[ERP-1] First task\n\nDetails", "1+user@users.noreply.github.com")
+        self.git("checkout", "-q", "master")
+        self.commit("Fix anything", "user@example.com")
+        self.git("merge", "-q", "--no-ff", "-m", "Merge pull request #2", "feature")
+        self.head = self.git("rev-parse", "HEAD").strip()
+        self.repo = MagicMock(url="https://api.github.com/repos/owner/repo")
+        self.local_git = LocalGitCommits(self.path, MagicMock(), self.repo)
+
+    def git(self, *args, email="user@example.com"):
+        return subprocess.run(
+            ["git", "-c", "user.name=User", "-c", f"user.email={email}", *args],
+            cwd=self.path,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+    def commit(self, message, email):
+        self.git("commit", "-q", "--allow-empty", "-m", message, email=email)
+        return self.git("rev-parse", "HEAD").strip()
+
+    def get_commits(self):
+        commits = self.local_git.get_commits(self.base, self.head)
+        self.assertIsNotNone(commits)
+        return commits or []
+
+    @staticmethod
+    def get_login(commit):
+        return commit.author.login if commit.author else None
+
+    def test_get_commits(self):
+        commits = self.get_commits()
+
+        # Коммиты идут от старых к новым вместе с телом сообщения и родителями
+        self.assertEqual(
+            sorted(commit.commit.message for commit in commits),
+            ["Fix anything", "Merge pull request #2", "[ERP-1] First task\n\nDetails"],
+        )
+        self.assertEqual(commits[-1].sha, self.head)
+        self.assertEqual(len(commits[-1].parents), 2)
+        first_task = next(
+            commit for commit in commits if "ERP-1" in commit.commit.message
+        )
+        self.assertEqual(self.get_login(first_task), "user")
+        self.repo.get_commit.assert_not_called()
+
+    def test_login_requested_once_per_email(self):
+        self.repo.get_commit.return_value.author.login = "github-user"
+        commits = self.get_commits()
+        logins = [
+            self.get_login(commit)
+            for commit in commits
+            if "ERP-1" not in commit.commit.message
+        ]
+
+        self.assertEqual(logins, ["github-user", "github-user"])
+        self.repo.get_commit.assert_called_once()
+
+    def test_fallback_to_api(self):
+        # Коммита нет в клоне
+        self.assertIsNone(self.local_git.get_commits("0" * 40, self.head))
+
+        # Неполный клон
+        shallow_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, shallow_path)
+        subprocess.run(
+            ["git", "clone", "-q", "--depth", "1", f"file://{self.path}", shallow_path],
+            check=True,
+        )
+        shallow_git = LocalGitCommits(shallow_path, MagicMock(), self.repo)
+        self.assertIsNone(shallow_git.get_commits(self.head, self.head))
+
+        # Каталог не является репозиторием
+        self.assertIsNone(
+            LocalGitCommits(tempfile.gettempdir(), MagicMock(), self.repo).get_commits(
+                self.base, self.head
+            )
+        )
+
+    @patch("helpers.github.Github")
+    def test_github_service_reads_local_commits(self, mock_github):
+        data = {
+            "pull_request": {
+                "number": 1,
+                "base": {"sha": self.base},
+                "head": {"sha": self.head},
+            }
+        }
+        with patch(
+            "builtins.open", unittest.mock.mock_open(read_data=json.dumps(data))
+        ):
+            service = GithubService(
+                "mock_data.json",
+                "fake_token",
+                "owner/repo",
+                MagicMock(),
+                git_path=self.path,
+            )
+
+        # Коммиты прочитаны из клона, постраничный список API не создаётся
+        self.assertEqual(len(list(service.main_commits)), 3)
+        mock_github.return_value.create_from_raw_data.return_value.get_commits.assert_not_called()
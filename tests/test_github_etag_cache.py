@@ -0,0 +1,108 @@
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from github import Github
+from github.Requester import Requester
+
+from helpers.file_cache import FileCache
+from helpers.github_rate_limit import SERVER_ERROR_RETRY, RateLimitScheduler
+from helpers.github_transport import github_connection_classes
+
+
+def github_response(status_code, text="", **headers):
+    response = MagicMock(status_code=status_code, text=text)
+    response.headers = {key.replace("_", "-"): value for key, value in headers.items()}
+    return response
+
+
+class TestGithubETagCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.addCleanup(Requester.resetConnectionClasses)
+
+    def create_github(self):
+        scheduler = RateLimitScheduler()
+        etag_cache = FileCache(self.cache_dir, "github_etags", 0, evict_unused=True)
+        Requester.injectConnectionClasses(
+            *github_connection_classes(scheduler, etag_cache)
+        )
+        return Github("fake_token", retry=SERVER_ERROR_RETRY), scheduler, etag_cache
+
+    @patch("requests.Session.get")
+    def test_not_modified_served_from_cache(self, mock_get):
+        github, _, etag_cache = self.create_github()
+        mock_get.return_value = github_response(
+            200, '{"full_name": "owner/repo"}', ETag='W/"v1"'
+        )
+        github.get_repo("owner/repo")
+        self.assertNotIn("If-None-Match", mock_get.call_args.kwargs["headers"])
+        etag_cache.save()
+
+        # Следующий запуск восстанавливает кэш и получает 304 вместо тела
+        github, scheduler, _ = self.create_github()
+        mock_get.return_value = github_response(304, ETag='W/"v1"')
+        repo = github.get_repo("owner/repo")
+
+        self.assertEqual(
+            mock_get.call_args.kwargs["headers"]["If-None-Match"], 'W/"v1"'
+        )
+        self.assertEqual(repo.full_name, "owner/repo")
+        self.assertEqual(scheduler.requests, 1)
+        self.assertEqual(scheduler.used, 0)
+
+    @patch("requests.Session.get")
+    def test_unused_entries_evicted(self, mock_get):
+        github, _, etag_cache = self.create_github()
+        mock_get.side_effect = [
+            github_response(200, '{"full_name": "owner/repo"}', ETag='"v1"'),
+            github_response(200, '{"full_name": "owner/other"}', ETag='"v2"'),
+        ]
+        github.get_repo("owner/repo")
+        github.get_repo("owner/other")
+        etag_cache.save()
+
+        # Следующий запуск обращается только к одному репозиторию
+        github, _, etag_cache = self.create_github()
+        mock_get.side_effect = [github_response(304)]
+        github.get_repo("owner/repo")
+        etag_cache.save()
+
+        with open(etag_cache.path, encoding="utf8") as f:
+            self.assertEqual(len(json.load(f)), 1)
+
+    @patch("requests.Session.get")
+    def test_changed_resource_replaces_cache(self, mock_get):
+        github, _, _ = self.create_github()
+        mock_get.side_effect = [
+            github_response(200, '{"full_name": "owner/repo"}', ETag='"v1"'),
+            github_response(200, '{"full_name": "owner/renamed"}', ETag='"v2"'),
+            github_response(304),
+        ]
+
+        github.get_repo("owner/repo")
+        github.get_repo("owner/repo")
+        repo = github.get_repo("owner/repo")
+
+        self.assertEqual(mock_get.call_args.kwargs["headers"]["If-None-Match"], '"v2"')
+        self.assertEqual(repo.full_name, "owner/renamed")
+
+    def test_session_reused_across_requests(self):
+        github, _, _ = self.create_github()
+        sessions = set()
+
+        def get(session, *_args, **_kwargs):
+            sessions.add(id(session))
+            return github_response(200, '{"number": 1}')
+
+        with patch("requests.Session.get", autospec=True, side_effect=get):
+            repo = github.get_repo("owner/repo", lazy=True)
+            for _ in range(5):
+                repo.get_pull(1)
+
+        # Все запросы потока идут через одну keep-alive сессию
+        self.assertEqual(len(sessions), 1)
@@ -0,0 +1,94 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from github import Github
+from github.Requester import Requester
+
+from helpers.github_rate_limit import SERVER_ERROR_RETRY, RateLimitScheduler
+from helpers.github_transport import github_connection_classes
+
+REPO_JSON = '{"full_name": "owner/repo", "name": "repo"}'
+
+
+def github_response(status_code, text=REPO_JSON, **headers):
+    response = MagicMock(status_code=status_code, text=text)
+    response.headers = {key.replace("_", "-"): value for key, value in headers.items()}
+    return response
+
+
+class TestRateLimitScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.sleep = MagicMock()
+        self.scheduler = RateLimitScheduler(reserve=10, sleep=self.sleep)
+        Requester.injectConnectionClasses(*github_connection_classes(self.scheduler))
+        self.addCleanup(Requester.resetConnectionClasses)
+        self.github = Github("fake_token", retry=SERVER_ERROR_RETRY)
+
+    @patch("requests.Session.get")
+    def test_secondary_limit_retried(self, mock_get):
+        mock_get.side_effect = [
+            github_response(
+                403,
+                '{"message": "You have exceeded a secondary rate limit"}',
+                retry_after="30",
+            ),
+            github_response(429, "{}"),
+            github_response(200, x_ratelimit_remaining="4000", x_ratelimit_reset="0"),
+        ]
+
+        repo = self.github.get_repo("owner/repo")
+
+        # Ответы о превышении лимита повторяются после паузы
+        self.assertEqual(repo.full_name, "owner/repo")
+        self.assertEqual(mock_get.call_count, 3)
+        delays = [call.args[0] for call in self.sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertAlmostEqual(delays[0], 30, delta=1)
+        # Без Retry-After пауза растёт с каждым превышением, начиная с минуты
+        self.assertAlmostEqual(delays[1], 120, delta=1)
+        self.assertEqual(self.scheduler.requests, 3)
+        self.assertEqual(self.scheduler.retries, 2)
+        self.assertEqual(self.scheduler.budgets["core"][0], 4000)
+
+    @patch("requests.Session.get")
+    def test_forbidden_not_retried(self, mock_get):
+        mock_get.return_value = github_response(403, '{"message": "Forbidden"}')
+
+        with self.assertRaises(Exception):
+            self.github.get_repo("owner/repo")
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.sleep.assert_not_called()
+
+    @patch("requests.Session.get")
+    def test_requests_paced_when_budget_is_low(self, mock_get):
+        reset_at = time.time() + 100
+        mock_get.return_value = github_response(
+            200, x_ratelimit_remaining="5", x_ratelimit_reset=str(reset_at)
+        )
+
+        self.github.get_repo("owner/repo")
+        self.sleep.assert_not_called()
+        self.github.get_repo("owner/repo")
+
+        # Остаток 5 запросов распределяется до сброса лимита через 100 секунд
+        self.assertAlmostEqual(self.sleep.call_args.args[0], 20, delta=1)
+        self.assertEqual(self.scheduler.used, 2)
+
+    def test_wait_until_reset_when_budget_is_exhausted(self):
+        reset_at = time.time() + 50
+        self.scheduler.update(
+            "core",
+            200,
+            {"x-ratelimit-remaining": "0", "x-ratelimit-reset": str(reset_at)},
+            "",
+        )
+
+        self.scheduler.wait("core")
+        # Лимит GraphQL учитывается отдельно
+        self.scheduler.wait("graphql")
+
+        self.sleep.assert_called_once()
+        self.assertAlmostEqual(self.sleep.call_args.args[0], 50, delta=1)
@@ -0,0 +1,136 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from github.Requester import Requester
+
+from helpers.github import GithubService
+
+from .utils import LINK_EXAMPLE
+
+
+def graphql_pull(number, title, head_ref, state="MERGED", merged_at="2024-01-01"):
+    return {
+        "number": number,
+        "title": title,
+        "url": LINK_EXAMPLE,
+        "state": state,
+        "mergedAt": merged_at,
+        "headRefName": head_ref,
+        "baseRefName": "develop",
+        "author": {"login": "user"},
+    }
+
+
+def graphql_commit(oid, message, pulls):
+    return {
+        "commit": {
+            "oid": oid,
+            "message": message,
+            "author": {"user": {"login": "user"}},
+            "parents": {"nodes": [{"oid": f"{oid}-parent"}]},
+            "associatedPullRequests": {"nodes": pulls},
+        }
+    }
+
+
+def graphql_page(nodes, end_cursor=None):
+    return {
+        "data": {
+            "repository": {
+                "pullRequest": {
+                    "commits": {
+                        "pageInfo": {
+                            "hasNextPage": end_cursor is not None,
+                            "endCursor": end_cursor,
+                        },
+                        "nodes": nodes,
+                    }
+                }
+            }
+        }
+    }
+
+
+class TestGithubServiceGraphQLCollectTasks(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(Requester.resetConnectionClasses)
+
+    @patch("helpers.github.Github")
+    def test_collect_tasks_graphql(self, mock_github):
+        mock_pull_request = MagicMock(number=1, body=None)
+        mock_github.return_value.create_from_raw_data.return_value = mock_pull_request
+        graphql_query = mock_github.return_value.requester.graphql_query
+        graphql_query.side_effect = [
+            (
+                {},
+                graphql_page(
+                    [
+                        graphql_commit(
+                            "a1",
+                            "Support: fixed a bug",
+                            [graphql_pull(2, "Support: fixed a bug", "feature/2")],
+                        ),
+                        graphql_commit(
+                            "a2",
+                            "Merge pull request #3",
+                            [graphql_pull(3, "Merge pull request", "feature/3")],
+                        ),
+                    ],
+                    end_cursor="cursor-1",
+                ),
+            ),
+            (
+                {},
+                graphql_page(
+                    [
+                        graphql_commit(
+                            "a3",
+                            "[ERP-163] New feature",
+                            [
+                                graphql_pull(
+                                    5, "[ERP-163] Open", "feature/5", "OPEN", None
+                                ),
+                                graphql_pull(1, "Release", "release/1"),
+                                graphql_pull(4, "[ERP-163] New feature", "feature/4"),
+                            ],
+                        ),
+                    ]
+                ),
+            ),
+        ]
+
+        with patch(
+            "builtins.open",
+            unittest.mock.mock_open(
+                read_data=json.dumps({"pull_request": {"number": 1}})
+            ),
+        ):
+            github_service = GithubService(
+                "mock_data.json",
+                "fake_token",
+                "owner/repo",
+                MagicMock(),
+                use_graphql=True,
+            )
+
+        tasks, unique_epic_tasks = github_service.collect_tasks()
+
+        # Две страницы GraphQL вместо REST-запроса get_pulls() на каждый коммит
+        self.assertEqual(graphql_query.call_count, 2)
+        self.assertEqual(graphql_query.call_args.args[1]["cursor"], "cursor-1")
+        self.assertEqual(graphql_query.call_args.args[1]["owner"], "owner")
+        mock_pull_request.get_commits.assert_not_called()
+        # Задачи совпадают с теми, что собирает REST-сборщик
+        self.assertEqual(
+            [
+                (task.task_key, task.numbers, task.message, task.author)
+                for task in tasks
+            ],
+            [
+                ("ERP-163", [4], None, "user"),
+                (None, [2], "Support: fixed a bug", "user"),
+            ],
+        )
+        self.assertEqual(unique_epic_tasks, set())
@@ -3,7 +3,7 @@ from unittest.mock import MagicMock, patch
 from config.constants import MAIN_TITLE_NAME
 
 from .base_test import BaseTestCase
-from .utils import LINK_EXAMPLE
+from .utils import PULL_URL_EXAMPLE
 
 
 class TestGithubServiceHotfixBranchPrepare(BaseTestCase):
@@ -14,7 +14,6 @@ class TestGithubServiceHotfixBranchPrepare(BaseTestCase):
         github_service, _, mock_pull_request = self.prepare_github_service(mock_github)
         mock_pull_request.head.ref = "hotfix/fix_something"
         mock_pull_request.number = 1
-        mock_pull_request.html_url = LINK_EXAMPLE
 
         commits_messages = [
             "Merge pull request",
@@ -30,7 +29,8 @@ class TestGithubServiceHotfixBranchPrepare(BaseTestCase):
         description_parts = github_service.build_description_parts()
         expected_description_parts = [
             MAIN_TITLE_NAME,
-            "* [[ERP-23](https://tracker.yandex.ru/ERP-23)] ERP-23 by @user in [#1](https://link.com)",
-            "* Fix anything by @user in [#1](https://link.com)",
+            "* [[ERP-23](https://tracker.yandex.ru/ERP-23)] ERP-23 by @user in "
+            f"[#1]({PULL_URL_EXAMPLE}/1)",
+            f"* Fix anything by @user in [#1]({PULL_URL_EXAMPLE}/1)",
         ]
         self.assertEqual(description_parts, expected_description_parts)
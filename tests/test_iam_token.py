@@ -0,0 +1,75 @@
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from helpers.file_cache import FileCache
+from helpers.yandex_tracker import YandexTracker
+
+from .utils import make_response, tracker_api
+
+
+class TestYandexTrackerIamToken(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def create_tracker(self):
+        token_cache = FileCache(self.cache_dir, "iam_token", 0)
+        return YandexTracker("fake_org_id", "fake_token", token_cache=token_cache)
+
+    @patch("requests.Session.post")
+    def test_iam_token_reused_from_cache(self, mock_post):
+        mock_post.return_value = make_response(
+            200, {"iamToken": "iam_token_1", "expiresAt": "2099-01-01T00:00:00Z"}
+        )
+        self.assertEqual(self.create_tracker().iam_token, "iam_token_1")
+        self.assertEqual(mock_post.call_count, 1)
+
+        # Второй запуск берёт действующий токен из кэша без обмена
+        self.assertEqual(self.create_tracker().iam_token, "iam_token_1")
+        self.assertEqual(mock_post.call_count, 1)
+
+    @patch("requests.Session.post")
+    def test_iam_token_refreshed_before_expiry(self, mock_post):
+        mock_post.side_effect = [
+            make_response(
+                200, {"iamToken": "iam_token_1", "expiresAt": "2000-01-01T00:00:00Z"}
+            ),
+            make_response(200, {"iamToken": "iam_token_2"}),
+        ]
+        tracker = self.create_tracker()
+        mock_post.assert_not_called()
+
+        # Полученный токен уже истёк, поэтому сразу обменивается заново
+        self.assertEqual(tracker.iam_token, "iam_token_2")
+        self.assertEqual(mock_post.call_count, 2)
+        # Срок действия без expiresAt считается стандартным - 12 часов
+        self.assertEqual(tracker.iam_token, "iam_token_2")
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertGreater(
+            tracker._iam_token_expires_at,  # pylint: disable=protected-access
+            time.time() + 11 * 60 * 60,
+        )
+
+    @patch("requests.Session.request")
+    @patch("requests.Session.post")
+    def test_iam_token_refreshed_on_unauthorized(self, mock_post, mock_request):
+        mock_post.return_value = make_response(200, {"iamToken": "iam_token_1"})
+        tracker = self.create_tracker()
+        self.assertEqual(tracker.iam_token, "iam_token_1")
+
+        mock_post.return_value = make_response(200, {"iamToken": "iam_token_2"})
+        responses = iter([make_response(401), make_response(200, {"summary": "Task"})])
+        mock_request.side_effect = tracker_api(
+            lambda method, url, **kwargs: next(responses)
+        )
+
+        self.assertEqual(tracker.get_issue_summary("ERP-1"), "Task")
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(
+            mock_request.call_args.kwargs["headers"]["Authorization"],
+            "Bearer iam_token_2",
+        )
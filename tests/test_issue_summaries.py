@@ -0,0 +1,210 @@
+import unittest
+from unittest.mock import patch
+
+from helpers.yandex_tracker import YandexTracker
+
+# conflict with black linter
+# isort: off
+from .utils import (
+    TRACKER_API_URL,
+    make_response,
+    patch_iam_token,
+    track_concurrency,
+    tracker_api,
+)
+
+# isort: on
+
+ISSUES_URL = f"{TRACKER_API_URL}/issues"
+SEARCH_URL = f"{ISSUES_URL}/_search"
+
+
+class TestYandexTrackerIssueSummaries(unittest.TestCase):
+
+    def setUp(self):
+        patch_iam_token(self)
+        self.tracker = YandexTracker("fake_org_id", "fake_token")
+
+    @patch("requests.Session.request")
+    def test_get_issue_summaries_chunked(self, mock_request):
+        keys = [f"ERP-{i}" for i in range(120)]
+
+        def search(method, url, **kwargs):
+            self.assertEqual((method, url), ("POST", SEARCH_URL))
+            # Задачу ERP-7 поиск не находит
+            return make_response(
+                200,
+                [
+                    {"key": key, "summary": f"Task {key}"}
+                    for key in kwargs["json"]["keys"]
+                    if key != "ERP-7"
+                ],
+            )
+
+        mock_request.side_effect = tracker_api(search)
+
+        summaries = self.tracker.get_issue_summaries(keys + ["ERP-1"])
+
+        # Список очередей и 120 уникальных ключей в 3 запросах поиска
+        self.assertEqual(mock_request.call_count, 4)
+        self.assertEqual(len(summaries), 120)
+        self.assertEqual(summaries["ERP-1"], "Task ERP-1")
+        self.assertIsNone(summaries["ERP-7"])
+        self.assertTrue(self.tracker.is_missing("ERP-7"))
+        self.assertFalse(self.tracker.is_missing("ERP-1"))
+
+    @patch("requests.Session.request")
+    def test_get_issue_summaries_search_fallback(self, mock_request):
+        mock_request.side_effect = tracker_api(
+            lambda method, url, **kwargs: (
+                make_response(500)
+                if method == "POST"
+                else make_response(200, {"summary": "Task"})
+            )
+        )
+
+        summaries = self.tracker.get_issue_summaries(["ERP-1", "ERP-2"])
+
+        # Список очередей, неудачный поиск и два запроса задач по одной
+        self.assertEqual(mock_request.call_count, 4)
+        self.assertEqual(summaries, {"ERP-1": "Task", "ERP-2": "Task"})
+
+    @patch("requests.Session.request")
+    def test_get_issue_summaries_aliases(self, mock_request):
+        mock_request.side_effect = tracker_api(
+            lambda method, url, **kwargs: make_response(
+                200, [{"key": "NEW-1", "aliases": ["OLD-1"], "summary": "Moved task"}]
+            )
+        )
+
+        summaries = self.tracker.get_issue_summaries(["OLD-1"])
+
+        self.assertEqual(summaries["OLD-1"], "Moved task")
+
+    @patch("requests.Session.request")
+    def test_get_issue_summaries_lowercase_key(self, mock_request):
+        def search(method, url, **kwargs):  # pylint: disable=unused-argument
+            return make_response(
+                200,
+                [
+                    {"key": key, "summary": f"Task {key}"}
+                    for key in kwargs["json"]["keys"]
+                    if key == key.upper()
+                ],
+            )
+
+        mock_request.side_effect = tracker_api(search)
+
+        summaries = self.tracker.get_issue_summaries(["erp-1"])
+
+        # Трекер возвращает ключ в верхнем регистре, задача всё равно находится
+        self.assertEqual(summaries, {"erp-1": "Task ERP-1"})
+
+    @patch("requests.Session.request")
+    def test_get_issue_summary_fields(self, mock_request):
+        mock_request.side_effect = tracker_api(
+            lambda method, url, **kwargs: make_response(200, {"summary": "Task"})
+        )
+
+        self.tracker.get_issue_summary("ERP-1")
+        self.tracker.get_issue_summary("ERP-2")
+
+        # Запрашиваются только нужные поля, соединения берутся из общего пула
+        self.assertEqual(
+            mock_request.call_args.kwargs["params"],
+            {"fields": "key,summary,aliases,updatedAt"},
+        )
+        adapter = self.tracker.session.get_adapter("https://api.tracker.yandex.net")
+        self.assertEqual(adapter._pool_maxsize, 10)  # type: ignore[attr-defined]  # pylint: disable=protected-access
+
+    @patch("requests.Session.request")
+    def test_get_issue_summaries_concurrently(self, mock_request):
+        mock_request.side_effect = tracker_api(
+            lambda method, url, **kwargs: make_response(500)
+        )
+        self.tracker.concurrency = 3
+        state: dict = {}
+        get_issue = track_concurrency(
+            lambda issue: {"key": issue, "summary": f"Task {issue}"}, state
+        )
+
+        keys = [f"ERP-{i}" for i in range(12)]
+        with patch.object(self.tracker, "_get_issue", side_effect=get_issue):
+            summaries = self.tracker.get_issue_summaries(keys)
+
+        # Запросы выполняются параллельно, но не больше заданного лимита
+        self.assertEqual(state["max_active"], 3)
+        self.assertEqual(summaries, {key: f"Task {key}" for key in keys})
+
+    @patch("requests.Session.request")
+    def test_missing_issues_requested_once(self, mock_request):
+        mock_request.side_effect = tracker_api(
+            lambda method, url, **kwargs: (
+                make_response(404) if url.endswith("ERP-404") else make_response(500)
+            )
+        )
+
+        for _ in range(3):
+            self.assertIsNone(self.tracker.get_issue_summary("ERP-404"))
+            self.assertIsNone(self.tracker.get_issue_summary("ERP-500"))
+
+        # 404 запоминается до конца запуска, временные ошибки запрашиваются заново
+        requested_urls = [call.args[1] for call in mock_request.call_args_list]
+        self.assertEqual(requested_urls.count(f"{ISSUES_URL}/ERP-404"), 1)
+        self.assertEqual(requested_urls.count(f"{ISSUES_URL}/ERP-500"), 3)
+
+    @patch("requests.Session.request")
+    def test_get_issue_summaries_memoized(self, mock_request):
+        mock_request.side_effect = tracker_api(
+            lambda method, url, **kwargs: make_response(
+                200, [{"key": "ERP-1", "summary": "Task"}]
+            )
+        )
+
+        self.tracker.get_issue_summaries(["ERP-1", "ERP-2"])
+        summaries = self.tracker.get_issue_summaries(["ERP-1", "ERP-2"])
+        summary = self.tracker.get_issue_summary("ERP-2")
+
+        # Повторные запросы тех же ключей, включая ненайденные, не уходят в Трекер
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(summaries, {"ERP-1": "Task", "ERP-2": None})
+        self.assertIsNone(summary)
+
+    @patch("requests.Session.request")
+    def test_get_issue_summaries_invalid_keys(self, mock_request):
+        def search(method, url, **kwargs):  # pylint: disable=unused-argument
+            return make_response(
+                200,
+                [{"key": key, "summary": "Task"} for key in kwargs["json"]["keys"]],
+            )
+
+        mock_request.side_effect = tracker_api(search)
+
+        summaries = self.tracker.get_issue_summaries(
+            ["ERP-1", "Backend", "WIP", "skip ci", "FOO-2", "ERP-", "1"]
+        )
+        self.tracker.get_issue_summary("FOO-3")
+
+        # В поиск уходят только ключи известных очередей, очереди запрашиваются один раз
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_request.call_args.kwargs["json"], {"keys": ["ERP-1"]})
+        self.assertEqual(summaries["ERP-1"], "Task")
+        self.assertIsNone(summaries["Backend"])
+        self.assertIsNone(summaries["FOO-2"])
+
+    @patch("requests.Session.request")
+    def test_get_issue_summaries_queues_unavailable(self, mock_request):
+        def request(method, url, **kwargs):  # pylint: disable=unused-argument
+            if url.endswith("/queues"):
+                return make_response(403)
+            return make_response(
+                200,
+                [{"key": key, "summary": "Task"} for key in kwargs["json"]["keys"]],
+            )
+
+        mock_request.side_effect = request
+
+        summaries = self.tracker.get_issue_summaries(["ERP-1", "FOO-2", "Backend"])
+
+        # Без списка очередей ключи проверяются только по формату
+        self.assertEqual(summaries, {"ERP-1": "Task", "FOO-2": "Task", "Backend": None})
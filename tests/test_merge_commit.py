@@ -0,0 +1,39 @@
+import unittest
+
+# conflict with black linter
+# isort: off
+from helpers.merge_commit import (
+    MergeCommit,
+    is_epic_branch,
+    parse_merge_commit,
+    pull_request_link,
+)
+
+# isort: on
+
+
+class TestMergeCommit(unittest.TestCase):
+
+    def test_parse_merge_commit(self):
+        cases = [
+            (
+                "Merge pull request #12 from owner/feature/ERP-1\n\n[ERP-1] Task",
+                MergeCommit(number=12),
+            ),
+            ("Merge pull request #7 fifth task", MergeCommit(number=7)),
+            ("[ERP-1] Squashed commit (#3)", None),
+        ]
+        for message, expected in cases:
+            with self.subTest(message=message):
+                self.assertEqual(parse_merge_commit(message), expected)
+
+    def test_is_epic_branch(self):
+        self.assertFalse(is_epic_branch("feature/epic"))
+        self.assertFalse(is_epic_branch("epic"))
+        self.assertTrue(is_epic_branch("epic/1"))
+
+    def test_pull_request_link(self):
+        self.assertEqual(
+            pull_request_link("https://github.com/owner/repo/pull/2", 15),
+            "https://github.com/owner/repo/pull/15",
+        )
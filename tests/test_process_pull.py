@@ -1,6 +1,9 @@
 from typing import Any, Dict, List
 from unittest.mock import MagicMock, patch
 
+from helpers.commit_message import tokenize_commit_message
+from helpers.task_registry import TaskRecord
+
 from .base_test import BaseTestCase
 from .utils import get_tasks4proces_pull
 
@@ -13,15 +16,13 @@ class TestGithubServiceProcessPull(BaseTestCase):
         pull_requests_data: List[Dict[str, Any]] = get_tasks4proces_pull()
 
         github_service.tasks = [
-            {
-                "is_epic": False,
-                "number": [7],
-                "links": ["https://some_url.com"],
-                "message": "Pull title 7",
-                "author": "user",
-                "task_key": None,
-                "tasks": [],
-            }
+            TaskRecord(
+                task_key=None,
+                message="Pull title 7",
+                author="user",
+                numbers=[7],
+                tasks=[],
+            )
         ]
 
         for pr_data in pull_requests_data:
@@ -30,5 +31,8 @@ class TestGithubServiceProcessPull(BaseTestCase):
             pull_request.html_url = pr_data["pull"]["html_url"]
             pull_request.title = pr_data["pull"]["title"]
             pull_request.user.login = pr_data["pull"]["user.login"]
-            github_service.process_pull(pull_request, pr_data["commit_message"])
+            github_service.process_pull(
+                pull_request,
+                tokenize_commit_message(pr_data["commit_message"]).task_keys,
+            )
         self.assertEqual(len(github_service.tasks), 7)
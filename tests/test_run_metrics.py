@@ -0,0 +1,127 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from github import Github
+from github.Requester import Requester
+
+from helpers.github_rate_limit import SERVER_ERROR_RETRY, RateLimitScheduler
+from helpers.github_transport import github_connection_classes
+from helpers.run_metrics import RunMetrics, endpoint_name
+
+
+class TestRunMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.metrics = RunMetrics(clock=lambda: self.now)
+
+    def test_phases(self):
+        with self.metrics.phase("commits"):
+            self.now += 2.0
+            self.metrics.record_request("github", "GET", "/repos/o/r/pulls/1", 200, 10)
+            with self.metrics.phase("epics"):
+                self.now += 1.0
+                self.metrics.record_request(
+                    "github", "GET", "/repos/o/r/pulls/2", 200, 5
+                )
+        with self.metrics.phase("epics"):
+            self.now += 0.5
+
+        # Вложенный этап входит во внешний, повторный вход суммируется
+        phases = {phase["name"]: phase for phase in self.metrics.to_dict()["phases"]}
+        self.assertEqual(phases["commits"]["seconds"], 3.0)
+        self.assertEqual(phases["commits"]["requests"], 2)
+        self.assertEqual(phases["epics"]["seconds"], 1.5)
+        self.assertEqual(phases["epics"]["requests"], 1)
+        self.assertEqual(phases["epics"]["calls"], 2)
+        self.assertEqual(
+            self.metrics.to_dict()["endpoints"],
+            [
+                {
+                    "service": "github",
+                    "endpoint": "GET /repos/o/r/pulls/{number}",
+                    "requests": 2,
+                    "bytes": 15,
+                    "errors": 0,
+                }
+            ],
+        )
+
+    def test_endpoint_name(self):
+        sha = "a" * 40
+        cases = [
+            (
+                "GET",
+                f"/repos/o/r/commits/{sha}/pulls?page=2",
+                "GET /repos/o/r/commits/{sha}/pulls",
+            ),
+            (
+                "GET",
+                "https://api.tracker.yandex.net/v2/issues/ERP-12",
+                "GET /v2/issues/{key}",
+            ),
+            (
+                "GET",
+                f"/repos/o/r/compare/{sha}...{'b' * 40}",
+                "GET /repos/o/r/compare/{sha}...{sha}",
+            ),
+            (
+                "GET",
+                "/repos/o/service-1/pulls/2",
+                "GET /repos/o/service-1/pulls/{number}",
+            ),
+            ("POST", "/graphql", "POST /graphql"),
+        ]
+        for method, url, expected in cases:
+            with self.subTest(url=url):
+                self.assertEqual(endpoint_name(method, url), expected)
+
+    def test_write(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        summary_path = os.path.join(directory, "summary.md")
+        json_path = os.path.join(directory, "metrics.json")
+        with open(summary_path, "w", encoding="utf8") as f:
+            f.write("Previous step\n")
+        with self.metrics.phase("release"):
+            self.now += 0.25
+        self.metrics.record_request("tracker", "POST", "/v2/issues/_search", 500, 0)
+        self.metrics.record_cache("tracker_issues", True, 3)
+        self.metrics.record_cache("tracker_issues", False)
+        self.metrics.rate_limit = {"core": 4990}
+
+        self.metrics.write(summary_path, json_path)
+
+        with open(summary_path, encoding="utf8") as f:
+            summary = f.read()
+        self.assertTrue(summary.startswith("Previous step\n### Release notes metrics"))
+        self.assertIn("| release | 0.25 | 0 |", summary)
+        self.assertIn("| tracker | `POST /v2/issues/_search` | 1 | 0 | 1 |", summary)
+        self.assertIn("| tracker_issues | 3 | 1 | 75% |", summary)
+        self.assertIn("GitHub rate limit remaining: core: 4990", summary)
+        with open(json_path, encoding="utf8") as f:
+            data = json.load(f)
+        self.assertEqual(data["caches"]["tracker_issues"]["hit_ratio"], 0.75)
+        self.assertEqual(data["rate_limit"], {"core": 4990})
+
+    @patch("requests.Session.get")
+    def test_github_requests_recorded(self, mock_get):
+        self.addCleanup(Requester.resetConnectionClasses)
+        with patch("helpers.github_transport.run_metrics", self.metrics):
+            Requester.injectConnectionClasses(
+                *github_connection_classes(RateLimitScheduler())
+            )
+        response = MagicMock(status_code=200, text='{"full_name": "owner/repo"}')
+        response.headers = {}
+        response.content = response.text.encode("utf8")
+        mock_get.return_value = response
+
+        Github("fake_token", retry=SERVER_ERROR_RETRY).get_repo("owner/repo")
+
+        self.assertEqual(self.metrics.requests, 1)
+        endpoint = self.metrics.endpoints[("github", "GET /repos/owner/repo")]
+        self.assertEqual(endpoint.bytes, len(response.content))
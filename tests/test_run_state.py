@@ -0,0 +1,194 @@
+from unittest.mock import MagicMock, patch
+
+from github.GithubException import UnknownObjectException
+
+# conflict with black linter
+# isort: off
+from helpers.run_state import (
+    MAX_BODY_LENGTH,
+    RUN_STATE_VERSION,
+    decode_run_state,
+    encode_run_state,
+)
+
+# isort: on
+
+from .base_test import BaseTestCase
+from .utils import LINK_EXAMPLE, MERGED_AT_EXAMPLE, PULL_URL_EXAMPLE
+
+
+def create_commit(message, number, author="user"):
+    pull = MagicMock(number=number, merged_at=MERGED_AT_EXAMPLE, html_url=LINK_EXAMPLE)
+    pull.head.ref = f"feature/{number}"
+    pull.user.login = author
+    commit = MagicMock()
+    commit.commit.message = message
+    commit.get_pulls.return_value = [pull]
+    return commit
+
+
+class TestGithubServiceRunState(BaseTestCase):
+
+    def test_encode_decode_run_state(self):
+        state = {"sha": "abc", "tasks": [{"task_key": "ERP-1"}], "summaries": {}}
+        body = f"## What's Changed\n\n{encode_run_state(state)}"
+
+        self.assertEqual(
+            decode_run_state(body), {"version": RUN_STATE_VERSION, **state}
+        )
+        self.assertIsNone(decode_run_state("## What's Changed"))
+        self.assertIsNone(decode_run_state("<!-- release-notes-state: broken -->"))
+
+    @patch("helpers.github.Github")
+    def test_run_state_fits_body_limit(self, mock_github):
+        github_service, _, mock_pull_request = self.prepare_github_service(mock_github)
+        github_service.run_state = {
+            "sha": "sha-1",
+            "tasks": [{"task_key": f"ERP-{n}", "message": str(n)} for n in range(2000)],
+            "epic_task_keys": [],
+        }
+
+        github_service.change_pull_request_body("x" * 60000)
+
+        # Состояние не помещается в описание и не сохраняется
+        body = mock_pull_request.edit.call_args.kwargs["body"]
+        self.assertLessEqual(len(body), MAX_BODY_LENGTH)
+        self.assertIsNone(decode_run_state(body))
+
+    @patch("helpers.github.Github")
+    def test_incremental_collect_tasks(self, mock_github):
+        github_service, mock_repo, mock_pull_request = self.prepare_github_service(
+            mock_github
+        )
+        mock_pull_request.head.sha = "sha-1"
+        mock_pull_request.head.ref = "release/1"
+        github_service.main_commits = [
+            create_commit("[ERP-1] First task", 2),
+            create_commit("[ERP-2] Second task", 3),
+        ]
+
+        # Первый запуск собирает задачи из всех коммитов и сохраняет состояние
+        first_description = github_service.build_description_parts()
+        github_service.change_pull_request_body("\n".join(first_description))
+        body = mock_pull_request.edit.call_args.kwargs["body"]
+        self.mock_get_issue_summaries.reset_mock()
+
+        # Следующий запуск получает только коммиты после sha-1
+        github_service, mock_repo, mock_pull_request = self.prepare_github_service(
+            mock_github
+        )
+        mock_pull_request.body = body
+        mock_pull_request.head.sha = "sha-2"
+        mock_pull_request.head.ref = "release/1"
+        github_service.main_commits = MagicMock()
+        mock_repo.compare.return_value = MagicMock(
+            status="ahead", commits=[create_commit("[ERP-3] Third task", 4)]
+        )
+
+        description = github_service.build_description_parts()
+
+        mock_repo.compare.assert_called_once_with("sha-1", "sha-2")
+        github_service.main_commits.__iter__.assert_not_called()
+        self.mock_get_issue_summaries.assert_called_once_with({"ERP-3"})
+        self.assertEqual(
+            description,
+            first_description
+            + [
+                "* [[ERP-3](https://tracker.yandex.ru/ERP-3)] ERP-3 by @user in "
+                f"[#4]({PULL_URL_EXAMPLE}/4)"
+            ],
+        )
+
+    @patch("helpers.github.Github")
+    def test_state_rewritten_for_new_commit(self, mock_github):
+        github_service, _, mock_pull_request = self.prepare_github_service(mock_github)
+        github_service.run_state = {"sha": "sha-1", "tasks": [], "epic_task_keys": []}
+        github_service.change_pull_request_body("## What's Changed")
+        mock_pull_request.body = mock_pull_request.edit.call_args.kwargs["body"]
+        mock_pull_request.edit.reset_mock()
+
+        # Повторный запуск на том же коммите описание не перезаписывает
+        github_service.change_pull_request_body("## What's Changed")
+        mock_pull_request.edit.assert_not_called()
+
+        # После push заметки те же, но состояние обновляется до нового коммита
+        github_service.run_state = {"sha": "sha-2", "tasks": [], "epic_task_keys": []}
+        github_service.change_pull_request_body("## What's Changed")
+
+        state = decode_run_state(mock_pull_request.edit.call_args.kwargs["body"])
+        self.assertEqual(state and state["sha"], "sha-2")
+
+    def test_encode_run_state_is_deterministic(self):
+        self.assertEqual(
+            encode_run_state({"summaries": {"ERP-1": "a", "ERP-2": "b"}, "sha": "1"}),
+            encode_run_state({"sha": "1", "summaries": {"ERP-2": "b", "ERP-1": "a"}}),
+        )
+
+    @patch("helpers.github.Github")
+    def test_missing_issues_stored_in_state(self, mock_github):
+        github_service, mock_repo, mock_pull_request = self.prepare_github_service(
+            mock_github
+        )
+        mock_pull_request.head.sha = "sha-1"
+        mock_pull_request.head.ref = "release/1"
+        github_service.main_commits = [
+            create_commit("[ERP-1] First task", 2),
+            create_commit("[ABC-1] Missing task", 3),
+            create_commit("[DEF-1] Unavailable task", 4),
+        ]
+        # ABC-1 нет в Трекере, DEF-1 не получена из-за ошибки запроса
+        patch.object(
+            self.mocked_tracker, "is_missing", side_effect=lambda key: key == "ABC-1"
+        ).start()
+        github_service.change_pull_request_body(
+            "\n".join(github_service.build_description_parts())
+        )
+        body = mock_pull_request.edit.call_args.kwargs["body"]
+        self.mock_get_issue_summaries.reset_mock()
+
+        # Повторный запуск без новых коммитов запрашивает только DEF-1
+        github_service, mock_repo, mock_pull_request = self.prepare_github_service(
+            mock_github
+        )
+        mock_pull_request.body = body
+        mock_pull_request.head.sha = "sha-1"
+        mock_pull_request.head.ref = "release/1"
+        mock_repo.compare.return_value = MagicMock(status="identical", commits=[])
+
+        github_service.build_description_parts()
+
+        self.mock_get_issue_summaries.assert_called_once_with({"DEF-1"})
+
+    @patch("helpers.github.Github")
+    def test_rebuild_after_history_change(self, mock_github):
+        github_service, mock_repo, mock_pull_request = self.prepare_github_service(
+            mock_github
+        )
+        mock_pull_request.body = encode_run_state(
+            {"sha": "sha-1", "tasks": [], "epic_task_keys": [], "summaries": {}}
+        )
+        mock_pull_request.head.sha = "sha-2"
+        mock_repo.compare.return_value = MagicMock(status="diverged")
+        github_service.main_commits = [create_commit("[ERP-1] First task", 2)]
+
+        tasks, _ = github_service.collect_tasks()
+
+        # После force push задачи собираются из всех коммитов
+        self.assertEqual([task.task_key for task in tasks], ["ERP-1"])
+
+    @patch("helpers.github.Github")
+    def test_rebuild_when_state_commit_is_missing(self, mock_github):
+        github_service, mock_repo, mock_pull_request = self.prepare_github_service(
+            mock_github
+        )
+        mock_pull_request.body = encode_run_state(
+            {"sha": "sha-1", "tasks": [], "epic_task_keys": [], "summaries": {}}
+        )
+        mock_pull_request.head.sha = "sha-2"
+        mock_repo.compare.side_effect = UnknownObjectException(404)
+        github_service.main_commits = [create_commit("[ERP-1] First task", 2)]
+
+        tasks, _ = github_service.collect_tasks()
+
+        # Коммит состояния удалён после force push, задачи собираются заново
+        self.assertEqual([task.task_key for task in tasks], ["ERP-1"])
@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from helpers.task_registry import TaskRecord, TaskRegistry
+
+from .base_test import BaseTestCase
+from .utils import LINK_EXAMPLE
+
+
+def create_task(task_key, number, is_epic=False, epic_tasks=None):
+    return TaskRecord(
+        task_key=task_key,
+        message=None,
+        author="user",
+        numbers=[number],
+        is_epic=is_epic,
+        tasks=epic_tasks,
+    )
+
+
+class TestTaskRegistry(BaseTestCase):
+
+    def test_indexes(self):
+        epic = create_task(
+            "EPIC", 1, is_epic=True, epic_tasks=[create_task("ERP-1", 5)]
+        )
+        registry = TaskRegistry([create_task("ERP-2", 2), epic])
+
+        registry.add_pull_request(epic, 3)
+        registry.add_pull_request(epic, 3)
+        registry.add_epic_tasks(
+            epic,
+            [
+                create_task("ERP-1", 5),
+                create_task("ERP-3", 5),
+                create_task("ERP-3", 5),
+            ],
+        )
+
+        self.assertEqual(registry.find("EPIC", "user"), [epic])
+        self.assertEqual(registry.find("EPIC", "other"), [])
+        self.assertEqual(epic.numbers, [1, 3])
+        self.assertTrue(registry.has_epic(3))
+        self.assertFalse(registry.has_epic(2))
+        self.assertEqual(
+            [epic_task.task_key for epic_task in epic.tasks], ["ERP-1", "ERP-3"]
+        )
+
+    def test_upsert_from_threads(self):
+        registry = TaskRegistry()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(
+                executor.map(
+                    lambda number: registry.upsert(create_task("ERP-1", number)),
+                    range(1000),
+                )
+            )
+
+        # Задача с одним ключом и автором создаётся один раз
+        self.assertEqual(len(registry), 1)
+        self.assertEqual(sorted(registry[0].numbers), list(range(1000)))
+
+    def test_ordered(self):
+        registry = TaskRegistry([create_task(None, 1), create_task("ERP-2", 2)])
+        self.assertEqual([task.numbers for task in registry.ordered()], [[2], [1]])
+
+        registry.append(create_task("ERP-1", 3))
+        self.assertEqual(
+            [task.task_key for task in registry.ordered()], ["ERP-1", "ERP-2", None]
+        )
+
+    @patch("helpers.github.Github")
+    def test_process_many_pulls(self, mock_github):
+        github_service, _, _ = self.prepare_github_service(mock_github)
+        # Тысячи pull request'ов по сотне задач с одинаковыми ключами
+        for number in range(10000):
+            pull = SimpleNamespace(
+                number=number,
+                html_url=LINK_EXAMPLE,
+                title="Pull title",
+                user=SimpleNamespace(login="user"),
+            )
+            github_service.process_pull(pull, [f"ERP-{number % 100}"])
+
+        self.assertEqual(len(github_service.tasks), 100)
+        self.assertEqual(
+            len(github_service.tasks.find("ERP-1", "user")[0].numbers), 100
+        )
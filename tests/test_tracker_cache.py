@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from helpers.file_cache import FileCache
+from helpers.yandex_tracker import YandexTracker
+
+from .utils import make_response, patch_iam_token, tracker_api
+
+
+def search_response(updated_at):
+    def search(method, url, **kwargs):  # pylint: disable=unused-argument
+        return make_response(
+            200,
+            [
+                {"key": key, "summary": f"Task {key}", "updatedAt": updated_at}
+                for key in kwargs["json"]["keys"]
+            ],
+        )
+
+    return tracker_api(search)
+
+
+class TestYandexTrackerCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        patch_iam_token(self)
+
+    def create_tracker(self, ttl=60.0):
+        cache = FileCache(self.cache_dir, "tracker_issues", ttl)
+        return YandexTracker("fake_org_id", "fake_token", cache=cache)
+
+    @patch("requests.Session.request")
+    def test_fresh_cache(self, mock_request):
+        mock_request.side_effect = search_response("2024-01-01T00:00:00.000+0000")
+        self.create_tracker().get_issue_summaries(["ERP-1", "ERP-2"])
+        self.assertEqual(mock_request.call_count, 2)
+
+        # Повторный запуск с тем же каталогом кэша не обращается к Трекеру
+        mock_request.reset_mock()
+        summaries = self.create_tracker().get_issue_summaries(["ERP-1", "ERP-2"])
+        mock_request.assert_not_called()
+        self.assertEqual(summaries, {"ERP-1": "Task ERP-1", "ERP-2": "Task ERP-2"})
+
+    @patch("requests.Session.request")
+    def test_stale_cache_revalidation(self, mock_request):
+        mock_request.side_effect = search_response("2024-01-01T00:00:00.000+0000")
+        self.create_tracker(ttl=0).get_issue_summaries(["ERP-1"])
+
+        # Задача не изменилась - достаточно запроса только с updatedAt
+        # (и списка очередей, срок жизни которого тоже истёк)
+        mock_request.reset_mock()
+        summaries = self.create_tracker(ttl=0).get_issue_summaries(["ERP-1"])
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(
+            mock_request.call_args.kwargs["params"]["fields"], "key,aliases,updatedAt"
+        )
+        self.assertEqual(summaries, {"ERP-1": "Task ERP-1"})
+
+        # Задача изменилась - заголовок запрашивается заново
+        mock_request.reset_mock()
+        mock_request.side_effect = search_response("2024-02-01T00:00:00.000+0000")
+        self.create_tracker(ttl=0).get_issue_summaries(["ERP-1"])
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(
+            mock_request.call_args.kwargs["params"]["fields"],
+            "key,summary,aliases,updatedAt",
+        )
+
+    def test_cache_keyed_by_org(self):
+        cache = FileCache(self.cache_dir, "tracker_issues", 60.0)
+        cache.set("org_1:ERP-1", {"summary": "Task", "updated_at": None})
+        cache.save()
+
+        cache = FileCache(self.cache_dir, "tracker_issues", 60.0)
+        self.assertTrue(cache.is_fresh("org_1:ERP-1"))
+        self.assertIsNone(cache.get("org_2:ERP-1"))
+
+    def test_expired_unused_entries_evicted(self):
+        cache = FileCache(self.cache_dir, "tracker_issues", 60.0)
+        cache.set("org:ERP-1", {"summary": "Old task", "updated_at": None})
+        cache.set("org:ERP-2", {"summary": "Task", "updated_at": None})
+        cache.save()
+
+        with patch("time.time", return_value=time.time() + 120):
+            cache = FileCache(
+                self.cache_dir, "tracker_issues", 60.0, evict_expired=True
+            )
+            # Устаревшая запись, которая понадобилась в запуске, сохраняется
+            cache.set("org:ERP-2", {"summary": "Task", "updated_at": None})
+            cache.save()
+
+        cache = FileCache(self.cache_dir, "tracker_issues", 60.0)
+        self.assertIsNone(cache.get("org:ERP-1"))
+        self.assertEqual(
+            cache.get("org:ERP-2"), {"summary": "Task", "updated_at": None}
+        )
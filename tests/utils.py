@@ -1,4 +1,11 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
 LINK_EXAMPLE = "https://link.com"
+# Ссылки на pull request'ы строятся от ссылки основного pull request'а
+PULL_URL_EXAMPLE = "https://github.com/owner/repo/pull"
+MERGED_AT_EXAMPLE = "2024-01-01T00:00:00Z"
 
 
 def get_tasks4proces_pull():
@@ -91,7 +98,7 @@ def get_tasks_with_epic():
             "pulls": [
                 {
                     "number": 2,
-                    "mergeable": False,
+                    "merged_at": MERGED_AT_EXAMPLE,
                     "head.ref": "epic/1",
                     "title": "Some title",
                     "user.login": "user",
@@ -119,7 +126,7 @@ def get_tasks_with_epic():
                     "html_url": LINK_EXAMPLE,
                     "title": "Pull title 4",
                     "user.login": "user",
-                    "mergeable": False,
+                    "merged_at": MERGED_AT_EXAMPLE,
                     "head.ref": "feature/4/forth_task",
                 }
             ],
@@ -133,9 +140,68 @@ def get_tasks_with_epic():
                     "html_url": LINK_EXAMPLE,
                     "title": "Pull title 5",
                     "user.login": "user",
-                    "mergeable": False,
+                    "merged_at": MERGED_AT_EXAMPLE,
                     "head.ref": "feature/5/fifth_task",
                 }
             ],
         },
     ]
+
+
+TRACKER_API_URL = "https://api.tracker.yandex.net/v2"
+
+
+def make_response(status_code, json_data=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = json_data
+    response.headers = headers or {}
+    return response
+
+
+def patch_iam_token(test_case):
+    """
+    Подменяет обмен OAuth-токена на IAM-токен до конца теста.
+
+    IAM-токен запрашивается при первом обращении к Трекеру, а не при
+    создании клиента, поэтому подмены только на время конструктора мало.
+    """
+    patcher = patch(
+        "requests.Session.post",
+        return_value=make_response(200, {"iamToken": "fake_iam_token"}),
+    )
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+
+
+def tracker_api(handler, queues=("ERP", "NEW", "OLD")):
+    """
+    Возвращает side_effect для requests.Session.request, который сам отвечает
+    на запрос списка очередей, а остальные запросы передаёт в handler.
+    """
+
+    def request(method, url, **kwargs):
+        if url == f"{TRACKER_API_URL}/queues":
+            return make_response(200, [{"key": queue} for queue in queues])
+        return handler(method, url, **kwargs)
+
+    return request
+
+
+def track_concurrency(func, state):
+    """
+    Оборачивает func, записывая в state наибольшее число одновременных вызовов.
+    """
+    lock = threading.Lock()
+    state.update(active=0, max_active=0)
+
+    def wrapper(*args, **kwargs):
+        with lock:
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+        time.sleep(0.01)
+        with lock:
+            state["active"] -= 1
+        return func(*args, **kwargs)
+
+    return wrapper